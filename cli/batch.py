@@ -0,0 +1,145 @@
+from dotenv import load_dotenv
+load_dotenv()
+
+import os
+import json
+import time
+import asyncio
+import datetime
+from typing import List, Optional
+import typer
+from loguru import logger
+
+from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.graph.checkpoint import new_run_id
+from tradingagents.dataflows.http_utils import aclose_async_client
+from .models import AnalystType
+from .run import get_investment_preferences
+from .utils import extract_reports_from_final_state, save_reports
+
+app = typer.Typer(name="TradingAgents Batch", help="Analyze a watchlist of assets in one warm pass.")
+
+
+def load_jobs(tickers: List[str], analysis_date: str, jobs_file: Optional[str]) -> List[tuple[str, str]]:
+    """
+    Build the (ticker, date) jobs from the command line tickers and an optional jobs file.
+    Each line of the jobs file is `TICKER` or `TICKER,YYYY-MM-DD`; blank lines and lines starting with '#' are skipped.
+    """
+    jobs = [(ticker.upper(), analysis_date) for ticker in tickers]
+    if jobs_file:
+        with open(jobs_file, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                ticker, _, date = line.partition(",")
+                jobs.append((ticker.strip().upper(), date.strip() or analysis_date))
+    # Drop duplicates, keeping the first occurrence
+    return list(dict.fromkeys(jobs))
+
+
+async def run_job(
+    graph: TradingAgentsGraph, semaphore: asyncio.Semaphore, ticker: str = None, analysis_date: str = None,
+    investment_preferences: str = "", resume_run_id: str = None,
+) -> dict:
+    """Run one analysis on the shared graph once a concurrency slot is free, or resume a checkpointed one."""
+    async with semaphore:
+        run_id = resume_run_id or (new_run_id(ticker, analysis_date) if graph.checkpointer else None)
+        if resume_run_id:
+            logger.info(f"Resuming run {run_id}...")
+            stream = graph.aresume_stream(run_id)
+        else:
+            logger.info(f"Analyzing {ticker} on {analysis_date}...")
+            stream = graph.astream(ticker, analysis_date, investment_preferences, run_id=run_id)
+        started = time.perf_counter()
+        result = {"ticker": ticker, "date": analysis_date, "run_id": run_id}
+        try:
+            final_state = None
+            async for chunk in stream:
+                final_state = chunk
+            ticker = result["ticker"] = final_state["asset_of_interest"]
+            result["date"] = final_state["trade_date"]
+            decision = (await graph.aprocess_signal(final_state["final_trade_decision"])).strip().capitalize()
+            reports = extract_reports_from_final_state(final_state)
+            result.update({"decision": decision, "reports": reports})
+
+            config = graph.config
+            if config["save_report"]:
+                await asyncio.to_thread(
+                    save_reports, ticker, reports, config["report_dir"], config["report_type"], decision=decision
+                )
+            logger.success(f"{ticker}: {decision}")
+        except Exception as e:
+            logger.error(f"An error occurred during the analysis of {ticker or run_id}: {e}")
+            result["error"] = str(e)
+        result["elapsed_seconds"] = round(time.perf_counter() - started, 2)
+        return result
+
+
+async def run_batch(
+    jobs: List[tuple[str, str]],
+    analysts: List[AnalystType],
+    concurrency: int,
+    investment_preferences: str = "",
+    config: dict = DEFAULT_CONFIG,
+    resume_run_ids: List[str] = [],
+) -> List[dict]:
+    """
+    Analyze every job on one event loop with at most `concurrency` analyses in flight.
+    All jobs share one compiled graph, its LLM clients, the tool memo and the dataflow caches.
+    Runs in `resume_run_ids` continue from their last checkpoint.
+    """
+    graph = TradingAgentsGraph([analyst.value for analyst in analysts], config=config)
+    semaphore = asyncio.Semaphore(concurrency)
+    try:
+        return await asyncio.gather(
+            *[run_job(graph, semaphore, resume_run_id=run_id) for run_id in resume_run_ids],
+            *[
+                run_job(graph, semaphore, ticker, analysis_date, investment_preferences)
+                for ticker, analysis_date in jobs
+            ],
+        )
+    finally:
+        await aclose_async_client()
+
+
+@app.command()
+def batch(
+    tickers: List[str] = typer.Argument(None, help="Tickers to analyze, e.g. BTC ETH SOL"),
+    analysis_date: str = typer.Option(datetime.date.today().strftime("%Y-%m-%d"), "--date", help="Analysis date (YYYY-MM-DD) for the command line tickers"),
+    jobs_file: Optional[str] = typer.Option(None, "--jobs-file", help="File with one `TICKER[,YYYY-MM-DD]` job per line"),
+    analysts: List[AnalystType] = typer.Option([AnalystType.MARKET, AnalystType.SOCIAL, AnalystType.NEWS], "--analyst", help="Analysts to run, repeat for several"),
+    concurrency: int = typer.Option(DEFAULT_CONFIG["batch_concurrency"], help="Maximum number of analyses running at once"),
+    output: Optional[str] = typer.Option(None, help="Path of the consolidated JSON results"),
+    resume: List[str] = typer.Option([], "--resume", help="Run id of a checkpointed run to continue, repeat for several. Use the same --analyst options as the original run"),
+    checkpoint: bool = typer.Option(True, "--checkpoint/--no-checkpoint", help="Save the state of every run so failed jobs can be continued with --resume"),
+):
+    """Analyze several assets concurrently and write one consolidated result file."""
+    logger.add("logs/reports.log", rotation="1 day", retention="7 days", level="SUCCESS")
+    jobs = load_jobs(tickers or [], analysis_date, jobs_file)
+    if not jobs and not resume:
+        raise typer.BadParameter("No jobs given, pass tickers, --jobs-file or --resume")
+
+    config = {**DEFAULT_CONFIG, "checkpoint_enabled": checkpoint or bool(resume)}
+
+    started = time.perf_counter()
+    results = asyncio.run(run_batch(jobs, analysts, concurrency, get_investment_preferences(), config, resume))
+
+    output = output or os.path.join(
+        DEFAULT_CONFIG["report_dir"], f"batch_{datetime.datetime.now().strftime('%Y%m%d_%H%M')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "generated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "elapsed_seconds": round(time.perf_counter() - started, 2),
+            "results": results,
+        }, f, ensure_ascii=False, indent=4)
+
+    failed = sum(1 for result in results if "error" in result)
+    logger.info(f"Analyzed {len(results) - failed}/{len(results)} assets, results saved to {output}")
+
+
+if __name__ == "__main__":
+    app()
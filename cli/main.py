@@ -849,17 +849,18 @@ def run_analysis():
         )
         update_display(layout, spinner_text)
 
-        # Initialize state and get graph args
-        init_agent_state = graph.propagator.create_initial_state(
-            selections["ticker"], selections["analysis_date"], 
-            selections["investment_preferences"],
-            selections["external_reports"]
-        )
-        args = graph.propagator.get_graph_args()
+        run_id, _ = graph.graph_args(selections["ticker"], selections["analysis_date"])
+        if run_id:
+            message_buffer.add_message("System", f"Run id: {run_id}")
 
         # Stream the analysis
         trace = []
-        for chunk in graph.graph.stream(init_agent_state, **args):
+        for chunk in graph.stream(
+            selections["ticker"], selections["analysis_date"],
+            selections["investment_preferences"],
+            selections["external_reports"],
+            run_id=run_id
+        ):
             if len(chunk["messages"]) > 0:
                 # Get the last message from the chunk
                 last_message = chunk["messages"][-1]
@@ -29,27 +29,29 @@ def run_analysis(
     ticker: str, analysis_date: str, 
     analysts: list[AnalystType],
     investment_preferences: str = "",
-    external_reports: list[str] = [] 
+    external_reports: list[str] = [],
+    checkpoint: bool = True,
 ):
     logger.add("logs/reports.log", rotation="1 day", retention="7 days", level="SUCCESS")
+    # Checkpoints let a failed run be continued from its last completed step
     graph = TradingAgentsGraph(
         [analyst.value for analyst in analysts], 
-        config=DEFAULT_CONFIG
+        config={**DEFAULT_CONFIG, "checkpoint_enabled": checkpoint}
     )
 
-    # Initialize state and get graph args
-    init_agent_state = graph.propagator.create_initial_state(
-        asset_name=ticker,
-        trade_date=analysis_date,
-        investment_preferences=investment_preferences,
-        external_reports=external_reports
-    )
-    args = graph.propagator.get_graph_args()
+    run_id, _ = graph.graph_args(ticker, analysis_date)
+    if run_id:
+        logger.info(f"Run id: {run_id} (resume with `python -m cli.batch --resume {run_id}`)")
 
     # Stream the analysis
     trace = []
     completion_status = {}
-    for chunk in graph.graph.stream(init_agent_state, **args):
+    for chunk in graph.stream(
+        ticker, analysis_date,
+        investment_preferences=investment_preferences,
+        external_reports=external_reports,
+        run_id=run_id
+    ):
         if len(chunk["messages"]) > 0:
             
             last_message = chunk["messages"][-1]
@@ -0,0 +1,85 @@
+import time
+
+from tradingagents.dataflows.binance_stream_utils import (
+    BinanceMarketStream,
+    BinanceReplayServer,
+    LocalOrderBook,
+)
+
+
+def depth_event(first, last, previous, bids=(), asks=()):
+    return {
+        "stream": "btcusdt@depth@100ms",
+        "data": {
+            "e": "depthUpdate", "s": "BTCUSDT", "U": first, "u": last, "pu": previous,
+            "b": [list(level) for level in bids], "a": [list(level) for level in asks],
+        },
+    }
+
+
+def kline_event(open_time, close):
+    return {
+        "stream": "btcusdt@kline_1m",
+        "data": {
+            "e": "kline", "s": "BTCUSDT",
+            "k": {"t": open_time, "i": "1m", "o": "100", "h": close, "l": "99", "c": close, "v": "10"},
+        },
+    }
+
+
+# A session where the depth stream skips from update 105 to 111, so the book must be resnapshotted at 118
+RECORDING = {
+    "klines": {"BTCUSDT": {"1m": [[0, "100", "101", "99", "100", "5"], [60000, "100", "101", "99", "100.5", "5"]]}},
+    "depth": {"BTCUSDT": [
+        {"lastUpdateId": 100, "bids": [["100", "1"]], "asks": [["101", "1"]]},
+        {"lastUpdateId": 118, "bids": [["100", "1"], ["99.5", "2"], ["98", "4"]], "asks": [["102", "3"]]},
+    ]},
+    "events": [
+        kline_event(60000, "100.8"),
+        depth_event(98, 101, 97, bids=[("99.5", "2")]),
+        depth_event(102, 105, 101, asks=[("101", "0"), ("102", "3")]),
+        depth_event(111, 115, 110, bids=[("99", "5")]),
+        depth_event(116, 120, 115, bids=[("98", "0")]),
+        depth_event(121, 125, 120, asks=[("101.5", "1")]),
+        kline_event(120000, "101.2"),
+        depth_event(126, 130, 125),
+    ],
+}
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_order_book_requests_a_snapshot_after_a_gap():
+    book = LocalOrderBook()
+    book.apply_event(depth_event(98, 101, 97, bids=[("99.5", "2")])["data"])
+    assert book.load_snapshot({"lastUpdateId": 100, "bids": [["100", "1"]], "asks": [["101", "1"]]})
+    assert book.synced and book.last_update_id == 101
+
+    assert not book.apply_event(depth_event(111, 115, 110)["data"])
+
+
+def test_replayed_session_keeps_the_order_book_in_sync():
+    with BinanceReplayServer(RECORDING, delay=0.05) as server:
+        stream = BinanceMarketStream(stream_url=server.url, rest_client=server.rest_client)
+        try:
+            stream.subscribe("BTCUSDT", ["1m"])
+            assert wait_for(lambda: (stream.get_depth("BTCUSDT", 5) or {}).get("lastUpdateId") == 130)
+
+            assert server.rest_client.depth_requests["BTCUSDT"] == 2
+            assert stream.get_depth("BTCUSDT", 5) == {
+                "lastUpdateId": 130,
+                "bids": [["100.0", "1.0"], ["99.5", "2.0"]],
+                "asks": [["101.5", "1.0"], ["102.0", "3.0"]],
+            }
+            klines = stream.get_klines("BTCUSDT", "1m", 3)
+            assert [kline[0] for kline in klines] == [0, 60000, 120000]
+            assert [kline[4] for kline in klines] == ["100.0", "100.8", "101.2"]
+        finally:
+            stream.stop()
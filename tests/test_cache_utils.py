@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from tradingagents.dataflows import config
+from tradingagents.dataflows.cache_utils import SQLiteCache, seconds_until_candle_close
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, "time", clock)
+    return clock
+
+
+def test_entries_expire_after_their_ttl(tmp_path, clock):
+    cache = SQLiteCache(str(tmp_path / "responses.sqlite3"))
+    cache.set("klines", [1, 2, 3], ttl=60)
+
+    clock.now += 59
+    assert cache.get("klines") == [1, 2, 3]
+    clock.now += 1
+    assert cache.get("klines") is None
+    assert cache._total == 0
+
+
+def test_least_recently_used_entries_are_evicted_beyond_max_bytes(tmp_path, clock):
+    # Every value below is stored as 12 bytes of JSON, so only two fit
+    cache = SQLiteCache(str(tmp_path / "responses.sqlite3"), max_bytes=30)
+    cache.set("a", "x" * 10, ttl=600)
+    clock.now += 1
+    cache.set("b", "y" * 10, ttl=600)
+    clock.now += 1
+    assert cache.get("a") == "x" * 10
+
+    clock.now += 1
+    cache.set("c", "z" * 10, ttl=600)
+    assert cache.get("b") is None
+    assert cache.get("a") == "x" * 10
+    assert cache.get("c") == "z" * 10
+
+
+def test_stored_size_is_tracked_across_replacements_and_reopening(tmp_path, clock):
+    path = str(tmp_path / "responses.sqlite3")
+    cache = SQLiteCache(path)
+    cache.set("a", "x" * 10, ttl=600)
+    cache.set("a", "x" * 20, ttl=600)
+    cache.set("b", "y" * 10, ttl=600)
+    assert cache._total == cache._stored_size() == 34
+
+    assert SQLiteCache(path)._total == 34
+    cache.clear()
+    assert cache._total == 0
+
+
+def test_candle_close_ttl_is_capped(monkeypatch, clock):
+    monkeypatch.setitem(config._config, "data_cache_max_kline_ttl", 300)
+    clock.now = 3600 * 1000 + 3010
+
+    assert seconds_until_candle_close("1m") == 50
+    assert seconds_until_candle_close("1h") == 300
+
+
+def test_unparsable_intervals_fall_back_to_the_max_kline_ttl(monkeypatch):
+    monkeypatch.setitem(config._config, "data_cache_max_kline_ttl", 120)
+
+    assert seconds_until_candle_close("1M") == 120
+    assert seconds_until_candle_close("weekly") == 120
@@ -0,0 +1,102 @@
+import time
+
+import pytest
+
+from tradingagents.dataflows import config, kline_store_utils
+from tradingagents.dataflows.kline_store_utils import KlineStore, resample_klines
+from tradingagents.dataflows.utils import interval_to_seconds
+
+MINUTE = 60_000
+
+
+class FakeExchange:
+    """Serves candles up to the current time, like `fetch_klines_range_from_binance`."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.requests = []
+
+    def __call__(self, symbol, interval, start_time=None, end_time=None, limit=1500):
+        self.requests.append((interval, start_time, end_time, limit))
+        step = interval_to_seconds(interval) * 1000
+        current = int(self.clock() * 1000) // step * step
+        last = current if end_time is None else min(end_time // step * step, current)
+        first = last - (limit - 1) * step if start_time is None else -(-start_time // step) * step
+        times = range(first, min(last, first + (limit - 1) * step) + step, step)
+        return [[t, "1", "2", "0.5", str(t / MINUTE), "10"] for t in times]
+
+
+class Clock:
+    def __init__(self, now=1_700_000_010.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, "time", clock)
+    return clock
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_sync_skips_the_exchange_while_the_current_candle_is_fresh(tmp_path, clock):
+    exchange = FakeExchange(clock)
+    store = KlineStore(str(tmp_path), fetch_range=exchange, max_age=30)
+
+    assert len(store.get_latest("BTCUSDT", "1m", 75)) == 75
+    assert len(exchange.requests) == 1
+
+    clock.now += 20
+    store.get_latest("BTCUSDT", "1m", 75)
+    assert len(exchange.requests) == 1
+
+    clock.now += 20  # past max_age
+    store.get_latest("BTCUSDT", "1m", 75)
+    assert len(exchange.requests) == 2
+
+
+def test_gap_left_by_a_bounded_catch_up_is_backfilled(tmp_path, clock):
+    exchange = FakeExchange(clock)
+    store = KlineStore(str(tmp_path), fetch_range=exchange, max_age=0)
+    store.get_latest("BTCUSDT", "1m", 10)
+
+    clock.now += 60 * 60
+    latest = store.get_latest("BTCUSDT", "1m", 10)
+    assert int(latest[-1, 0]) == int(clock.now * 1000) // MINUTE * MINUTE
+
+    assert wait_for(lambda: not store.find_gaps("BTCUSDT", "1m"))
+    stored = store.load("BTCUSDT", "1m")
+    assert len(stored) == 70
+    assert (stored[1:, 0] - stored[:-1, 0] == MINUTE).all()
+
+
+def test_coarser_intervals_are_resampled_once_the_1m_series_is_stored(tmp_path, clock, monkeypatch):
+    exchange = FakeExchange(clock)
+    store = KlineStore(str(tmp_path / "klines"), fetch_range=exchange, max_age=0)
+    monkeypatch.setitem(config._config, "data_cache_dir", str(tmp_path))
+    monkeypatch.setitem(config._config, "binance_stream_enabled", False)
+    monkeypatch.setattr(kline_store_utils, "_kline_store", store)
+
+    # The first request is served directly while the 1m series is filled in the background
+    direct = kline_store_utils.get_klines("BTC", "15m", 20)
+    assert {request[0] for request in exchange.requests} >= {"15m"}
+    assert wait_for(lambda: not store._background)
+    assert store.covers("BTCUSDT", "1m", int(direct[0, 0]) - 15 * MINUTE)
+
+    exchange.requests.clear()
+    resampled = kline_store_utils.get_klines("BTCUSDT", "15m", 20)
+    assert [request[0] for request in exchange.requests] == ["1m"]
+    assert (resampled[:, 0] == direct[:, 0]).all()
+    expected = resample_klines(store.load("BTCUSDT", "1m"), "15m")[-20:]
+    assert (resampled == expected).all()
@@ -1,6 +1,8 @@
 from .utils.agent_utils import Toolkit, create_msg_delete
 from .utils.agent_states import AgentState, InvestDebateState, RiskDebateState
 from .utils.memory import FinancialSituationMemory
+from .utils.memory_prefetch import create_memory_prefetch
+from .utils.report_digest import create_report_digest
 
 from .analysts.fundamentals_analyst import create_fundamentals_analyst
 from .analysts.market_analyst import create_market_analyst
@@ -13,6 +15,7 @@ from .researchers.bull_researcher import create_bull_researcher
 from .risk_mgmt.aggresive_debator import create_risky_debator
 from .risk_mgmt.conservative_debator import create_safe_debator
 from .risk_mgmt.neutral_debator import create_neutral_debator
+from .risk_mgmt.parallel_round import create_parallel_risk_round
 
 from .managers.research_manager import create_research_manager
 from .managers.risk_manager import create_risk_manager
@@ -28,11 +31,14 @@ __all__ = [
     "RiskDebateState",
     "create_bear_researcher",
     "create_bull_researcher",
+    "create_report_digest",
     "create_research_manager",
     "create_fundamentals_analyst",
     "create_market_analyst",
+    "create_memory_prefetch",
     "create_neutral_debator",
     "create_news_analyst",
+    "create_parallel_risk_round",
     "create_risky_debator",
     "create_risk_manager",
     "create_safe_debator",
@@ -3,6 +3,7 @@ from datetime import datetime
 import json
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.i18n import get_prompts
+from tradingagents.agents.utils.agent_utils import create_agent_node
 
 def create_fundamentals_analyst(llm, toolkit):
     def fundamentals_analyst_node(state):
@@ -39,7 +40,7 @@ def create_fundamentals_analyst(llm, toolkit):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        result = yield chain, state["messages"]
 
         report = ""
 
@@ -51,4 +52,4 @@ def create_fundamentals_analyst(llm, toolkit):
             "fundamentals_report": report,
         }
 
-    return fundamentals_analyst_node
+    return create_agent_node(fundamentals_analyst_node)
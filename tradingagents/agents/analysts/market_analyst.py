@@ -3,6 +3,7 @@ from datetime import datetime
 import json
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.i18n import get_prompts
+from tradingagents.agents.utils.agent_utils import create_agent_node
 
 def create_market_analyst(llm, toolkit):
 
@@ -45,7 +46,7 @@ def create_market_analyst(llm, toolkit):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        result = yield chain, state["messages"]
 
         report = ""
 
@@ -57,4 +58,4 @@ def create_market_analyst(llm, toolkit):
             "market_report": report,
         }
 
-    return market_analyst_node
+    return create_agent_node(market_analyst_node)
@@ -3,6 +3,7 @@ from datetime import datetime
 import json
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.i18n import get_prompts
+from tradingagents.agents.utils.agent_utils import create_agent_node
 
 def create_social_media_analyst(llm, toolkit):
     def social_media_analyst_node(state):
@@ -40,7 +41,7 @@ def create_social_media_analyst(llm, toolkit):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        result = yield chain, state["messages"]
 
         report = ""
 
@@ -52,4 +53,4 @@ def create_social_media_analyst(llm, toolkit):
             "sentiment_report": report,
         }
 
-    return social_media_analyst_node
+    return create_agent_node(social_media_analyst_node)
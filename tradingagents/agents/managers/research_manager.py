@@ -2,25 +2,18 @@ import time
 import json
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.i18n import get_prompts
+from tradingagents.agents.utils.agent_utils import create_agent_node
+from tradingagents.agents.utils.memory_prefetch import get_past_memory_str
 
 def create_research_manager(llm, memory):
     def research_manager_node(state) -> dict:
         history = state["investment_debate_state"].get("history", "")
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
         investment_preferences = state.get("investment_preferences", "")
         external_reports = state.get("external_reports", [])
 
         investment_debate_state = state["investment_debate_state"]
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
-
-        past_memory_str = ""
-        for i, rec in enumerate(past_memories, 1):
-            past_memory_str += rec["recommendation"] + "\n\n"
+        past_memory_str = yield from get_past_memory_str(state, "invest_judge", memory)
 
         prompt = get_prompts("managers", "research_manager") \
             .replace("{max_tokens}", str(DEFAULT_CONFIG["max_tokens"])) \
@@ -30,7 +23,7 @@ def create_research_manager(llm, memory):
             + "\n\n" \
             + get_prompts("investment_preferences", "system_message") \
             .replace("{investment_preferences}", investment_preferences)
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         new_investment_debate_state = {
             "judge_decision": response.content,
@@ -46,4 +39,4 @@ def create_research_manager(llm, memory):
             "investment_plan": response.content,
         }
 
-    return research_manager_node
+    return create_agent_node(research_manager_node)
@@ -2,6 +2,8 @@ import time
 import json
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.i18n import get_prompts
+from tradingagents.agents.utils.agent_utils import create_agent_node
+from tradingagents.agents.utils.memory_prefetch import get_past_memory_str
 
 def create_risk_manager(llm, memory):
     def risk_manager_node(state) -> dict:
@@ -10,20 +12,11 @@ def create_risk_manager(llm, memory):
 
         history = state["risk_debate_state"]["history"]
         risk_debate_state = state["risk_debate_state"]
-        market_research_report = state["market_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["news_report"]
-        sentiment_report = state["sentiment_report"]
         investment_preferences = state.get("investment_preferences", "")
         external_reports = state.get("external_reports", [])
         trader_plan = state["investment_plan"]
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
-
-        past_memory_str = ""
-        for i, rec in enumerate(past_memories, 1):
-            past_memory_str += rec["recommendation"] + "\n\n"
+        past_memory_str = yield from get_past_memory_str(state, "risk_manager", memory)
 
         prompt = get_prompts("managers", "risk_manager") \
             .replace("{max_tokens}", str(DEFAULT_CONFIG["max_tokens"])) \
@@ -35,7 +28,7 @@ def create_risk_manager(llm, memory):
             + get_prompts("investment_preferences", "system_message") \
             .replace("{investment_preferences}", investment_preferences)
         
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         new_risk_debate_state = {
             "judge_decision": response.content,
@@ -55,4 +48,4 @@ def create_risk_manager(llm, memory):
             "final_trade_decision": response.content,
         }
 
-    return risk_manager_node
+    return create_agent_node(risk_manager_node)
@@ -3,6 +3,10 @@ import time
 import json
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.i18n import get_prompts
+from tradingagents.agents.utils.agent_utils import create_agent_node
+from tradingagents.agents.utils.memory_prefetch import get_past_memory_str
+from tradingagents.agents.utils.debate_digest import debate_context
+from tradingagents.agents.utils.report_digest import get_analyst_reports
 
 def create_bear_researcher(llm, memory):
     def bear_node(state) -> dict:
@@ -11,33 +15,25 @@ def create_bear_researcher(llm, memory):
         bear_history = investment_debate_state.get("bear_history", "")
 
         current_response = investment_debate_state.get("current_response", "")
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
+        reports = get_analyst_reports(state)
         investment_preferences = state.get("investment_preferences", "")
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
-
-        past_memory_str = ""
-        for i, rec in enumerate(past_memories, 1):
-            past_memory_str += rec["recommendation"] + "\n\n"
+        past_memory_str = yield from get_past_memory_str(state, "bear", memory)
 
         prompt = get_prompts("researchers", "bear_researcher") \
             .replace("{max_tokens}", str(DEFAULT_CONFIG["max_tokens"])) \
-            .replace("{market_research_report}", market_research_report) \
-            .replace("{sentiment_report}", sentiment_report) \
-            .replace("{news_report}", news_report) \
-            .replace("{fundamentals_report}", fundamentals_report) \
-            .replace("{history}", history) \
+            .replace("{market_research_report}", reports["market_report"]) \
+            .replace("{sentiment_report}", reports["sentiment_report"]) \
+            .replace("{news_report}", reports["news_report"]) \
+            .replace("{fundamentals_report}", reports["fundamentals_report"]) \
+            .replace("{history}", debate_context(investment_debate_state)) \
             .replace("{current_response}", current_response) \
             .replace("{past_memory_str}", past_memory_str) \
             + "\n\n" \
             + get_prompts("investment_preferences", "system_message") \
             .replace("{investment_preferences}", investment_preferences)
 
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         argument = f"Bear Analyst: {response.content}"
 
@@ -51,4 +47,4 @@ def create_bear_researcher(llm, memory):
 
         return {"investment_debate_state": new_investment_debate_state}
 
-    return bear_node
+    return create_agent_node(bear_node)
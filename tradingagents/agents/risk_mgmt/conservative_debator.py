@@ -3,6 +3,9 @@ import time
 import json
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.i18n import get_prompts
+from tradingagents.agents.utils.agent_utils import create_agent_node
+from tradingagents.agents.utils.debate_digest import debate_context
+from tradingagents.agents.utils.report_digest import get_analyst_reports
 
 def create_safe_debator(llm):
     def safe_node(state) -> dict:
@@ -13,10 +16,7 @@ def create_safe_debator(llm):
         current_risky_response = risk_debate_state.get("current_risky_response", "")
         current_neutral_response = risk_debate_state.get("current_neutral_response", "")
 
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
+        reports = get_analyst_reports(state)
 
         trader_decision = state["trader_investment_plan"]
         investment_preferences = state.get("investment_preferences", "")
@@ -24,18 +24,18 @@ def create_safe_debator(llm):
         prompt = get_prompts("risk_mgmt", "conservative_debator") \
             .replace("{max_tokens}", str(DEFAULT_CONFIG["max_tokens"])) \
             .replace("{trader_decision}", trader_decision) \
-            .replace("{market_research_report}", market_research_report) \
-            .replace("{sentiment_report}", sentiment_report) \
-            .replace("{news_report}", news_report) \
-            .replace("{fundamentals_report}", fundamentals_report) \
-            .replace("{history}", history) \
+            .replace("{market_research_report}", reports["market_report"]) \
+            .replace("{sentiment_report}", reports["sentiment_report"]) \
+            .replace("{news_report}", reports["news_report"]) \
+            .replace("{fundamentals_report}", reports["fundamentals_report"]) \
+            .replace("{history}", debate_context(risk_debate_state)) \
             .replace("{current_risky_response}", current_risky_response) \
             .replace("{current_neutral_response}", current_neutral_response) \
             + "\n\n" \
             + get_prompts("investment_preferences", "system_message") \
             .replace("{investment_preferences}", investment_preferences)
         
-        response = llm.invoke(prompt)
+        response = yield llm, prompt
 
         argument = f"Safe Analyst: {response.content}"
 
@@ -57,4 +57,4 @@ def create_safe_debator(llm):
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return safe_node
+    return create_agent_node(safe_node)
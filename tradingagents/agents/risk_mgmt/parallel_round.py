@@ -0,0 +1,54 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.runnables import RunnableLambda
+from tradingagents.agents.utils.agent_utils import create_agent_node
+from tradingagents.agents.utils.debate_digest import compact_history
+
+RISK_SPEAKERS = ("risky", "safe", "neutral")
+
+
+def create_parallel_risk_round(risky_node, safe_node, neutral_node, llm=None, max_count=None):
+    """
+    Run one round of the risk debate with the three debators at once.
+    Each debator answers the same snapshot of the debate, and their arguments are
+    merged into the debate state in a fixed order: Risky, Safe, then Neutral.
+    With `llm`, the merged history is compacted once per round with `compact_history`,
+    except after the round that reaches `max_count` turns.
+    """
+    nodes = {"risky": risky_node, "safe": safe_node, "neutral": neutral_node}
+
+    def compact(inputs):
+        risk_debate_state, new_risk_debate_state = inputs
+        if llm is None:
+            return {"risk_debate_state": new_risk_debate_state}
+        return {"risk_debate_state": (yield from compact_history(llm, risk_debate_state, new_risk_debate_state, max_count))}
+
+    compact_node = create_agent_node(compact)
+
+    def merge(risk_debate_state, results) -> dict:
+        arguments = [results[speaker][f"current_{speaker}_response"] for speaker in RISK_SPEAKERS]
+        new_risk_debate_state = {
+            "history": risk_debate_state.get("history", "") + "".join("\n" + argument for argument in arguments),
+            "digest": risk_debate_state.get("digest", ""),
+            "digest_offset": risk_debate_state.get("digest_offset", 0),
+            "latest_speaker": "Neutral",
+            "count": risk_debate_state["count"] + len(RISK_SPEAKERS),
+        }
+        for speaker in RISK_SPEAKERS:
+            new_risk_debate_state[f"{speaker}_history"] = results[speaker][f"{speaker}_history"]
+            new_risk_debate_state[f"current_{speaker}_response"] = results[speaker][f"current_{speaker}_response"]
+
+        return risk_debate_state, new_risk_debate_state
+
+    def parallel_risk_round_node(state) -> dict:
+        with ThreadPoolExecutor(max_workers=len(nodes)) as executor:
+            futures = {speaker: executor.submit(node.invoke, state) for speaker, node in nodes.items()}
+            results = {speaker: future.result()["risk_debate_state"] for speaker, future in futures.items()}
+        return compact_node.invoke(merge(state["risk_debate_state"], results))
+
+    async def aparallel_risk_round_node(state) -> dict:
+        outputs = await asyncio.gather(*[node.ainvoke(state) for node in nodes.values()])
+        results = {speaker: output["risk_debate_state"] for speaker, output in zip(nodes, outputs)}
+        return await compact_node.ainvoke(merge(state["risk_debate_state"], results))
+
+    return RunnableLambda(parallel_risk_round_node, afunc=aparallel_risk_round_node)
@@ -2,24 +2,17 @@ import functools
 import time
 import json
 from tradingagents.i18n import get_prompts
+from tradingagents.agents.utils.agent_utils import create_agent_node
+from tradingagents.agents.utils.memory_prefetch import get_past_memory_str
 
 def create_trader(llm, memory):
     def trader_node(state, name):
         asset_name = state["asset_of_interest"]
         investment_plan = state["investment_plan"]
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
         external_reports = state.get("external_reports", [])
         investment_preferences = state.get("investment_preferences", "")
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
-
-        past_memory_str = ""
-        for i, rec in enumerate(past_memories, 1):
-            past_memory_str += rec["recommendation"] + "\n\n"
+        past_memory_str = yield from get_past_memory_str(state, "trader", memory)
 
         context = {
             "role": "user",
@@ -43,7 +36,7 @@ def create_trader(llm, memory):
             context,
         ]
 
-        result = llm.invoke(messages)
+        result = yield llm, messages
 
         return {
             "messages": [result],
@@ -51,4 +44,4 @@ def create_trader(llm, memory):
             "sender": name,
         }
 
-    return functools.partial(trader_node, name="Trader")
+    return create_agent_node(functools.partial(trader_node, name="Trader"), name="Trader")
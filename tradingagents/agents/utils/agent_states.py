@@ -16,6 +16,8 @@ class InvestDebateState(TypedDict):
         str, "Bearish Conversation history"
     ]  # Bullish Conversation history
     history: Annotated[str, "Conversation history"]  # Conversation history
+    digest: Annotated[str, "Summary of the turns before digest_offset"]
+    digest_offset: Annotated[int, "Length of the history covered by the digest"]
     current_response: Annotated[str, "Latest response"]  # Last response
     judge_decision: Annotated[str, "Final judge decision"]  # Last response
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
@@ -33,6 +35,8 @@ class RiskDebateState(TypedDict):
         str, "Neutral Agent's Conversation history"
     ]  # Conversation history
     history: Annotated[str, "Conversation history"]  # Conversation history
+    digest: Annotated[str, "Summary of the turns before digest_offset"]
+    digest_offset: Annotated[int, "Length of the history covered by the digest"]
     latest_speaker: Annotated[str, "Analyst that spoke last"]
     current_risky_response: Annotated[
         str, "Latest response by the risky analyst"
@@ -62,6 +66,8 @@ class AgentState(MessagesState):
         str, "Report from the News Researcher of current world affairs"
     ]
     fundamentals_report: Annotated[str, "Report from the Fundamentals Researcher"]
+    reports_digest: Annotated[dict[str, str], "Condensed analyst reports, by report key, used in downstream prompts"]
+    past_memories: Annotated[dict[str, str], "Past recommendations for the current situation, by memory name"]
 
     # researcher team discussion step
     investment_debate_state: Annotated[
@@ -4,17 +4,93 @@ from typing import Annotated
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import RemoveMessage
 from langchain_core.tools import tool
+from langchain_core.runnables import RunnableLambda
 from datetime import date, timedelta, datetime
 import functools
+import asyncio
+import inspect
 import pandas as pd
 import os
 from dateutil.relativedelta import relativedelta
 from langchain_openai import ChatOpenAI
 import tradingagents.dataflows.interface as interface
 from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.dataflows.utils import to_base_asset, to_futures_symbol
+from tradingagents.agents.utils.single_flight import single_flight
 from langchain_core.messages import HumanMessage
 
 
+def create_agent_node(node, name=None):
+    """Turn an agent node written as a generator into a graph node that runs both sync and async.
+
+    The generator yields its blocking steps and receives their results: a `(runnable, input)`
+    pair is run with `invoke`, or `ainvoke` in async runs, and a zero-argument callable
+    (e.g. a memory lookup) is called directly, or in a worker thread in async runs.
+    """
+    def run(state):
+        steps = node(state)
+        try:
+            step = next(steps)
+            while True:
+                if isinstance(step, tuple):
+                    runnable, value = step
+                    step = steps.send(runnable.invoke(value))
+                else:
+                    step = steps.send(step())
+        except StopIteration as stop:
+            return stop.value
+
+    async def arun(state):
+        steps = node(state)
+        try:
+            step = next(steps)
+            while True:
+                if isinstance(step, tuple):
+                    runnable, value = step
+                    step = steps.send(await runnable.ainvoke(value))
+                else:
+                    step = steps.send(await asyncio.to_thread(step))
+        except StopIteration as stop:
+            return stop.value
+
+    return RunnableLambda(run, afunc=arun, name=name or getattr(node, "__name__", None))
+
+
+def with_coroutine(coroutine):
+    """Give a tool an async implementation, used by `ainvoke` and async graph runs.
+
+    The coroutine must accept the same arguments as the tool. It shares single-flight
+    coalescing and memoized results with the sync implementation.
+    """
+    def decorator(tool):
+        tool.coroutine = single_flight(coroutine, key_prefix=tool.func.single_flight_key)
+        return tool
+
+    return decorator
+
+
+def normalize_args(**normalizers):
+    """Normalize tool arguments before `single_flight` sees them, so equivalent calls (e.g. with
+    'BTC' and 'BTCUSDT') share one in-flight call and memoized result.
+
+    Each keyword names an argument and the function normalizing its value.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            for name, normalize in normalizers.items():
+                if name in bound.arguments:
+                    bound.arguments[name] = normalize(bound.arguments[name])
+            return fn(*bound.args, **bound.kwargs)
+
+        return wrapper
+
+    return decorator
+
+
 def create_msg_delete():
     def delete_messages(state):
         """Clear messages and add placeholder for Anthropic compatibility"""
@@ -49,7 +125,9 @@ class Toolkit:
             self.update_config(config)
 
     @staticmethod
+    @with_coroutine(interface.aget_blockbeats_news)
     @tool
+    @single_flight
     def get_blockbeats_news(
         count: Annotated[int, "Number of news articles to retrieve, no more than 30"] = 10,
     ) -> str:
@@ -64,7 +142,9 @@ class Toolkit:
         return blockbeats_news_result
     
     @staticmethod
+    @with_coroutine(interface.aget_coindesk_news)
     @tool
+    @single_flight
     def get_coindesk_news(
         tickers: Annotated[
             List[str],
@@ -84,7 +164,9 @@ class Toolkit:
         return coindesk_news_result
     
     @staticmethod
+    @with_coroutine(interface.aget_coinstats_news)
     @tool
+    @single_flight
     def get_coinstats_news() -> str:
         """
         Retrieve the latest news from CoinStats.
@@ -96,6 +178,8 @@ class Toolkit:
     
     @staticmethod
     @tool
+    @normalize_args(symbol=to_futures_symbol)
+    @single_flight
     def get_binance_ohlcv(
         symbol: Annotated[str, "ticker symbol of the asset"],
         interval: Annotated[
@@ -115,7 +199,9 @@ class Toolkit:
         return binance_ohlcv_result
     
     @staticmethod
+    @with_coroutine(interface.aget_coinstats_btc_dominance)
     @tool
+    @single_flight
     def get_coinstats_btc_dominance() -> str:
         """
         Retrieve the current Bitcoin dominance percentage from CoinStats.
@@ -127,6 +213,8 @@ class Toolkit:
     
     @staticmethod
     @tool
+    @normalize_args(symbol=to_futures_symbol)
+    @single_flight
     def get_binance_data(
         symbol: Annotated[str, "ticker symbol of the asset"],
         interval: Annotated[
@@ -146,7 +234,9 @@ class Toolkit:
         return binance_data_result
     
     @staticmethod
+    @with_coroutine(interface.aget_fear_and_greed_index)
     @tool
+    @single_flight
     def get_fear_and_greed_index() -> str:
         """
         Get current crypto market Fear and Greed Index. 0 means "Extreme Fear", while 100 means "Extreme Greed"
@@ -157,6 +247,8 @@ class Toolkit:
     
     @staticmethod
     @tool
+    @normalize_args(symbol=to_base_asset)
+    @single_flight
     def get_taapi_bulk_indicators(
         symbol: Annotated[str, "Ticker symbol of the asset, e.g. 'BTC'"],
         interval: Annotated[
@@ -207,6 +299,8 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @normalize_args(symbol=to_base_asset)
+    @single_flight
     def get_reddit_posts(
         symbol: Annotated[str, "Ticker symbol of the asset, e.g. 'BTC'"],
         subreddit: Annotated[str, "Subreddit to search in, e.g. 'CryptoCurrency', 'CryptoMarkets', 'all'"] = "CryptoCurrency",
@@ -228,6 +322,7 @@ class Toolkit:
 
     @staticmethod
     @tool
+    @single_flight
     def get_google_news(
         query: Annotated[str, "Query to search with"],
         curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
@@ -247,7 +342,9 @@ class Toolkit:
         return google_news_results
 
     @staticmethod
+    @with_coroutine(interface.aget_asset_news_llm)
     @tool
+    @single_flight
     def get_asset_news_llm(
         ticker: Annotated[str, "the asset's ticker"],
         curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
@@ -265,7 +362,9 @@ class Toolkit:
         return openai_news_results
 
     @staticmethod
+    @with_coroutine(interface.aget_global_news_llm)
     @tool
+    @single_flight
     def get_global_news_llm(
         curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
     ):
@@ -281,7 +380,9 @@ class Toolkit:
         return openai_news_results
 
     @staticmethod
+    @with_coroutine(interface.aget_fundamentals_llm)
     @tool
+    @single_flight
     def get_fundamentals_llm(
         ticker: Annotated[str, "the asset's ticker"],
         curr_date: Annotated[str, "Current date in yyyy-mm-dd format"],
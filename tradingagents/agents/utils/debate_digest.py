@@ -0,0 +1,53 @@
+from tradingagents.i18n import get_prompts
+from tradingagents.dataflows.config import get_config
+from tradingagents.agents.utils.agent_utils import create_agent_node
+
+
+def debate_context(debate_state) -> str:
+    """The debate history shown to the debaters: a digest of the older turns followed by the recent turns verbatim."""
+    history = debate_state.get("history", "")
+    digest = debate_state.get("digest", "")
+    recent = history[debate_state.get("digest_offset", 0):]
+    if not digest:
+        return recent
+    return get_prompts("debate_digest", "context") \
+        .replace("{digest}", digest) \
+        .replace("{recent}", recent)
+
+
+def compact_history(llm, previous_state, debate_state, max_count=None):
+    """
+    Fold older debate turns into the digest once the prompt history exceeds `debate_history_budget` characters.\n
+    `history` keeps the full transcript. The digest covers `history[:digest_offset]`, and the turns
+    added since `previous_state` always stay verbatim. Once `count` reaches `max_count` the debate is
+    over and the judge reads the full history, so nothing is compacted. Written as a generator step of
+    an agent node (see `create_agent_node`), it yields the summarization call and returns the updated debate state.
+    """
+    digest = previous_state.get("digest", "")
+    digest_offset = previous_state.get("digest_offset", 0)
+    latest_turn_start = len(previous_state.get("history", ""))
+    history = debate_state["history"]
+
+    budget = get_config()["debate_history_budget"]
+    debate_over = max_count is not None and debate_state["count"] >= max_count
+    if budget and not debate_over and latest_turn_start > digest_offset and len(digest) + len(history) - digest_offset > budget:
+        prompt = get_prompts("debate_digest", "system_message") \
+            .replace("{max_chars}", str(budget // 2)) \
+            .replace("{digest}", digest or "-") \
+            .replace("{turns}", history[digest_offset:latest_turn_start])
+        response = yield llm, prompt
+        digest, digest_offset = response.content, latest_turn_start
+
+    return {**debate_state, "digest": digest, "digest_offset": digest_offset}
+
+
+def with_history_digest(node, llm, state_key, max_count=None):
+    """
+    Wrap a debate node so the debate state it returns is compacted with `compact_history`,
+    until the debate reaches `max_count` turns.
+    """
+    def digest_node(state):
+        result = yield node, state
+        return {state_key: (yield from compact_history(llm, state[state_key], result[state_key], max_count))}
+
+    return create_agent_node(digest_node, name=getattr(node, "name", None))
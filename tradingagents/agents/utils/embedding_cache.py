@@ -0,0 +1,86 @@
+import os
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    Content-addressed cache of text embeddings.\n
+    Entries are keyed by the hash of the embedding model and the text. Recently used
+    embeddings are kept in an in-memory LRU tier in front of an optional SQLite tier,
+    so they survive restarts. Embeddings are stored as float32.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 1024):
+        """
+        :param path: Path of the SQLite database file, or None to keep embeddings in memory only.
+        :param max_entries: Number of embeddings kept in the in-memory tier.
+        """
+        self.max_entries = max_entries
+        self._lru: OrderedDict[str, List[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, model: str, texts: List[str]) -> Dict[str, List[float]]:
+        """Return the cached embeddings of `texts`, by text. Missing texts are left out."""
+        found = {}
+        with self._lock:
+            for text in texts:
+                key = self.make_key(model, text)
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[text] = self._lru[key]
+                    continue
+                if self._conn is None:
+                    continue
+                row = self._conn.execute("SELECT value FROM embeddings WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    found[text] = self._remember(key, np.frombuffer(row[0], dtype=np.float32).tolist())
+        return found
+
+    def set_many(self, model: str, embeddings: Dict[str, List[float]]) -> Dict[str, List[float]]:
+        """Store embeddings by text, and return them as they will be served from the cache."""
+        stored = {}
+        with self._lock:
+            rows = []
+            for text, embedding in embeddings.items():
+                key = self.make_key(model, text)
+                vector = np.asarray(embedding, dtype=np.float32)
+                stored[text] = self._remember(key, vector.tolist())
+                rows.append((key, vector.tobytes()))
+            if self._conn is not None and rows:
+                self._conn.executemany("INSERT OR REPLACE INTO embeddings (key, value) VALUES (?, ?)", rows)
+        return stored
+
+    def _remember(self, key: str, embedding: List[float]) -> List[float]:
+        self._lru[key] = embedding
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+        return embedding
+
+
+_caches: Dict[Optional[str], EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(config) -> EmbeddingCache:
+    """Get the embedding cache shared by every memory using the same cache file."""
+    path = os.path.join(config["data_cache_dir"], "embeddings.sqlite3") if config["embedding_cache_persist"] else None
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = EmbeddingCache(path, config["embedding_cache_size"])
+        return _caches[path]
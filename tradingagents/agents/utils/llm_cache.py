@@ -0,0 +1,83 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Optional
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+
+LLM_CACHE_MODES = ("off", "read_through", "record", "replay")
+
+
+class LLMCacheMiss(LookupError):
+    """Raised in replay mode when a request has no recorded response."""
+
+
+class LLMResponseCache(BaseCache):
+    """
+    Content-addressed cache of chat model responses backed by SQLite.\n
+    LangChain calls it with the serialized messages and a string of the model, its
+    parameters and the bound tools, so a response is only reused for an identical request.
+    Modes:
+    - `read_through`: reuse recorded responses and record new ones
+    - `record`: always call the model and record the responses
+    - `replay`: only serve recorded responses, a miss raises `LLMCacheMiss`
+    """
+
+    def __init__(self, path: str, mode: str = "read_through"):
+        """
+        :param path: Path of the SQLite database file.
+        :param mode: One of 'read_through', 'record' or 'replay'.
+        """
+        if mode not in LLM_CACHE_MODES[1:]:
+            raise ValueError(f"Unsupported LLM cache mode: {mode}")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> str:
+        """Hash the serialized request and the model description into the entry key."""
+        return hashlib.sha256(json.dumps([llm_string, prompt]).encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Any]:
+        if self.mode == "record":
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM llm_responses WHERE key = ?", (self.make_key(prompt, llm_string),)
+            ).fetchone()
+        if row is not None:
+            return loads(row[0])
+        if self.mode == "replay":
+            raise LLMCacheMiss("No recorded LLM response for this request in replay mode")
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val) -> None:
+        if self.mode == "replay":
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, value, created_at) VALUES (?, ?, ?)",
+                (self.make_key(prompt, llm_string), dumps(return_val), time.time()),
+            )
+
+    def clear(self, **kwargs) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+
+
+def create_llm_cache(config) -> Optional[LLMResponseCache]:
+    """Create the LLM response cache configured by `llm_cache_mode`, or None when it is off."""
+    if config["llm_cache_mode"] == "off":
+        return None
+    return LLMResponseCache(config["llm_cache_path"], config["llm_cache_mode"])
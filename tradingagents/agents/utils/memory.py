@@ -1,7 +1,29 @@
 import os
-import chromadb
-from chromadb.config import Settings
+import uuid
+import threading
 from openai import OpenAI
+from tradingagents.agents.utils.embedding_cache import get_embedding_cache
+from tradingagents.agents.utils.vector_index import get_vector_index
+
+_chroma_clients = {}
+_chroma_clients_lock = threading.Lock()
+
+
+def get_chroma_client(path=None):
+    """Get the chromadb client shared by every memory stored under `path`, or the in-memory client if None.
+
+    chromadb is imported on first use so building a graph does not pay for it.
+    """
+    import chromadb
+    from chromadb.config import Settings
+
+    with _chroma_clients_lock:
+        if path not in _chroma_clients:
+            if path:
+                _chroma_clients[path] = chromadb.PersistentClient(path=path, settings=Settings(anonymized_telemetry=False))
+            else:
+                _chroma_clients[path] = chromadb.Client(Settings(allow_reset=True))
+        return _chroma_clients[path]
 
 
 class FinancialSituationMemory:
@@ -23,32 +45,72 @@ class FinancialSituationMemory:
         else:
             self.embedding = "text-embedding-3-small"
             self.client = OpenAI()
-        self.chroma_client = chromadb.Client(Settings(allow_reset=True))
-        self.situation_collection = self.chroma_client.create_collection(name=name)
+        self.embedding_cache = get_embedding_cache(config)
+        self.embedding_batch_size = config["embedding_batch_size"]
+        self.name = name
+        self.memory_dir = config["memory_dir"] if config["memory_persist"] else None
+        self.backend = config["memory_backend"]
+        self.ivf_threshold = config["memory_ivf_threshold"]
+        self.ivf_nprobe = config["memory_ivf_nprobe"]
+        self._situation_collection = None
+        self._collection_lock = threading.Lock()
+
+    @property
+    def situation_collection(self):
+        """The collection of situations and advice, opened on first use and shared by memories with the same name."""
+        if self._situation_collection is None:
+            with self._collection_lock:
+                if self._situation_collection is None:
+                    self._situation_collection = self._open_collection()
+        return self._situation_collection
+
+    def _open_collection(self):
+        if self.backend == "numpy":
+            path = os.path.join(self.memory_dir, self.name) if self.memory_dir else None
+            return get_vector_index(self.name, path, self.ivf_threshold, self.ivf_nprobe)
+        if self.backend == "chromadb":
+            return get_chroma_client(self.memory_dir).get_or_create_collection(name=self.name)
+        raise ValueError(f"Unsupported memory backend: {self.backend}")
 
     def get_embedding(self, text):
         """Get OpenAI embedding for a text"""
-        
-        response = self.client.embeddings.create(
-            model=self.embedding, input=text
-        )
-        return response.data[0].embedding
+        return self.get_embeddings([text])[0]
+
+    def get_embeddings(self, texts):
+        """Get OpenAI embeddings for several texts.
+
+        Embeddings are served from the cache shared by all memories when possible, and the
+        missing texts are requested in batches of `embedding_batch_size`.
+        """
+        embeddings = self.embedding_cache.get_many(self.embedding, texts)
+        missing = list(dict.fromkeys(text for text in texts if text not in embeddings))
+        for start in range(0, len(missing), self.embedding_batch_size):
+            batch = missing[start:start + self.embedding_batch_size]
+            response = self.client.embeddings.create(
+                model=self.embedding, input=batch
+            )
+            fetched = {text: item.embedding for text, item in zip(batch, sorted(response.data, key=lambda item: item.index))}
+            embeddings.update(self.embedding_cache.set_many(self.embedding, fetched))
+        return [embeddings[text] for text in texts]
+
+    def add_situations(self, situations_and_advice, embeddings=None):
+        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)
 
-    def add_situations(self, situations_and_advice):
-        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
+        Precomputed `embeddings` of the situations, in the same order, skip the embedding requests.
+        """
 
         situations = []
         advice = []
         ids = []
-        embeddings = []
-
-        offset = self.situation_collection.count()
 
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
+        for situation, recommendation in situations_and_advice:
             situations.append(situation)
             advice.append(recommendation)
-            ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+            # Unique ids, as other graphs and processes may add to the same collection
+            ids.append(uuid.uuid4().hex)
+
+        if embeddings is None:
+            embeddings = self.get_embeddings(situations)
 
         self.situation_collection.add(
             documents=situations,
@@ -57,9 +119,16 @@ class FinancialSituationMemory:
             ids=ids,
         )
 
-    def get_memories(self, current_situation, n_matches=1):
-        """Find matching recommendations using OpenAI embeddings"""
-        query_embedding = self.get_embedding(current_situation)
+    def get_memories(self, current_situation, n_matches=1, query_embedding=None):
+        """Find matching recommendations using OpenAI embeddings
+
+        A precomputed `query_embedding` of the situation skips the embedding request.
+        """
+        if self.situation_collection.count() == 0:
+            return []
+
+        if query_embedding is None:
+            query_embedding = self.get_embedding(current_situation)
 
         results = self.situation_collection.query(
             query_embeddings=[query_embedding],
@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+from tradingagents.agents.utils.agent_utils import create_agent_node
+from tradingagents.agents.utils.report_digest import REPORT_KEYS
+
+MEMORY_MATCHES = 2
+
+
+def get_situation(state) -> str:
+    """The current situation that memories are matched against: the full analyst reports."""
+    return "\n\n".join(state[key] for key in REPORT_KEYS)
+
+
+def format_memories(memories) -> str:
+    return "".join(rec["recommendation"] + "\n\n" for rec in memories)
+
+
+def get_past_memory_str(state, name, memory):
+    """
+    Past recommendations for the current situation from the memory of `name`, as inlined in
+    the prompts. Taken from `past_memories` when the Memory Prefetch node ran, otherwise looked
+    up in `memory`. Used with `yield from` inside agent nodes.
+    """
+    past_memories = state.get("past_memories") or {}
+    if name in past_memories:
+        return past_memories[name]
+
+    memories = yield lambda: memory.get_memories(get_situation(state), n_matches=MEMORY_MATCHES)
+    return format_memories(memories)
+
+
+def create_memory_prefetch(memories: dict):
+    """
+    Look up every memory once the analyst reports are final, into `past_memories`.\n
+    The situation is embedded once and the memories, keyed like `REFLECTION_COMPONENTS`,
+    are queried concurrently, so the research and risk teams do not wait on retrieval.
+    """
+    def lookup(situation):
+        names = [name for name, memory in memories.items() if memory.situation_collection.count()]
+        if not names:
+            return {name: "" for name in memories}
+        embedding = memories[names[0]].get_embedding(situation)
+        with ThreadPoolExecutor(max_workers=len(names)) as executor:
+            results = executor.map(
+                lambda name: memories[name].get_memories(situation, MEMORY_MATCHES, query_embedding=embedding),
+                names,
+            )
+            found = {name: format_memories(result) for name, result in zip(names, results)}
+        return {name: found.get(name, "") for name in memories}
+
+    def memory_prefetch_node(state) -> dict:
+        situation = get_situation(state)
+        past_memories = yield lambda: lookup(situation)
+        return {"past_memories": past_memories}
+
+    return create_agent_node(memory_prefetch_node)
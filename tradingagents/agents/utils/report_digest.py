@@ -0,0 +1,36 @@
+from tradingagents.i18n import get_prompts
+from tradingagents.dataflows.config import get_config
+from tradingagents.agents.utils.agent_utils import create_agent_node
+
+REPORT_KEYS = ("market_report", "sentiment_report", "news_report", "fundamentals_report")
+
+
+def get_analyst_reports(state) -> dict:
+    """The analyst reports inlined in the downstream prompts: condensed if the Report Digest node ran, otherwise in full."""
+    digest = state.get("reports_digest") or {}
+    return {key: digest.get(key, state[key]) for key in REPORT_KEYS}
+
+
+def create_report_digest(llm):
+    """
+    Condense the analyst reports once, after the analyst team, into `reports_digest`.\n
+    Reports longer than `report_digest_max_chars` are summarized concurrently, one call per
+    report, and shorter ones are kept as they are.
+    """
+    def report_digest_node(state) -> dict:
+        max_chars = get_config()["report_digest_max_chars"]
+        digest = {key: state[key] for key in REPORT_KEYS}
+        keys = [key for key in REPORT_KEYS if len(state[key]) > max_chars]
+        if keys:
+            prompts = [
+                get_prompts("report_digest", "system_message")
+                .replace("{max_chars}", str(max_chars))
+                .replace("{report}", state[key])
+                for key in keys
+            ]
+            responses = yield llm.map(), prompts
+            digest.update({key: response.content for key, response in zip(keys, responses)})
+
+        return {"reports_digest": digest}
+
+    return create_agent_node(report_digest_node)
@@ -0,0 +1,117 @@
+import json
+import asyncio
+import inspect
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from functools import wraps
+from tradingagents.dataflows.config import get_config
+
+_lock = threading.Lock()
+_in_flight: dict[str, Future] = {}
+# Memoized results of the current run, shared by the threads and tasks started inside its scope
+_run_results: ContextVar[Optional[dict]] = ContextVar("tool_run_results", default=None)
+
+
+@contextmanager
+def tool_run_scope():
+    """
+    Memoize tool results for the duration of the block, e.g. one `propagate` call.
+    Every scope has its own memo, so overlapping runs never see each other's results,
+    and the memo is dropped when the block ends.
+    """
+    token = _run_results.set({})
+    try:
+        yield
+    finally:
+        _run_results.reset(token)
+
+
+def single_flight(fn, key_prefix: str = None):
+    """
+    Coalesce identical tool calls.\n
+    Concurrent calls with the same arguments share one execution, and inside a run scope
+    completed results are reused until the run ends. Errors are passed to every waiting
+    caller but never memoized. Disabled when `tool_single_flight` is False.
+    Coroutine functions get an async wrapper; pass the sync tool's `single_flight_key` as
+    `key_prefix` so both variants share in-flight calls and results.
+    """
+    signature = inspect.signature(fn)
+    key_prefix = key_prefix or fn.__qualname__
+
+    def make_key(args, kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return json.dumps([key_prefix, bound.arguments], sort_keys=True, default=str)
+
+    def claim(key):
+        """Return (memoized, value) on a hit, otherwise (False, (future, owner))."""
+        results = _run_results.get()
+        with _lock:
+            if results is not None and key in results:
+                return True, results[key]
+            future = _in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = _in_flight[key] = Future()
+        return False, (future, owner)
+
+    def fail(key, future, e):
+        with _lock:
+            del _in_flight[key]
+        future.set_exception(e)
+
+    def succeed(key, future, result):
+        results = _run_results.get()
+        with _lock:
+            del _in_flight[key]
+            if results is not None:
+                results[key] = result
+        future.set_result(result)
+
+    if inspect.iscoroutinefunction(fn):
+        @wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            if not get_config()["tool_single_flight"]:
+                return await fn(*args, **kwargs)
+            key = make_key(args, kwargs)
+            memoized, value = claim(key)
+            if memoized:
+                return value
+            future, owner = value
+            if not owner:
+                return await asyncio.wrap_future(future)
+            try:
+                result = await fn(*args, **kwargs)
+            except BaseException as e:
+                fail(key, future, e)
+                raise
+            succeed(key, future, result)
+            return result
+
+        async_wrapper.single_flight_key = key_prefix
+        return async_wrapper
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not get_config()["tool_single_flight"]:
+            return fn(*args, **kwargs)
+        key = make_key(args, kwargs)
+        memoized, value = claim(key)
+        if memoized:
+            return value
+        future, owner = value
+        if not owner:
+            return future.result()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            fail(key, future, e)
+            raise
+        succeed(key, future, result)
+        return result
+
+    wrapper.single_flight_key = key_prefix
+    return wrapper
@@ -0,0 +1,209 @@
+import os
+import json
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+VECTORS_FILE = "vectors.f32"
+ENTRIES_FILE = "entries.jsonl"
+INFO_FILE = "index.json"
+LOCK_FILE = "index.lock"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class VectorIndex:
+    """
+    Vector index over float32 embeddings stored in a memory-mapped matrix.\n
+    Embeddings are L2-normalized on insert, so top-k is a dot product with the normalized
+    query and distances are cosine distances. Once the index holds `ivf_threshold` entries,
+    queries only scan the `nprobe` clusters closest to the query out of about sqrt(n) k-means
+    clusters (IVF), plus the entries added since the clusters were trained.\n
+    Implements the part of the chromadb collection API used by `FinancialSituationMemory`.
+    Files are only appended to, so other processes see new entries on their next query, and
+    writers hold a file lock so the rows of both files stay aligned across processes.
+    """
+
+    def __init__(self, path: Optional[str] = None, ivf_threshold: int = 50000, nprobe: int = 16):
+        """
+        :param path: Directory of the index files, or None to keep the index in memory only.
+        :param ivf_threshold: Entries needed before queries use the IVF clusters, 0 always scans every entry.
+        :param nprobe: Clusters scanned per query once the IVF clusters are used.
+        """
+        self.path = path
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self._lock = threading.Lock()
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict] = []
+        self._entries_size = 0
+        self._dim = 0
+        self._ivf: Optional[Tuple[np.ndarray, List[np.ndarray], int]] = None  # centroids, rows per cluster, trained size
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    def count(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._ids)
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold the exclusive lock of the index files, shared with other processes."""
+        if self.path is None:
+            yield
+            return
+        with open(os.path.join(self.path, LOCK_FILE), "a") as f:
+            if fcntl is None:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+                return
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def add(self, documents: List[str], metadatas: List[Dict], embeddings, ids: List[str]):
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1))
+        with self._lock, self._file_lock():
+            self._refresh()
+            if self._ids and vectors.shape[1] != self._vectors.shape[1]:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match the index dimension {self._vectors.shape[1]}"
+                )
+
+            if self.path is None:
+                self._vectors = np.concatenate([self._vectors.reshape(-1, vectors.shape[1]), vectors])
+                self._ids.extend(ids)
+                self._documents.extend(documents)
+                self._metadatas.extend(metadatas)
+                return
+
+            info_path = os.path.join(self.path, INFO_FILE)
+            if not os.path.exists(info_path):
+                with open(info_path, "w") as f:
+                    json.dump({"dim": vectors.shape[1]}, f)
+            # Vectors are written before their entries, which decide how many rows are visible
+            with open(os.path.join(self.path, VECTORS_FILE), "ab") as f:
+                f.write(vectors.tobytes())
+            with open(os.path.join(self.path, ENTRIES_FILE), "a", encoding="utf-8") as f:
+                f.write("".join(
+                    json.dumps({"id": id, "document": document, "metadata": metadata}, ensure_ascii=False) + "\n"
+                    for id, document, metadata in zip(ids, documents, metadatas)
+                ))
+            self._refresh()
+
+    def query(self, query_embeddings, n_results: int = 1, include=None) -> Dict[str, List[List]]:
+        queries = _normalize(np.asarray(query_embeddings, dtype=np.float32).reshape(len(query_embeddings), -1))
+        results = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        with self._lock:
+            self._refresh()
+            for query in queries:
+                indices, scores = self._search(query, n_results)
+                results["ids"].append([self._ids[i] for i in indices])
+                results["documents"].append([self._documents[i] for i in indices])
+                results["metadatas"].append([self._metadatas[i] for i in indices])
+                results["distances"].append((1 - scores).tolist())
+        return results
+
+    def _search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        candidates = self._candidates(query)
+        vectors = self._vectors if candidates is None else self._vectors[candidates]
+        if len(vectors) == 0:
+            return np.empty(0, dtype=int), np.empty(0, dtype=np.float32)
+        scores = vectors @ query
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        indices = top if candidates is None else candidates[top]
+        return indices, scores[top]
+
+    def _candidates(self, query: np.ndarray) -> Optional[np.ndarray]:
+        """Rows to scan for `query`, or None to scan every row."""
+        n = len(self._ids)
+        if not self.ivf_threshold or n < self.ivf_threshold:
+            return None
+        if self._ivf is None or n >= 2 * self._ivf[2]:
+            self._ivf = self._train_ivf()
+        centroids, lists, trained = self._ivf
+        probes = np.argpartition(-(centroids @ query), min(self.nprobe, len(centroids)) - 1)[:self.nprobe]
+        return np.concatenate([lists[probe] for probe in probes] + [np.arange(trained, n)])
+
+    def _train_ivf(self, iterations: int = 10, max_sample: int = 20000):
+        """Cluster the vectors with spherical k-means into about sqrt(n) clusters, and list the rows of each."""
+        vectors = self._vectors
+        n = len(vectors)
+        rng = np.random.default_rng(0)
+        n_clusters = max(1, int(np.sqrt(n)))
+        sample = np.asarray(vectors[np.sort(rng.choice(n, min(n, max_sample), replace=False))])
+        centroids = sample[rng.choice(len(sample), n_clusters, replace=False)]
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            filled = np.bincount(labels, minlength=n_clusters) > 0
+            centroids[filled] = _normalize(sums[filled])
+        assignments = np.concatenate([
+            np.argmax(vectors[start:start + 4096] @ centroids.T, axis=1) for start in range(0, n, 4096)
+        ])
+        order = np.argsort(assignments, kind="stable")
+        lists = np.split(order, np.searchsorted(assignments[order], np.arange(1, n_clusters)))
+        return centroids, lists, n
+
+    def _refresh(self):
+        """Load the entries appended since the last load, by this or another process."""
+        if self.path is None:
+            return
+        entries_path = os.path.join(self.path, ENTRIES_FILE)
+        if not os.path.exists(entries_path) or os.path.getsize(entries_path) == self._entries_size:
+            return
+        with open(entries_path, "rb") as f:
+            f.seek(self._entries_size)
+            data = f.read()
+        # Ignore a line that is still being written
+        data = data[:data.rfind(b"\n") + 1]
+        if not data:
+            return
+        entries = [json.loads(line) for line in data.decode("utf-8").splitlines()]
+        if not self._dim:
+            with open(os.path.join(self.path, INFO_FILE)) as f:
+                self._dim = json.load(f)["dim"]
+
+        self._ids.extend(entry["id"] for entry in entries)
+        self._documents.extend(entry["document"] for entry in entries)
+        self._metadatas.extend(entry["metadata"] for entry in entries)
+        self._entries_size += len(data)
+        self._vectors = np.memmap(
+            os.path.join(self.path, VECTORS_FILE), dtype=np.float32, mode="r", shape=(len(self._ids), self._dim)
+        )
+
+
+_indexes: Dict[Tuple[Optional[str], str], VectorIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_vector_index(name: str, path: Optional[str], ivf_threshold: int = 50000, nprobe: int = 16) -> VectorIndex:
+    """Get the vector index shared by every memory with the same name and directory."""
+    with _indexes_lock:
+        key = (path, name)
+        if key not in _indexes:
+            _indexes[key] = VectorIndex(path, ivf_threshold, nprobe)
+        return _indexes[key]
@@ -17,7 +17,16 @@ from .interface import (
     # Technical analysis functions
     get_taapi_bulk_indicators,
     # Market data functions
-    get_binance_data
+    get_binance_data,
+    # Async functions
+    aget_coinstats_btc_dominance,
+    aget_blockbeats_news,
+    aget_coindesk_news,
+    aget_coinstats_news,
+    aget_asset_news_llm,
+    aget_global_news_llm,
+    aget_fear_and_greed_index,
+    aget_fundamentals_llm,
 )
 
 __all__ = [
@@ -37,5 +46,14 @@ __all__ = [
     # Technical analysis functions
     "get_taapi_bulk_indicators",
     # Market data functions
-    "get_binance_data"
+    "get_binance_data",
+    # Async functions
+    "aget_coinstats_btc_dominance",
+    "aget_blockbeats_news",
+    "aget_coindesk_news",
+    "aget_coinstats_news",
+    "aget_asset_news_llm",
+    "aget_global_news_llm",
+    "aget_fear_and_greed_index",
+    "aget_fundamentals_llm",
 ]
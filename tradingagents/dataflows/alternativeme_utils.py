@@ -1,15 +1,26 @@
 
 import requests
+from .cache_utils import cached, seconds_until_utc_day_end
+from .http_utils import get_async_client
 
+FNG_URL = "https://api.alternative.me/fng/?limit=10"
+
+def _parse_fear_and_greed(response):
+    if response.status_code == 200:
+        data = response.json()
+        if "data" in data and len(data["data"]) > 0:
+            return [value["value"] for value in data["data"] if "value" in value]
+
+@cached("alternativeme", "fng", ttl=lambda args: seconds_until_utc_day_end())
 def fetch_fear_and_greed_from_alternativeme():
     """
     Fetch the Fear and Greed Index from Alternative.me API.
     Returns:
         list[str]: A list of fear and greed index values. Sorted by date in descending order.
     """
-    url = "https://api.alternative.me/fng/?limit=10"
-    response = requests.get(url)
-    if response.status_code == 200:
-        data = response.json()
-        if "data" in data and len(data["data"]) > 0:
-            return [value["value"] for value in data["data"] if "value" in value]
\ No newline at end of file
+    return _parse_fear_and_greed(requests.get(FNG_URL))
+
+@cached("alternativeme", "fng", ttl=lambda args: seconds_until_utc_day_end())
+async def afetch_fear_and_greed_from_alternativeme():
+    """Async version of `fetch_fear_and_greed_from_alternativeme`."""
+    return _parse_fear_and_greed(await get_async_client().get(FNG_URL))
@@ -0,0 +1,489 @@
+import json
+import time
+import threading
+from collections import deque
+import numpy as np
+from binance.um_futures import UMFutures
+from binance.websocket.um_futures.websocket_client import UMFuturesWebsocketClient
+from .config import get_config
+
+
+class _DaemonUMFuturesWebsocketClient(UMFuturesWebsocketClient):
+    """WebSocket client whose reader thread does not keep the process alive and reports when the connection ends."""
+
+    def __init__(self, *args, on_disconnect=None, **kwargs):
+        self.on_disconnect = on_disconnect
+        super().__init__(*args, **kwargs)
+
+    def _initialize_socket(self, *args, **kwargs):
+        socket_manager = super()._initialize_socket(*args, **kwargs)
+        socket_manager.daemon = True
+        read = socket_manager.run
+
+        def run():
+            try:
+                read()
+            finally:
+                if self.on_disconnect is not None:
+                    self.on_disconnect(self)
+
+        socket_manager.run = run
+        return socket_manager
+
+
+class KlineRingBuffer:
+    """
+    Fixed-capacity ring buffer of klines kept in a NumPy array.\n
+    Rows are [open_time, open, high, low, close, volume]. An update for the candle
+    currently at the head overwrites it; a newer candle is appended.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.zeros((capacity, 6), dtype=np.float64)
+        self._start = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def update(self, row):
+        if self._count > 0:
+            last = (self._start + self._count - 1) % self.capacity
+            if row[0] == self._data[last, 0]:
+                self._data[last] = row
+                return
+            if row[0] < self._data[last, 0]:
+                return
+        if self._count < self.capacity:
+            self._data[(self._start + self._count) % self.capacity] = row
+            self._count += 1
+        else:
+            self._data[self._start] = row
+            self._start = (self._start + 1) % self.capacity
+
+    def latest(self, limit: int) -> np.ndarray:
+        """Return a copy of the last `limit` klines, oldest first."""
+        limit = min(limit, self._count)
+        index = (self._start + np.arange(self._count - limit, self._count)) % self.capacity
+        return self._data[index]
+
+
+class LocalOrderBook:
+    """
+    Order book rebuilt locally from a REST snapshot and the diff depth stream,
+    following Binance's "How to manage a local order book correctly" procedure.
+    At most `max_pending` events are buffered while waiting for a snapshot; the oldest ones
+    are dropped, and a snapshot that no longer lines up with the buffer is rejected.
+    """
+
+    def __init__(self, max_pending: int = 1000):
+        self.bids: dict[float, float] = {}
+        self.asks: dict[float, float] = {}
+        self.last_update_id = None
+        self.synced = False
+        self.max_pending = max_pending
+        self._pending: deque[dict] = deque(maxlen=max_pending)
+
+    def reset(self):
+        """Drop the book and start buffering events until the next snapshot."""
+        self.bids, self.asks = {}, {}
+        self.last_update_id = None
+        self.synced = False
+        self._pending = deque(maxlen=self.max_pending)
+
+    def load_snapshot(self, snapshot: dict) -> bool:
+        """
+        Load a REST depth snapshot and replay the events buffered while it was fetched.
+        :return: False if the buffered events do not line up with the snapshot and a new one is needed.
+        """
+        self.bids = {float(price): float(qty) for price, qty in snapshot["bids"]}
+        self.asks = {float(price): float(qty) for price, qty in snapshot["asks"]}
+        self.last_update_id = snapshot["lastUpdateId"]
+        pending, self._pending = self._pending, deque(maxlen=self.max_pending)
+        return all(self.apply_event(event) for event in pending)
+
+    def apply_event(self, event: dict) -> bool:
+        """
+        Apply a diff depth event.
+        :return: False if an event was missed and the book must be resynchronized.
+        """
+        if self.last_update_id is None:
+            self._pending.append(event)
+            return True
+        if event["u"] < self.last_update_id:
+            return True
+        if not self.synced:
+            if event["U"] > self.last_update_id:
+                return False
+            self.synced = True
+        elif event["pu"] != self.last_update_id:
+            return False
+        for side, updates in ((self.bids, event["b"]), (self.asks, event["a"])):
+            for price, qty in updates:
+                price, qty = float(price), float(qty)
+                if qty == 0:
+                    side.pop(price, None)
+                else:
+                    side[price] = qty
+        self.last_update_id = event["u"]
+        return True
+
+    def top(self, limit: int) -> dict:
+        """Return the best `limit` levels per side in the REST depth format."""
+        bids = sorted(self.bids.items(), reverse=True)[:limit]
+        asks = sorted(self.asks.items())[:limit]
+        return {
+            "lastUpdateId": self.last_update_id,
+            "bids": [[str(price), str(qty)] for price, qty in bids],
+            "asks": [[str(price), str(qty)] for price, qty in asks],
+        }
+
+
+class BinanceMarketStream:
+    """
+    Keeps live kline, mark price and order book state for subscribed symbols
+    from the Binance USDⓈ-M futures WebSocket streams.\n
+    Readers get the current state from memory; None means the state is not available
+    (not subscribed, not yet synchronized, or stale) and the caller should fall back to REST.
+    A dropped connection is reopened with backoff and its streams are resubscribed.
+    """
+
+    def __init__(
+        self,
+        stream_url: str = "wss://fstream.binance.com",
+        rest_client=None,
+        kline_capacity: int = 500,
+        max_staleness: float = 30,
+    ):
+        """
+        :param stream_url: Base URL of the WebSocket server.
+        :param rest_client: Client used to seed klines and fetch depth snapshots. Must provide
+            `klines(symbol, interval, limit)` and `depth(symbol, limit)` like `UMFutures`.
+        :param kline_capacity: Number of klines kept per (symbol, interval).
+        :param max_staleness: Seconds without any message after which a symbol's state is considered stale.
+        """
+        self.stream_url = stream_url
+        self.rest_client = rest_client or UMFutures()
+        self.kline_capacity = kline_capacity
+        self.max_staleness = max_staleness
+        self.klines: dict[tuple[str, str], KlineRingBuffer] = {}
+        self.order_books: dict[str, LocalOrderBook] = {}
+        self.mark_prices: dict[str, dict] = {}
+        self.last_message_at: dict[str, float] = {}
+        self._lock = threading.RLock()
+        self._client = None
+        self._running = False
+        self._streams: list[str] = []
+        self._resyncing: set[str] = set()
+
+    def start(self):
+        """Open the WebSocket connection."""
+        self._running = True
+        if self._client is None:
+            self._client = _DaemonUMFuturesWebsocketClient(
+                stream_url=self.stream_url,
+                on_message=self._on_message,
+                on_error=lambda _, e: print(f"Error in Binance market stream: {e}"),
+                on_disconnect=self._on_disconnect,
+                is_combined=True,
+            )
+
+    def stop(self):
+        """Close the WebSocket connection."""
+        self._running = False
+        self._close_client()
+
+    def _close_client(self):
+        client, self._client = self._client, None
+        if client is not None:
+            client.stop()
+
+    def subscribe(self, symbol: str, intervals: list[str]):
+        """
+        Subscribe to kline streams for `intervals` plus the mark price and depth streams of `symbol`.
+        Kline buffers are seeded from REST so they are usable immediately. Already subscribed streams are skipped.
+        """
+        self.start()
+        symbol = symbol.upper()
+        streams = []
+        with self._lock:
+            for interval in intervals:
+                if (symbol, interval) not in self.klines:
+                    self.klines[(symbol, interval)] = KlineRingBuffer(self.kline_capacity)
+                    streams.append(f"{symbol.lower()}@kline_{interval}")
+            if symbol not in self.order_books:
+                self.order_books[symbol] = LocalOrderBook()
+                streams += [f"{symbol.lower()}@markPrice@1s", f"{symbol.lower()}@depth@100ms"]
+        if not streams:
+            return
+
+        # Subscribe first so no update is missed between the snapshots and the live stream
+        self._client.subscribe(streams)
+        with self._lock:
+            self._streams += streams
+        for interval in intervals:
+            if f"{symbol.lower()}@kline_{interval}" in streams:
+                self._seed_klines(symbol, interval)
+        if f"{symbol.lower()}@depth@100ms" in streams and not self._load_order_book_snapshot(symbol):
+            self._schedule_resync(symbol)
+        self.last_message_at.setdefault(symbol, time.time())
+
+    def _seed_klines(self, symbol: str, interval: str):
+        """Fill the kline buffer of (symbol, interval) with the REST history."""
+        history = self.rest_client.klines(symbol=symbol, interval=interval, limit=self.kline_capacity)
+        seeded = KlineRingBuffer(self.kline_capacity)
+        for kline in history:
+            seeded.update([float(x) for x in kline[:6]])
+        with self._lock:
+            # Candles streamed while the history was loading are newer, so they win
+            live = self.klines[(symbol, interval)]
+            for row in live.latest(len(live)):
+                seeded.update(row)
+            self.klines[(symbol, interval)] = seeded
+
+    def is_fresh(self, symbol: str) -> bool:
+        return time.time() - self.last_message_at.get(symbol.upper(), 0) <= self.max_staleness
+
+    def get_klines(self, symbol: str, interval: str, limit: int):
+        """Return the last `limit` klines in the REST format, or None if they are not available."""
+        symbol = symbol.upper()
+        with self._lock:
+            buffer = self.klines.get((symbol, interval))
+            if buffer is None or len(buffer) < min(limit, buffer.capacity) or not self.is_fresh(symbol):
+                return None
+            rows = buffer.latest(limit)
+        return [[int(row[0])] + [str(x) for x in row[1:]] for row in rows]
+
+    def get_depth(self, symbol: str, limit: int):
+        """Return the best `limit` levels per side in the REST format, or None if the book is not synchronized."""
+        symbol = symbol.upper()
+        with self._lock:
+            book = self.order_books.get(symbol)
+            if book is None or not book.synced or not self.is_fresh(symbol):
+                return None
+            return book.top(limit)
+
+    def get_mark_price(self, symbol: str):
+        """Return the latest mark price update ({ markPrice, indexPrice, fundingRate, nextFundingTime }), or None."""
+        symbol = symbol.upper()
+        with self._lock:
+            if not self.is_fresh(symbol):
+                return None
+            return self.mark_prices.get(symbol)
+
+    def _load_order_book_snapshot(self, symbol: str) -> bool:
+        """
+        Load a fresh snapshot into a book that was reset and is buffering events.
+        :return: False if the snapshot could not be fetched or does not line up, and the book was reset.
+        """
+        try:
+            snapshot = self.rest_client.depth(symbol=symbol, limit=1000)
+        except Exception as e:
+            print(f"Error fetching the {symbol} order book snapshot: {e}")
+            return False
+        with self._lock:
+            if self.order_books[symbol].load_snapshot(snapshot):
+                return True
+            self.order_books[symbol].reset()
+            return False
+
+    def _schedule_resync(self, symbol: str):
+        """Keep the socket thread free; retry the snapshot in the background, unless a retry is already running."""
+        with self._lock:
+            if symbol in self._resyncing:
+                return
+            self._resyncing.add(symbol)
+        threading.Thread(target=self._resync_order_book, args=(symbol,), daemon=True).start()
+
+    def _resync_order_book(self, symbol: str, max_delay: float = 30):
+        """Load snapshots, backing off between failed attempts, until one lines up or the stream stops."""
+        delay = 0.5
+        try:
+            while self._running and not self._load_order_book_snapshot(symbol):
+                time.sleep(delay)
+                delay = min(delay * 2, max_delay)
+        finally:
+            with self._lock:
+                self._resyncing.discard(symbol)
+
+    def _on_disconnect(self, client):
+        """Keep the socket thread free; reconnect in the background."""
+        if client is not self._client:
+            return  # stopped or already replaced
+        self._client = None
+        threading.Thread(target=self._reconnect, daemon=True).start()
+
+    def _reconnect(self, max_delay: float = 60):
+        """Reopen a dropped connection with backoff, resubscribe, and reload the state missed meanwhile."""
+        delay = 1
+        while self._running:
+            print(f"Binance market stream disconnected, reconnecting in {delay}s")
+            time.sleep(delay)
+            delay = min(delay * 2, max_delay)
+            try:
+                self.start()
+                with self._lock:
+                    streams = list(self._streams)
+                if streams:
+                    self._client.subscribe(streams)
+            except Exception as e:
+                print(f"Error reconnecting to Binance market streams: {e}")
+                self._close_client()
+                continue
+            break
+        if not self._running:
+            return
+
+        with self._lock:
+            keys = list(self.klines)
+            symbols = list(self.order_books)
+            for symbol in symbols:
+                self.order_books[symbol].reset()
+        for symbol, interval in keys:
+            try:
+                self._seed_klines(symbol, interval)
+            except Exception as e:
+                print(f"Error reloading {symbol} {interval} klines: {e}")
+        for symbol in symbols:
+            self._schedule_resync(symbol)
+
+    def _on_message(self, _, message: str):
+        message = json.loads(message)
+        event = message.get("data")
+        if not isinstance(event, dict) or "e" not in event:
+            return  # subscription acknowledgements
+        symbol = event["s"]
+        with self._lock:
+            self.last_message_at[symbol] = time.time()
+            if event["e"] == "kline":
+                k = event["k"]
+                buffer = self.klines.get((symbol, k["i"]))
+                if buffer is not None:
+                    buffer.update([float(k["t"]), float(k["o"]), float(k["h"]), float(k["l"]), float(k["c"]), float(k["v"])])
+            elif event["e"] == "markPriceUpdate":
+                self.mark_prices[symbol] = {
+                    "markPrice": event["p"],
+                    "indexPrice": event.get("i"),
+                    "fundingRate": event.get("r"),
+                    "nextFundingTime": event.get("T"),
+                }
+            elif event["e"] == "depthUpdate":
+                book = self.order_books.get(symbol)
+                if book is not None and not book.apply_event(event):
+                    book.reset()
+                    self._schedule_resync(symbol)
+
+
+class ReplayRestClient:
+    """
+    REST stand-in serving the klines and depth snapshots of a recording.
+    A symbol recorded with a list of depth snapshots gets them in order, then the last one repeatedly.
+    """
+
+    def __init__(self, recording: dict):
+        self.recording = recording
+        self.depth_requests: dict[str, int] = {}
+
+    def klines(self, symbol: str, interval: str, limit: int = 500, **kwargs):
+        return self.recording.get("klines", {}).get(symbol, {}).get(interval, [])[-limit:]
+
+    def depth(self, symbol: str, limit: int = 500, **kwargs):
+        snapshots = self.recording.get("depth", {}).get(symbol, {"lastUpdateId": 0, "bids": [], "asks": []})
+        if isinstance(snapshots, list):
+            snapshot = snapshots[min(self.depth_requests.get(symbol, 0), len(snapshots) - 1)]
+        else:
+            snapshot = snapshots
+        self.depth_requests[symbol] = self.depth_requests.get(symbol, 0) + 1
+        return {**snapshot, "bids": snapshot["bids"][:limit], "asks": snapshot["asks"][:limit]}
+
+
+class BinanceReplayServer:
+    """
+    Local WebSocket server that stands in for the exchange by replaying recorded stream events.\n
+    A recording is a dict (or a path to a JSON file) of the form
+    { "klines": { symbol: { interval: [kline, ...] } }, "depth": { symbol: snapshot or [snapshot, ...] },
+      "events": [ { "stream": "btcusdt@kline_1m", "data": {...} }, ... ] }.
+    After a client subscribes, the recorded events of its streams are sent in order.
+    """
+
+    def __init__(self, recording, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0):
+        """
+        :param recording: The recording, or a path to a JSON file containing it.
+        :param host: Host to listen on.
+        :param port: Port to listen on. 0 picks a free port.
+        :param delay: Seconds to wait between replayed events.
+        """
+        if isinstance(recording, str):
+            with open(recording, "r") as f:
+                recording = json.load(f)
+        self.recording = recording
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self.rest_client = ReplayRestClient(recording)
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def start(self):
+        """Start serving in a background thread."""
+        from websockets.sync.server import serve
+
+        self._server = serve(self._handle, self.host, self.port)
+        self.port = self._server.socket.getsockname()[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handle(self, websocket):
+        for raw in websocket:
+            request = json.loads(raw)
+            if request.get("method") != "SUBSCRIBE":
+                continue
+            websocket.send(json.dumps({"result": None, "id": request.get("id")}))
+            streams = set(request.get("params", []))
+            for event in self.recording.get("events", []):
+                if event["stream"] in streams:
+                    if self.delay:
+                        time.sleep(self.delay)
+                    websocket.send(json.dumps(event))
+
+
+_market_stream = None
+_market_stream_lock = threading.Lock()
+
+def get_market_stream(symbol: str, intervals: list[str]):
+    """
+    Get the shared market stream subscribed to `symbol` and `intervals`.
+    :return: The stream, or None when `binance_stream_enabled` is off or the subscription failed.
+    """
+    global _market_stream
+    config = get_config()
+    if not config["binance_stream_enabled"]:
+        return None
+    with _market_stream_lock:
+        if _market_stream is None:
+            _market_stream = BinanceMarketStream(
+                stream_url=config["binance_stream_url"],
+                kline_capacity=config["binance_stream_kline_capacity"],
+                max_staleness=config["binance_stream_max_staleness"],
+            )
+    try:
+        _market_stream.subscribe(symbol, intervals)
+    except Exception as e:
+        print(f"Error subscribing to Binance streams for {symbol}: {e}")
+        return None
+    return _market_stream
@@ -1,5 +1,6 @@
 
 from binance.um_futures import UMFutures
+from .cache_utils import cached, seconds_until_candle_close
 
 um_futures_client = UMFutures()
 
@@ -12,6 +13,7 @@ def check_symbol(fn):
     return wrapper
 
 @check_symbol
+@cached("binance", "ohlcv", ttl=lambda args: seconds_until_candle_close(args["interval"]))
 def fetch_ohlcv_from_binance(symbol: str, interval: str):
     """
     Fetch historical OHLCV (Open, High, Low, Close, Volume) data from Binance.
@@ -32,6 +34,7 @@ def fetch_ohlcv_from_binance(symbol: str, interval: str):
         }
 
 @check_symbol
+@cached("binance", "klines", ttl=lambda args: seconds_until_candle_close(args["interval"]))
 def fetch_klines_from_binance(symbol: str, interval: str, limit: int = 75):
     """
     Fetch historical klines (candlestick data) from Binance.
@@ -44,6 +47,7 @@ def fetch_klines_from_binance(symbol: str, interval: str, limit: int = 75):
     return um_futures_client.klines(symbol=symbol, interval=interval, limit=limit)
 
 @check_symbol
+@cached("binance", "depth", ttl=5)
 def fetch_depth_from_binance(symbol: str, limit: int = 50):
     """
     Fetch the order book depth from Binance.
@@ -55,6 +59,7 @@ def fetch_depth_from_binance(symbol: str, limit: int = 50):
     return um_futures_client.depth(symbol=symbol, limit=limit)
 
 @check_symbol
+@cached("binance", "ticker_24hr", ttl=30)
 def fetch_24hr_pricechange_from_binance(symbol: str):
     """
     Fetch 24-hour ticker price change statistics from Binance.
@@ -65,6 +70,7 @@ def fetch_24hr_pricechange_from_binance(symbol: str):
     return um_futures_client.ticker_24hr_price_change(symbol=symbol)
 
 @check_symbol
+@cached("binance", "top_longshort_position_ratio", ttl=lambda args: seconds_until_candle_close(args["period"]))
 def fetch_toplongshort_position_ratio_from_binance(symbol: str, period: str, limit: int = 50):
     """
     Fetch the top long/short position ratio from Binance.
@@ -77,6 +83,7 @@ def fetch_toplongshort_position_ratio_from_binance(symbol: str, period: str, lim
     return um_futures_client.top_long_short_position_ratio(symbol=symbol, period=period, limit=limit)
 
 @check_symbol
+@cached("binance", "top_longshort_account_ratio", ttl=lambda args: seconds_until_candle_close(args["period"]))
 def fetch_toplongshort_account_ratio_from_binance(symbol: str, period: str, limit: int = 50):
     """
     Fetch the top long/short account ratio from Binance.
@@ -89,6 +96,7 @@ def fetch_toplongshort_account_ratio_from_binance(symbol: str, period: str, limi
     return um_futures_client.top_long_short_account_ratio(symbol=symbol, period=period, limit=limit)
 
 @check_symbol
+@cached("binance", "global_longshort_account_ratio", ttl=lambda args: seconds_until_candle_close(args["period"]))
 def fetch_global_longshort_account_ratio_from_binance(symbol: str, period: str, limit: int = 50):
     """
     Fetch the global long/short account ratio from Binance.
@@ -101,6 +109,7 @@ def fetch_global_longshort_account_ratio_from_binance(symbol: str, period: str,
     return um_futures_client.long_short_account_ratio(symbol=symbol, period=period, limit=limit)
 
 @check_symbol
+@cached("binance", "taker_longshort_ratio", ttl=lambda args: seconds_until_candle_close(args["period"]))
 def fetch_taker_longshort_ratio_from_binance(symbol: str, period: str, limit: int = 50):
     """
     Fetch the taker long/short ratio from Binance.
@@ -110,4 +119,20 @@ def fetch_taker_longshort_ratio_from_binance(symbol: str, period: str, limit: in
     :param limit: The maximum number of records to fetch (default is 50).
     :return: A list of taker ratios. [ { timestamp, buySellRatio, buyVol, sellVol, ... } ... ]
     """
-    return um_futures_client.taker_long_short_ratio(symbol=symbol, period=period, limit=limit)
\ No newline at end of file
+    return um_futures_client.taker_long_short_ratio(symbol=symbol, period=period, limit=limit)
+
+@check_symbol
+def fetch_klines_range_from_binance(symbol: str, interval: str, start_time: int = None, end_time: int = None, limit: int = 1500):
+    """
+    Fetch klines (candlestick data) within a time range from Binance. Not cached, callers keep their own history.
+
+    :param symbol: The trading pair symbol (e.g., 'BTCUSDT').
+    :param interval: The time interval for the klines (e.g., '1m', '5m', '1h').
+    :param start_time: Open time in milliseconds of the first kline to fetch (optional).
+    :param end_time: Open time in milliseconds of the last kline to fetch (optional).
+    :param limit: The maximum number of klines to fetch (default and maximum is 1500).
+    :return: A list of klines. [ timestamp, open, high, low, close, volume, ... ]
+    """
+    params = {"startTime": start_time, "endTime": end_time}
+    params = {k: v for k, v in params.items() if v is not None}
+    return um_futures_client.klines(symbol=symbol, interval=interval, limit=limit, **params)
\ No newline at end of file
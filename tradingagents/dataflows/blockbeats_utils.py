@@ -1,9 +1,12 @@
 
 import requests
+from .cache_utils import cached
+from .http_utils import get_async_client
 
-def fetch_news_from_blockbeats(count = 10):
-    url = f"https://api.theblockbeats.news/v1/open-api/open-flash?page=1&size={count}&type=push&lang=cn"
-    response = requests.get(url)
+def _blockbeats_url(count):
+    return f"https://api.theblockbeats.news/v1/open-api/open-flash?page=1&size={count}&type=push&lang=cn"
+
+def _parse_blockbeats_news(response):
     if response.status_code == 200:
         data = response.json()
         if "data" in data and "data" in data["data"] and isinstance(data["data"]["data"], list):
@@ -14,3 +17,11 @@ def fetch_news_from_blockbeats(count = 10):
     else:
         print(f"Error: {response.status_code} - {response.text}")
         return []
+
+@cached("blockbeats", "open-flash", ttl=120)
+def fetch_news_from_blockbeats(count = 10):
+    return _parse_blockbeats_news(requests.get(_blockbeats_url(count)))
+
+@cached("blockbeats", "open-flash", ttl=120)
+async def afetch_news_from_blockbeats(count = 10):
+    return _parse_blockbeats_news(await get_async_client().get(_blockbeats_url(count)))
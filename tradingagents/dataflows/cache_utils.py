@@ -0,0 +1,244 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import inspect
+import threading
+from functools import wraps
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional, Union
+from .config import get_config
+from .utils import interval_to_seconds
+
+
+class CacheBackend:
+    """
+    Interface for dataflow response caches.\n
+    Backends store JSON-serializable values under a string key with a TTL in seconds.
+    """
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss or an expired entry."""
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value that expires after `ttl` seconds."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        raise NotImplementedError
+
+
+class NullCache(CacheBackend):
+    """Backend that never stores anything. Used when caching is disabled."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def clear(self):
+        pass
+
+
+class SQLiteCache(CacheBackend):
+    """
+    On-disk response cache backed by SQLite.\n
+    Entries expire after their TTL, and the least recently used entries are evicted
+    once the total stored size exceeds `max_bytes`. The total is tracked as entries are
+    written and deleted, and only recounted from the table when it crosses the cap, which
+    also accounts for entries written by other processes sharing the file.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        :param path: Path of the SQLite database file.
+        :param max_bytes: Upper bound for the total size of the stored values.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self._total = self._stored_size()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total -= row[2]
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        payload = json.dumps(value)
+        with self._lock:
+            replaced = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now + ttl, now),
+            )
+            self._total += len(payload) - (replaced[0] if replaced else 0)
+            if self._total > self.max_bytes:
+                self._evict(now)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._total = 0
+
+    def _stored_size(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _evict(self, now: float):
+        self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        self._total = self._stored_size()
+        if self._total <= self.max_bytes:
+            return
+        # Drop least recently used entries until we are back under budget
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._total -= size
+            if self._total <= self.max_bytes:
+                break
+
+
+CACHE_BACKENDS: Dict[str, Callable[[Dict], CacheBackend]] = {
+    "none": lambda config: NullCache(),
+    "sqlite": lambda config: SQLiteCache(
+        os.path.join(config["data_cache_dir"], "responses.sqlite3"),
+        config["data_cache_max_bytes"],
+    ),
+}
+
+_cache: Optional[CacheBackend] = None
+_cache_signature: Optional[tuple] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> CacheBackend:
+    """
+    Get the response cache configured by `data_cache_backend`.
+    The backend is created lazily and rebuilt when its configuration changes.
+    """
+    global _cache, _cache_signature
+    config = get_config()
+    signature = (config["data_cache_backend"], config["data_cache_dir"], config["data_cache_max_bytes"])
+    with _cache_lock:
+        if _cache is None or _cache_signature != signature:
+            if config["data_cache_backend"] not in CACHE_BACKENDS:
+                raise ValueError(f"Unsupported data cache backend: {config['data_cache_backend']}")
+            _cache = CACHE_BACKENDS[config["data_cache_backend"]](config)
+            _cache_signature = signature
+        return _cache
+
+
+def make_cache_key(provider: str, endpoint: str, args: Dict[str, Any]) -> str:
+    """Build a stable key from the provider, the endpoint and the normalized call arguments."""
+    normalized = json.dumps([provider, endpoint, args], sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def seconds_until_candle_close(interval: str) -> float:
+    """
+    Seconds until the current candle of `interval` closes, capped by `data_cache_max_kline_ttl`.
+    Candles are aligned to the Unix epoch, as on Binance. Intervals that cannot be parsed
+    (e.g. '1M', whose candles are not of fixed length) are cached for the cap itself.
+    """
+    max_ttl = get_config()["data_cache_max_kline_ttl"]
+    try:
+        length = interval_to_seconds(interval)
+    except ValueError:
+        return max_ttl
+    remaining = length - time.time() % length
+    return min(remaining, max_ttl)
+
+
+def seconds_until_utc_day_end() -> float:
+    """Seconds until the next UTC midnight, when daily values such as the Fear and Greed Index roll over."""
+    now = datetime.now(timezone.utc)
+    tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (tomorrow - now).total_seconds()
+
+
+def cached(provider: str, endpoint: str, ttl: Union[float, Callable[[Dict[str, Any]], float]]):
+    """
+    Cache the JSON result of a fetcher in the configured response cache.
+    Empty and missing results (None, [], {}) are never cached so failures are retried.
+    Works on both sync and async fetchers.
+
+    :param provider: Name of the data provider (e.g., 'binance').
+    :param endpoint: Name of the endpoint within the provider (e.g., 'klines').
+    :param ttl: TTL in seconds, or a callable receiving the bound call arguments and returning the TTL.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        def lookup(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            call_args = dict(bound.arguments)
+            seconds = ttl(call_args) if callable(ttl) else ttl
+            if seconds <= 0:
+                return None, None, seconds
+            cache = get_cache()
+            key = make_cache_key(provider, endpoint, call_args)
+            try:
+                value = cache.get(key)
+            except Exception as e:
+                print(f"Error reading {provider}/{endpoint} from cache: {e}")
+                value = None
+            return key, value, seconds
+
+        def store(key, value, seconds):
+            if key is not None and value:
+                try:
+                    get_cache().set(key, value, seconds)
+                except Exception as e:
+                    print(f"Error writing {provider}/{endpoint} to cache: {e}")
+
+        if inspect.iscoroutinefunction(fn):
+            # Async fetchers share the cache entries of their sync counterparts
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                key, value, seconds = lookup(args, kwargs)
+                if value is not None:
+                    return value
+                value = await fn(*args, **kwargs)
+                store(key, value, seconds)
+                return value
+
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key, value, seconds = lookup(args, kwargs)
+            if value is not None:
+                return value
+            value = fn(*args, **kwargs)
+            store(key, value, seconds)
+            return value
+
+        return wrapper
+
+    return decorator
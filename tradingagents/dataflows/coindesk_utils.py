@@ -1,25 +1,15 @@
-
 import os
 import requests
+from .cache_utils import cached
+from .http_utils import get_async_client
 
-def fetch_news_from_coindesk(tickers=[], count=10) -> list[dict[str, str]]:
-    """
-    Fetches the latest news from Coindesk for a given ticker.
-    
-    Args:
-        tickers (list): The ticker symbols for which to fetch news.
-        count (int): The number of news articles to fetch. Default is 10.
-        
-    Returns:
-        list: A list of news articles, each represented as a dictionary.
-    """
+def _coindesk_url(tickers, count):
     api_key = os.getenv('COINDESK_API_KEY')
     if not api_key:
         return None
+    return f"https://data-api.coindesk.com/news/v1/article/list?lang=EN&limit={count}&categories={','.join(tickers)}&api_key={api_key}"
 
-    url = f"https://data-api.coindesk.com/news/v1/article/list?lang=EN&limit={count}&categories={','.join(tickers)}&api_key={api_key}"
-    response = requests.get(url)
-    
+def _parse_coindesk_news(response):
     if response.status_code == 200:
         data = response.json()
         if "Data" in data and isinstance(data["Data"], list):
@@ -31,4 +21,29 @@ def fetch_news_from_coindesk(tickers=[], count=10) -> list[dict[str, str]]:
         return []
     else:
         print(f"Error: {response.status_code} - {response.text}")
-        return []
\ No newline at end of file
+        return []
+
+@cached("coindesk", "article_list", ttl=300)
+def fetch_news_from_coindesk(tickers=[], count=10) -> list[dict[str, str]]:
+    """
+    Fetches the latest news from Coindesk for a given ticker.
+    
+    Args:
+        tickers (list): The ticker symbols for which to fetch news.
+        count (int): The number of news articles to fetch. Default is 10.
+        
+    Returns:
+        list: A list of news articles, each represented as a dictionary.
+    """
+    url = _coindesk_url(tickers, count)
+    if not url:
+        return None
+    return _parse_coindesk_news(requests.get(url))
+
+@cached("coindesk", "article_list", ttl=300)
+async def afetch_news_from_coindesk(tickers=[], count=10) -> list[dict[str, str]]:
+    """Async version of `fetch_news_from_coindesk`."""
+    url = _coindesk_url(tickers, count)
+    if not url:
+        return None
+    return _parse_coindesk_news(await get_async_client().get(url))
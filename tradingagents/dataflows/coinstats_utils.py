@@ -1,28 +1,24 @@
 
 import os
+import asyncio
 import requests
+from .cache_utils import cached
+from .http_utils import get_async_client
 
-def fetch_btc_dominance_from_coinstats():
-    """
-    Fetches the current Bitcoin dominance percentage from CoinStats API.
-    
-    Returns:
-        dict: A dictionary containing Bitcoin dominance for 24 hours and 1 week. {"24h": value, "1w": value}
-    """
-    url_24h = "https://openapiv1.coinstats.app/insights/btc-dominance?type=24h"
-    url_1w = "https://openapiv1.coinstats.app/insights/btc-dominance?type=1w"
+BTC_DOMINANCE_24H_URL = "https://openapiv1.coinstats.app/insights/btc-dominance?type=24h"
+BTC_DOMINANCE_1W_URL = "https://openapiv1.coinstats.app/insights/btc-dominance?type=1w"
+NEWS_URL = "https://openapiv1.coinstats.app/news/type/latest?page=1&limit=20"
+
+def _coinstats_headers():
     api_key = os.getenv("COINSTATS_API_KEY")
     if not api_key:
         return None
-
-    headers = {
+    return {
         "accept": "application/json",
         "X-API-KEY": api_key
     }
 
-    response_24h = requests.get(url_24h, headers=headers)
-    response_1w = requests.get(url_1w, headers=headers)
-
+def _parse_btc_dominance(response_24h, response_1w):
     if response_24h.status_code == 200 and response_1w.status_code == 200:
         data_24h = response_24h.json()
         data_1w = response_1w.json()
@@ -32,23 +28,8 @@ def fetch_btc_dominance_from_coinstats():
             btc_dominance_24h = data_24h["data"][-1][1]
             btc_dominance_1w = data_1w["data"][-1][1]
             return {"24h": btc_dominance_24h, "1w": btc_dominance_1w}
-            
-def fetch_news_from_coinstats():
-    """
-    Fetches the latest news from CoinStats API.
-    
-    Returns:
-        list: A list of dictionaries containing news articles with keys: "title", "source", "description"
-    """
-    url = "https://openapiv1.coinstats.app/news/type/latest?page=1&limit=20"
-    api_key = os.getenv("COINSTATS_API_KEY")
-    if not api_key:
-        return None
-    headers = {
-        "accept": "application/json",
-        "X-API-KEY": api_key
-    }
-    response = requests.get(url, headers=headers)
+
+def _parse_news(response):
     if response.status_code == 200:
         data = response.json()
         if isinstance(data, list):
@@ -58,4 +39,55 @@ def fetch_news_from_coinstats():
                     "description": article.get("description", ""),
                     "source": article.get("source", "")
                 } for article in data
-            ]
\ No newline at end of file
+            ]
+
+@cached("coinstats", "btc_dominance", ttl=600)
+def fetch_btc_dominance_from_coinstats():
+    """
+    Fetches the current Bitcoin dominance percentage from CoinStats API.
+    
+    Returns:
+        dict: A dictionary containing Bitcoin dominance for 24 hours and 1 week. {"24h": value, "1w": value}
+    """
+    headers = _coinstats_headers()
+    if not headers:
+        return None
+
+    response_24h = requests.get(BTC_DOMINANCE_24H_URL, headers=headers)
+    response_1w = requests.get(BTC_DOMINANCE_1W_URL, headers=headers)
+    return _parse_btc_dominance(response_24h, response_1w)
+
+@cached("coinstats", "btc_dominance", ttl=600)
+async def afetch_btc_dominance_from_coinstats():
+    """Async version of `fetch_btc_dominance_from_coinstats`, requesting both periods at once."""
+    headers = _coinstats_headers()
+    if not headers:
+        return None
+
+    client = get_async_client()
+    response_24h, response_1w = await asyncio.gather(
+        client.get(BTC_DOMINANCE_24H_URL, headers=headers),
+        client.get(BTC_DOMINANCE_1W_URL, headers=headers),
+    )
+    return _parse_btc_dominance(response_24h, response_1w)
+
+@cached("coinstats", "news", ttl=300)
+def fetch_news_from_coinstats():
+    """
+    Fetches the latest news from CoinStats API.
+    
+    Returns:
+        list: A list of dictionaries containing news articles with keys: "title", "source", "description"
+    """
+    headers = _coinstats_headers()
+    if not headers:
+        return None
+    return _parse_news(requests.get(NEWS_URL, headers=headers))
+
+@cached("coinstats", "news", ttl=300)
+async def afetch_news_from_coinstats():
+    """Async version of `fetch_news_from_coinstats`."""
+    headers = _coinstats_headers()
+    if not headers:
+        return None
+    return _parse_news(await get_async_client().get(NEWS_URL, headers=headers))
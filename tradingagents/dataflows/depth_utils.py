@@ -0,0 +1,98 @@
+import numpy as np
+
+DEPTH_BANDS = (0.5, 1.0, 2.0)  # percent distance from the mid price
+WALL_FACTOR = 5.0  # a level is a wall when its quantity exceeds this multiple of the side's median level
+MAX_WALLS = 3
+
+
+def _side_to_array(levels) -> np.ndarray:
+    """Convert [[price, quantity], ...] levels into an (n, 2) float array."""
+    if not levels:
+        return np.empty((0, 2))
+    return np.asarray(levels, dtype=np.float64)[:, :2]
+
+
+def _find_walls(side: np.ndarray, mid: float, wall_factor: float, max_walls: int) -> list[dict]:
+    if len(side) == 0:
+        return []
+    threshold = np.median(side[:, 1]) * wall_factor
+    candidates = np.flatnonzero(side[:, 1] >= threshold)
+    largest = candidates[np.argsort(side[candidates, 1])[::-1][:max_walls]]
+    return [
+        {
+            "price": float(side[i, 0]),
+            "quantity": float(side[i, 1]),
+            "distance_pct": float(abs(side[i, 0] - mid) / mid * 100),
+        }
+        for i in sorted(largest, key=lambda i: abs(side[i, 0] - mid))
+    ]
+
+
+def analyze_depth(depth: dict, bands=DEPTH_BANDS, wall_factor: float = WALL_FACTOR, max_walls: int = MAX_WALLS) -> dict:
+    """
+    Summarize a whole order book snapshot.
+
+    :param depth: Order book in the Binance format. { "bids": [[price, quantity], ...], "asks": [[price, quantity], ...] }
+    :param bands: Distances from the mid price, in percent, for the cumulative liquidity bands.
+    :param wall_factor: Multiple of the median level quantity above which a level counts as a wall.
+    :param max_walls: Maximum number of walls reported per side.
+    :return: A dictionary with best_bid, best_ask, mid, spread, spread_bps, microprice, bands and walls, or None if a side is empty.
+        Each band is { pct, bid_qty, ask_qty, bid_notional, ask_notional, imbalance, complete }, where `complete`
+        is False when the fetched levels do not reach the band edge and the values are lower bounds.
+    """
+    bids = _side_to_array(depth.get("bids"))
+    asks = _side_to_array(depth.get("asks"))
+    if len(bids) == 0 or len(asks) == 0:
+        return None
+    # Binance sorts bids descending and asks ascending, but streamed books may not be
+    bids = bids[np.argsort(-bids[:, 0])]
+    asks = asks[np.argsort(asks[:, 0])]
+
+    best_bid, bid_qty = bids[0]
+    best_ask, ask_qty = asks[0]
+    mid = (best_bid + best_ask) / 2
+    spread = best_ask - best_bid
+
+    bid_cum_qty = np.cumsum(bids[:, 1])
+    ask_cum_qty = np.cumsum(asks[:, 1])
+    bid_cum_notional = np.cumsum(bids[:, 0] * bids[:, 1])
+    ask_cum_notional = np.cumsum(asks[:, 0] * asks[:, 1])
+
+    pcts = np.asarray(bands, dtype=np.float64)
+    bid_edges = mid * (1 - pcts / 100)
+    ask_edges = mid * (1 + pcts / 100)
+    # Number of levels inside each band, bids are descending so search on the negated prices
+    bid_counts = np.searchsorted(-bids[:, 0], -bid_edges, side="right")
+    ask_counts = np.searchsorted(asks[:, 0], ask_edges, side="right")
+    pick = lambda cum, counts: np.where(counts > 0, cum[np.maximum(counts - 1, 0)], 0.0)
+    band_bid_qty = pick(bid_cum_qty, bid_counts)
+    band_ask_qty = pick(ask_cum_qty, ask_counts)
+    total = band_bid_qty + band_ask_qty
+    imbalance = np.divide(band_bid_qty - band_ask_qty, total, out=np.zeros_like(total), where=total > 0)
+    complete = (bids[-1, 0] <= bid_edges) & (asks[-1, 0] >= ask_edges)
+
+    return {
+        "best_bid": float(best_bid),
+        "best_ask": float(best_ask),
+        "mid": float(mid),
+        "spread": float(spread),
+        "spread_bps": float(spread / mid * 10000),
+        "microprice": float((best_bid * ask_qty + best_ask * bid_qty) / (bid_qty + ask_qty)),
+        "levels": (len(bids), len(asks)),
+        "bands": [
+            {
+                "pct": float(pcts[i]),
+                "bid_qty": float(band_bid_qty[i]),
+                "ask_qty": float(band_ask_qty[i]),
+                "bid_notional": float(pick(bid_cum_notional, bid_counts)[i]),
+                "ask_notional": float(pick(ask_cum_notional, ask_counts)[i]),
+                "imbalance": float(imbalance[i]),
+                "complete": bool(complete[i]),
+            }
+            for i in range(len(pcts))
+        ],
+        "walls": {
+            "bids": _find_walls(bids, mid, wall_factor, max_walls),
+            "asks": _find_walls(asks, mid, wall_factor, max_walls),
+        },
+    }
@@ -0,0 +1,101 @@
+import numpy as np
+from .config import get_config
+
+AGGREGATIONS = {
+    "first": lambda values, starts, ends: values[starts],
+    "last": lambda values, starts, ends: values[ends],
+    "max": lambda values, starts, ends: np.maximum.reduceat(values, starts),
+    "min": lambda values, starts, ends: np.minimum.reduceat(values, starts),
+    "sum": lambda values, starts, ends: np.add.reduceat(values, starts),
+    "mean": lambda values, starts, ends: np.add.reduceat(values, starts) / (ends - starts + 1),
+}
+KLINE_AGGREGATIONS = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+
+def downsample(times: np.ndarray, columns: dict[str, np.ndarray], factor: int, aggregations: dict[str, str] = None):
+    """
+    Merge every `factor` consecutive rows into one, aligned so the most recent group is complete.
+    Columns are combined with their aggregation from `aggregations` ('first', 'last', 'max', 'min', 'sum', 'mean'),
+    defaulting to 'last'. Each merged row keeps the time of its first row.
+    :return: The downsampled (times, columns).
+    """
+    n = len(times)
+    starts = np.arange(n % factor, n, factor)
+    if n % factor:
+        starts = np.r_[0, starts]
+    ends = np.r_[starts[1:] - 1, n - 1]
+    aggregations = aggregations or {}
+    return times[starts], {
+        name: AGGREGATIONS[aggregations.get(name, "last")](values, starts, ends)
+        for name, values in columns.items()
+    }
+
+
+def _format_values(values: np.ndarray, precision: int, signed: bool = False) -> np.ndarray:
+    return np.char.mod(f"%{"+" if signed else ""}.{precision}g", values)
+
+
+def _format_times(times: np.ndarray) -> np.ndarray:
+    return np.char.replace(np.datetime_as_string(times.astype("datetime64[ms]"), unit="m"), "T", " ")
+
+
+def _render(times: np.ndarray, columns: dict[str, np.ndarray], precision: int, encoding: str) -> str:
+    names = list(columns)
+    if encoding == "delta" and len(times) > 1:
+        steps = np.diff(times)
+        regular = bool(np.all(steps == steps[0]))
+        header = ["first row absolute, next rows are changes from the previous row"]
+        if regular:
+            header.append(f"rows every {int(steps[0]) // 60000} minutes from {_format_times(times[:1])[0]} UTC")
+        cells = [
+            np.r_[_format_values(values[:1], precision), _format_values(np.diff(values), precision, signed=True)]
+            for values in columns.values()
+        ]
+        if not regular:
+            names = ["time(UTC)"] + names
+            cells = [_format_times(times)] + cells
+        lines = ["# " + "; ".join(header), ",".join(names)]
+    else:
+        names = ["time(UTC)"] + names
+        cells = [_format_times(times)] + [_format_values(values, precision) for values in columns.values()]
+        lines = [",".join(names)]
+    lines.extend(",".join(row) for row in zip(*cells))
+    return "\n".join(lines)
+
+
+def format_table(
+    title: str,
+    times,
+    columns: dict,
+    precision: int = None,
+    encoding: str = None,
+    max_chars: int = None,
+    aggregations: dict[str, str] = None,
+) -> str:
+    """
+    Render a time series as a compact table with a single header, instead of one sentence per row.
+
+    :param title: Section title.
+    :param times: Row times in milliseconds, oldest first.
+    :param columns: Column name to values (numbers or numeric strings), one per row.
+    :param precision: Significant digits per value (default: `tool_output_precision`).
+    :param encoding: 'csv', or 'delta' for changes from the previous row (default: `tool_output_format`).
+    :param max_chars: Size budget for the table. Rows are downsampled by doubling factors until it fits.
+    :param aggregations: How columns are merged when downsampling, see `downsample`.
+    :return: The formatted section, or an empty string if there are no rows.
+    """
+    config = get_config()
+    precision = precision or config["tool_output_precision"]
+    encoding = encoding or config["tool_output_format"]
+    times = np.asarray(times, dtype=np.int64)
+    if len(times) == 0:
+        return ""
+    columns = {name: np.asarray(values, dtype=np.float64) for name, values in columns.items()}
+
+    factor = 1
+    body = _render(times, columns, precision, encoding)
+    while max_chars and len(body) > max_chars and factor < len(times):
+        factor *= 2
+        body = _render(*downsample(times, columns, factor, aggregations), precision, encoding)
+    note = f", each row merges {factor} rows to fit the size budget" if factor > 1 else ""
+    return f"## {title} ({encoding.upper()}{note}):\n{body}\n\n"
@@ -0,0 +1,26 @@
+import asyncio
+import weakref
+import httpx
+
+HTTP_TIMEOUT = 30
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Get the HTTP client shared by the async fetchers on the running event loop.
+    Connections are pooled per loop, since an httpx client can only be used on the loop it was created on.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = httpx.AsyncClient(timeout=HTTP_TIMEOUT)
+    return client
+
+
+async def aclose_async_client():
+    """Close the shared client of the running event loop, e.g. before the loop shuts down."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
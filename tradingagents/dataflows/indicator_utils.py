@@ -0,0 +1,299 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from .kline_store_utils import get_klines
+from .taapi_utils import TREND_MOMENTUM_INDICATORS, VOLATILITY_STRUCTURE_INDICATORS
+from .config import get_config
+
+#region Vectorized helpers
+def _rolling(values: np.ndarray, window: int, reducer) -> np.ndarray:
+    """Apply `reducer` over a trailing window. The first `window - 1` entries are NaN."""
+    out = np.full(values.shape, np.nan)
+    if window <= len(values):
+        out[window - 1:] = reducer(sliding_window_view(values, window), axis=-1)
+    return out
+
+def _sma(values: np.ndarray, period: int) -> np.ndarray:
+    return _rolling(values, period, np.mean)
+
+def _ema(values: np.ndarray, period: int) -> np.ndarray:
+    return pd.Series(values).ewm(span=period, adjust=False).mean().to_numpy()
+
+def _wilder(values: np.ndarray, period: int) -> np.ndarray:
+    return pd.Series(values).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    prev_close = np.concatenate(([close[0]], close[:-1]))
+    return np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+def _atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    return _wilder(_true_range(high, low, close), period)
+
+def _rsi(close: np.ndarray, period: int) -> np.ndarray:
+    delta = np.diff(close, prepend=close[0])
+    gain = _wilder(np.clip(delta, 0, None), period)
+    loss = _wilder(np.clip(-delta, 0, None), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - 100 / (1 + gain / loss)
+    return np.where(loss == 0, 100.0, rsi)
+
+def _stochastic(values: np.ndarray, period: int) -> np.ndarray:
+    lowest = _rolling(values, period, np.min)
+    highest = _rolling(values, period, np.max)
+    span = highest - lowest
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stoch = np.where(span > 0, 100 * (values - lowest) / span, np.nan)
+    # Flat windows keep the previous reading instead of dropping to NaN
+    return pd.Series(stoch).ffill().to_numpy()
+#endregion
+
+#region Indicators
+# Each function receives the OHLCV arrays plus its TAAPI parameters and returns the TAAPI result dict.
+def ema(o, h, l, c, v, t, period=30):
+    return {"value": _ema(c, period)[-1]}
+
+def ichimoku(o, h, l, c, v, t, conversionPeriod=9, basePeriod=26, spanPeriod=52, displacement=26):
+    mid = lambda period: (_rolling(h, period, np.max) + _rolling(l, period, np.min)) / 2
+    conversion = mid(conversionPeriod)
+    base = mid(basePeriod)
+    span_a = (conversion + base) / 2
+    span_b = mid(spanPeriod)
+    lagged = -displacement if displacement < len(c) else 0
+    return {
+        "conversion": conversion[-1],
+        "base": base[-1],
+        "spanA": span_a[-1],
+        "spanB": span_b[-1],
+        "currentSpanA": span_a[lagged - 1] if lagged else np.nan,
+        "currentSpanB": span_b[lagged - 1] if lagged else np.nan,
+        "laggingSpan": c[-1],
+    }
+
+def supertrend(o, h, l, c, v, t, period=7, multiplier=3.0):
+    hl2 = (h + l) / 2
+    atr = _atr(h, l, c, period)
+    basic_upper = hl2 + multiplier * atr
+    basic_lower = hl2 - multiplier * atr
+    upper, lower = basic_upper.copy(), basic_lower.copy()
+    trend_up = True
+    # The band ratchet is path dependent, so this single pass cannot be vectorized
+    for i in range(1, len(c)):
+        if basic_upper[i] > upper[i - 1] and c[i - 1] <= upper[i - 1]:
+            upper[i] = upper[i - 1]
+        if basic_lower[i] < lower[i - 1] and c[i - 1] >= lower[i - 1]:
+            lower[i] = lower[i - 1]
+        if trend_up and c[i] < lower[i]:
+            trend_up = False
+        elif not trend_up and c[i] > upper[i]:
+            trend_up = True
+    return {"value": lower[-1] if trend_up else upper[-1], "valueAdvice": "long" if trend_up else "short"}
+
+def donchianchannels(o, h, l, c, v, t, period=20):
+    upper = _rolling(h, period, np.max)[-1]
+    lower = _rolling(l, period, np.min)[-1]
+    return {"upper": upper, "middle": (upper + lower) / 2, "lower": lower}
+
+def macd(o, h, l, c, v, t, optInFastPeriod=12, optInSlowPeriod=26, optInSignalPeriod=9):
+    line = _ema(c, optInFastPeriod) - _ema(c, optInSlowPeriod)
+    signal = _ema(line, optInSignalPeriod)
+    return {"valueMACD": line[-1], "valueMACDSignal": signal[-1], "valueMACDHist": line[-1] - signal[-1]}
+
+def rsi(o, h, l, c, v, t, period=14):
+    return {"value": _rsi(c, period)[-1]}
+
+def stochrsi(o, h, l, c, v, t, rsiPeriod=14, kPeriod=5, dPeriod=3, stochasticPeriod=14):
+    fast_k = _sma(_stochastic(_rsi(c, rsiPeriod), stochasticPeriod), kPeriod)
+    fast_d = _sma(fast_k, dPeriod)
+    return {"valueFastK": fast_k[-1], "valueFastD": fast_d[-1]}
+
+def trix(o, h, l, c, v, t, period=30):
+    triple = _ema(_ema(_ema(c, period), period), period)
+    return {"value": 100 * (triple[-1] - triple[-2]) / triple[-2]}
+
+def stc(o, h, l, c, v, t, fastLength=23, slowLength=50, cycleLength=10, factor=0.5):
+    line = _ema(c, fastLength) - _ema(c, slowLength)
+    smooth = lambda values: pd.Series(values).ewm(alpha=factor, adjust=False).mean().to_numpy()
+    first = smooth(_stochastic(line, cycleLength))
+    return {"value": smooth(_stochastic(first, cycleLength))[-1]}
+
+def vwap(o, h, l, c, v, t):
+    # Anchored to the start of the current UTC day, like an exchange session VWAP
+    session = t >= t[-1] - t[-1] % 86_400_000
+    volume = np.sum(v[session])
+    if volume == 0:
+        return {"value": None}  # nothing traded yet in this session
+    typical = (h[session] + l[session] + c[session]) / 3
+    return {"value": np.sum(typical * v[session]) / volume}
+
+def atr(o, h, l, c, v, t, period=14):
+    return {"value": _atr(h, l, c, period)[-1]}
+
+def bbands(o, h, l, c, v, t, period=20, stddev=2.0):
+    middle = _sma(c, period)[-1]
+    deviation = np.std(c[-period:])
+    return {
+        "valueUpperBand": middle + stddev * deviation,
+        "valueMiddleBand": middle,
+        "valueLowerBand": middle - stddev * deviation,
+    }
+
+def keltnerchannels(o, h, l, c, v, t, period=20, multiplier=2, atrLength=10):
+    middle = _ema(c, period)[-1]
+    band = multiplier * _atr(h, l, c, atrLength)[-1]
+    return {"upper": middle + band, "middle": middle, "lower": middle - band}
+
+def chop(o, h, l, c, v, t, period=14):
+    tr_sum = np.sum(_true_range(h, l, c)[-period:])
+    span = np.max(h[-period:]) - np.min(l[-period:])
+    return {"value": 100 * np.log10(tr_sum / span) / np.log10(period) if span > 0 else np.nan}
+
+def engulfing(o, h, l, c, v, t):
+    bullish = c[-2] < o[-2] and c[-1] > o[-1] and o[-1] <= c[-2] and c[-1] >= o[-2]
+    bearish = c[-2] > o[-2] and c[-1] < o[-1] and o[-1] >= c[-2] and c[-1] <= o[-2]
+    return {"value": 100 if bullish else -100 if bearish else 0}
+
+def hammer(o, h, l, c, v, t):
+    body = abs(c[-1] - o[-1])
+    lower_shadow = min(o[-1], c[-1]) - l[-1]
+    upper_shadow = h[-1] - max(o[-1], c[-1])
+    # Needs a prior decline for the hammer to be a reversal signal
+    is_hammer = body > 0 and lower_shadow >= 2 * body and upper_shadow <= body and c[-2] < c[-4]
+    return {"value": 100 if is_hammer else 0}
+
+def _is_star(o, h, l, c, direction: int) -> bool:
+    first_body = (c[-3] - o[-3]) * -direction
+    star_body = abs(c[-2] - o[-2])
+    third_body = (c[-1] - o[-1]) * direction
+    midpoint = (o[-3] + c[-3]) / 2
+    return bool(
+        first_body > 0 and third_body > 0 and star_body < 0.3 * first_body
+        and (c[-1] - midpoint) * direction > 0
+    )
+
+def morningstar(o, h, l, c, v, t):
+    return {"value": 100 if _is_star(o, h, l, c, 1) else 0}
+
+def eveningstar(o, h, l, c, v, t):
+    return {"value": -100 if _is_star(o, h, l, c, -1) else 0}
+
+def _three_in_a_row(o, c, direction: int) -> bool:
+    bodies = (c[-3:] - o[-3:]) * direction
+    closes = np.diff(c[-3:]) * direction
+    opens_inside = np.all((o[-2:] - np.minimum(o[-3:-1], c[-3:-1])) * (np.maximum(o[-3:-1], c[-3:-1]) - o[-2:]) >= 0)
+    return bool(np.all(bodies > 0) and np.all(closes > 0) and opens_inside)
+
+def three_white_soldiers(o, h, l, c, v, t):
+    return {"value": 100 if _three_in_a_row(o, c, 1) else 0}
+
+def three_black_crows(o, h, l, c, v, t):
+    return {"value": -100 if _three_in_a_row(o, c, -1) else 0}
+
+INDICATORS = {
+    "ema": ema,
+    "ichimoku": ichimoku,
+    "supertrend": supertrend,
+    "donchianchannels": donchianchannels,
+    "macd": macd,
+    "rsi": rsi,
+    "stochrsi": stochrsi,
+    "trix": trix,
+    "stc": stc,
+    "vwap": vwap,
+    "atr": atr,
+    "bbands": bbands,
+    "keltnerchannels": keltnerchannels,
+    "chop": chop,
+    "engulfing": engulfing,
+    "hammer": hammer,
+    "morningstar": morningstar,
+    "eveningstar": eveningstar,
+    "3whitesoldiers": three_white_soldiers,
+    "3blackcrows": three_black_crows,
+}
+#endregion
+
+def klines_to_arrays(klines) -> tuple:
+    """
+    Convert Binance klines into float arrays.
+    :param klines: A list of klines. [ timestamp, open, high, low, close, volume, ... ]
+    :return: A tuple of (open, high, low, close, volume, open_time) arrays.
+    """
+    data = np.asarray([kline[:6] for kline in klines], dtype=np.float64)
+    return data[:, 1], data[:, 2], data[:, 3], data[:, 4], data[:, 5], data[:, 0]
+
+def compute_indicators(arrays: tuple, indicator_params: list[dict]) -> dict:
+    """
+    Compute indicators on OHLCV arrays with TAAPI-compatible parameters and output.
+
+    :param arrays: A tuple of (open, high, low, close, volume, open_time) arrays, oldest first.
+    :param indicator_params: A list of { "indicator": name, **params } dicts, as sent to TAAPI's bulk endpoint.
+    :return: A dictionary mapping each indicator to its latest values, with floats rounded to 4 decimals.
+    """
+    format_floats_in_dict = lambda d: {k: (round(float(v), 4) if isinstance(v, (float, np.floating)) else v) for k, v in d.items()}
+    results = {}
+    for params in indicator_params:
+        params = dict(params)
+        name = params.pop("indicator")
+        try:
+            results[name] = format_floats_in_dict(INDICATORS[name](*arrays, **params))
+        except Exception as e:
+            print(f"Error computing indicator {name}: {e}")
+            results[name] = {}
+    return results
+
+
+class LocalIndicatorUtils:
+    """
+    Computes the TAAPI.io bulk indicator set locally from Binance klines.\n
+    Drop-in replacement for `TAAPIBulkUtils` without the TAAPI rate limit.
+    """
+
+    trend_momentum_indicators = TREND_MOMENTUM_INDICATORS
+    volatility_structure_indicators = VOLATILITY_STRUCTURE_INDICATORS
+    indicators = trend_momentum_indicators + volatility_structure_indicators
+
+    def __init__(self, symbol, bulk_interval: str = "15m", **kwargs):
+        """
+        Initialize the LocalIndicatorUtils with a trading pair symbol and interval.
+
+        :param symbol: The trading pair symbol (e.g., 'BTC/USDT' or 'BTC').
+        :param bulk_interval: The time interval for the klines (default is '15m').
+        :param kwargs: Additional parameters for the indicators, named `{indicator}_{param}` as for TAAPI.
+        """
+        self.symbol = symbol.upper().replace("/", "")
+        self.bulk_interval = bulk_interval
+        self.indicator_params = [
+            {
+                "indicator": indicator,
+                **({k.replace(f"{indicator}_", ""): v for k, v in kwargs.items() if k.startswith(f"{indicator}_")})
+            } for indicator in self.indicators
+        ]
+        self.bulk_data = None
+
+    def __compute_bulk_indicators(self):
+        if self.bulk_data is not None:
+            return
+        klines = get_klines(self.symbol, self.bulk_interval, get_config()["local_indicator_klines"])
+        if klines is None or len(klines) == 0:
+            return
+        self.bulk_data = compute_indicators(klines_to_arrays(klines), self.indicator_params)
+
+    def fetch_trend_momentum_indicators(self):
+        """
+        Compute trend and momentum indicators.
+        :return: A dictionary containing the latest values for each trend and momentum indicator.
+        """
+        self.__compute_bulk_indicators()
+        if self.bulk_data is None:
+            return None
+        return {indicator: self.bulk_data.get(indicator, {}) for indicator in self.trend_momentum_indicators}
+
+    def fetch_volatility_structure_indicators(self):
+        """
+        Compute volatility and structure indicators.
+        :return: A dictionary containing the latest values for each volatility and structure indicator.
+        """
+        self.__compute_bulk_indicators()
+        if self.bulk_data is None:
+            return None
+        return {indicator: self.bulk_data.get(indicator, {}) for indicator in self.volatility_structure_indicators}
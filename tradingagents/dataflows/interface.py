@@ -1,21 +1,27 @@
 from typing import Annotated, Dict
-from .blockbeats_utils import fetch_news_from_blockbeats
-from .coindesk_utils import fetch_news_from_coindesk
+from .blockbeats_utils import fetch_news_from_blockbeats, afetch_news_from_blockbeats
+from .coindesk_utils import fetch_news_from_coindesk, afetch_news_from_coindesk
 from .coinstats_utils import *
 from .reddit_utils import fetch_posts_from_reddit
 from .googlenews_utils import *
 from .binance_utils import *
-from .alternativeme_utils import fetch_fear_and_greed_from_alternativeme
+from .binance_stream_utils import get_market_stream
+from .kline_store_utils import get_klines
+from .depth_utils import analyze_depth
+from .format_utils import format_table, KLINE_AGGREGATIONS
+from .alternativeme_utils import fetch_fear_and_greed_from_alternativeme, afetch_fear_and_greed_from_alternativeme
 from .taapi_utils import *
+from .indicator_utils import LocalIndicatorUtils
 from dateutil.relativedelta import relativedelta
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from .utils import ts_to_time
 import json
 import os
 import pandas as pd
+import numpy as np
 from tqdm import tqdm
-from openai import OpenAI, NotGiven
+from openai import OpenAI, AsyncOpenAI, NotGiven
 from .config import get_config, set_config, DATA_DIR
 
 from warnings import deprecated
@@ -38,8 +44,16 @@ def get_blockbeats_news(count: Annotated[int, "news' count, no more than 30"] =
     if count > 30:
         raise ValueError("Count should not be more than 30")
 
-    news = fetch_news_from_blockbeats(count)
+    return _format_blockbeats_news(fetch_news_from_blockbeats(count))
 
+async def aget_blockbeats_news(count: Annotated[int, "news' count, no more than 30"] = 10):
+    """Async version of `get_blockbeats_news`."""
+    if count > 30:
+        raise ValueError("Count should not be more than 30")
+
+    return _format_blockbeats_news(await afetch_news_from_blockbeats(count))
+
+def _format_blockbeats_news(news) -> str:
     if len(news) == 0:
         return "Blockbeats News: " + data_unavailable_prompt
 
@@ -63,8 +77,16 @@ def get_coindesk_news(
     Returns:
         str: A formatted string containing the latest news articles and meta information.
     """
-    news = fetch_news_from_coindesk(tickers, count)
+    return _format_coindesk_news(fetch_news_from_coindesk(tickers, count))
+
+async def aget_coindesk_news(
+    tickers: Annotated[list[str], "List of ticker symbols to fetch news for"] = [],
+    count: Annotated[int, "Number of news articles to fetch, default is 10"] = 10,
+) -> str:
+    """Async version of `get_coindesk_news`."""
+    return _format_coindesk_news(await afetch_news_from_coindesk(tickers, count))
 
+def _format_coindesk_news(news) -> str:
     if not news or not isinstance(news, list) or len(news) == 0:
         return "Coindesk News: " + data_unavailable_prompt
 
@@ -75,7 +97,13 @@ def get_coindesk_news(
     return f"## Coindesk News:\n\n{news_str}"
 
 def get_fear_and_greed_index() -> str:
-    fng = fetch_fear_and_greed_from_alternativeme()
+    return _format_fear_and_greed_index(fetch_fear_and_greed_from_alternativeme())
+
+async def aget_fear_and_greed_index() -> str:
+    """Async version of `get_fear_and_greed_index`."""
+    return _format_fear_and_greed_index(await afetch_fear_and_greed_from_alternativeme())
+
+def _format_fear_and_greed_index(fng) -> str:
     if not fng or len(fng) == 0:
         return "Fear and Greed Index: " + data_unavailable_prompt 
     return f"""## Fear and Greed Index: {fng[0]}\n0 means \"Extreme Fear\", while 100 means \"Extreme Greed\"\nPrevious daily FnG: {','.join(fng[1:])}"""
@@ -87,7 +115,13 @@ def get_coinstats_btc_dominance() -> str:
     Returns:
         str: A formatted string containing Bitcoin dominance for 24 hours and 1 week.
     """
-    btc_dominance = fetch_btc_dominance_from_coinstats()
+    return _format_coinstats_btc_dominance(fetch_btc_dominance_from_coinstats())
+
+async def aget_coinstats_btc_dominance() -> str:
+    """Async version of `get_coinstats_btc_dominance`."""
+    return _format_coinstats_btc_dominance(await afetch_btc_dominance_from_coinstats())
+
+def _format_coinstats_btc_dominance(btc_dominance) -> str:
     if not btc_dominance or not isinstance(btc_dominance, dict):
         return "Bitcoin Dominance: " + data_unavailable_prompt
     return f"## Bitcoin Dominance:\n24h: {btc_dominance['24h']}%, 1week: {btc_dominance['1w']}%"
@@ -123,6 +157,8 @@ def get_taapi_bulk_indicators(
 ) -> str:
     """
     Fetch bulk technical analysis indicators for a given symbol and interval.
+    Indicators come from TAAPI.io, or are computed locally from Binance klines when
+    `indicator_source` is set to 'local' in the config.
 
     Args:
         symbol (str): The trading pair symbol (e.g., 'BTC/USDT').
@@ -131,9 +167,14 @@ def get_taapi_bulk_indicators(
     Returns:
         str: A formatted string containing the latest technical analysis indicators.
     """
-    bulk = TAAPIBulkUtils(symbol, bulk_interval=interval, **kwargs)
-    trend_momentum = bulk.fetch_trend_momentum_indicators_from_taapi()
-    volatility_structure = bulk.fetch_volatility_structure_indicators_from_taapi()
+    if get_config()["indicator_source"] == "local":
+        bulk = LocalIndicatorUtils(symbol, bulk_interval=interval, **kwargs)
+        trend_momentum = bulk.fetch_trend_momentum_indicators()
+        volatility_structure = bulk.fetch_volatility_structure_indicators()
+    else:
+        bulk = TAAPIBulkUtils(symbol, bulk_interval=interval, **kwargs)
+        trend_momentum = bulk.fetch_trend_momentum_indicators_from_taapi()
+        volatility_structure = bulk.fetch_volatility_structure_indicators_from_taapi()
     if not trend_momentum or not volatility_structure:
         return f"{symbol} Technical Analysis at {interval}: " + data_unavailable_prompt
     return f"## {symbol} Trend and Momentum Indicators at {interval}:\n{trend_momentum}\n\n" + \
@@ -146,7 +187,13 @@ def get_coinstats_news() -> str:
     Returns:
         str: A formatted string containing the latest news articles and meta information.
     """
-    news = fetch_news_from_coinstats()
+    return _format_coinstats_news(fetch_news_from_coinstats())
+
+async def aget_coinstats_news() -> str:
+    """Async version of `get_coinstats_news`."""
+    return _format_coinstats_news(await afetch_news_from_coinstats())
+
+def _format_coinstats_news(news) -> str:
     if not news or not isinstance(news, list) or len(news) == 0:
         return "CoinStats News: " + data_unavailable_prompt
     news_str = ""
@@ -207,6 +254,29 @@ def get_reddit_posts(
 
     return f"## Reddit Posts in r/{subreddit_name} for {symbol}:\n{posts_str}"
 
+def _fetch_ohlcv(symbol: str, interval: str):
+    """Latest OHLCV from the market stream or the kline store when enabled, otherwise from REST."""
+    config = get_config()
+    if not config["binance_stream_enabled"] and not config["kline_store_enabled"]:
+        return fetch_ohlcv_from_binance(symbol, interval)
+    klines = get_klines(symbol, interval, 1)
+    if klines is None or len(klines) == 0:
+        return None
+    kline = klines[-1]
+    return {
+        "open": float(kline[1]),
+        "high": float(kline[2]),
+        "low": float(kline[3]),
+        "close": float(kline[4]),
+        "volume": float(kline[5])
+    }
+
+def _fetch_depth(symbol: str, limit: int):
+    """Order book from the market stream when enabled, otherwise from REST."""
+    stream = get_market_stream(symbol, [])
+    depth = stream.get_depth(symbol, limit) if stream is not None else None
+    return depth if depth is not None else fetch_depth_from_binance(symbol, limit)
+
 def get_binance_ohlcv(
     symbol: Annotated[str, "ticker symbol of the asset"],
     interval: Annotated[str, "time interval for the data, e.g., '1m', '5m', '1h'"],
@@ -224,8 +294,8 @@ def get_binance_ohlcv(
     if not symbol.endswith("USDT"):
         symbol += "USDT"
 
-    ohlcv = fetch_ohlcv_from_binance(symbol, interval)
-    if ohlcv is dict:
+    ohlcv = _fetch_ohlcv(symbol, interval)
+    if isinstance(ohlcv, dict):
         return (
             f"## {symbol} Futures **Latest OHLCV Data** in last {interval}:\n"
             f"Open: {ohlcv['open']}, High: {ohlcv['high']}, Low: {ohlcv['low']}, Close: {ohlcv['close']}, Volume: {ohlcv['volume']}\n"
@@ -233,21 +303,134 @@ def get_binance_ohlcv(
     else:
         return f"{symbol} Futures **Latest OHLCV Data** in last {interval}: " + data_unavailable_prompt
 
+def _format_binance_klines(symbol: str, interval: str, klines, max_chars: int = None) -> str:
+    if klines is None or len(klines) == 0:
+        return ""
+    if get_config()["tool_output_format"] != "verbose":
+        data = np.asarray([kline[:6] for kline in klines], dtype=np.float64)
+        return format_table(
+            f"{symbol} Futures **KLines Data** for {interval} interval", data[:, 0],
+            {"open": data[:, 1], "high": data[:, 2], "low": data[:, 3], "close": data[:, 4], "volume": data[:, 5]},
+            max_chars=max_chars, aggregations=KLINE_AGGREGATIONS,
+        )
+    klines = list(map(lambda x: { "t": x[0], "o": x[1], "h": x[2], "l": x[3], "c": x[4], "v": x[5] }, klines))
+    return f"## {symbol} Futures **KLines Data** for {interval} interval:\n" + "\n".join(
+        [f"{ts_to_time(int(entry["t"]) / 1000)}: Open: {entry["o"]}, High: {entry["h"]}, Low: {entry["l"]}, Close: {entry["c"]}, Volume: {entry["v"]}" for entry in klines]
+    ) + "\n\n"
+
+def _format_binance_depth(symbol: str, depth) -> str:
+    if depth is None or not isinstance(depth, dict):
+        return ""
+    analysis = analyze_depth(depth)
+    if analysis is None:
+        return ""
+    lines = [
+        f"Best Bid: {analysis["best_bid"]}, Best Ask: {analysis["best_ask"]}, Spread: {analysis["spread"]:.6g} ({analysis["spread_bps"]:.2f} bps), "
+        f"Mid: {analysis["mid"]:.6g}, Microprice: {analysis["microprice"]:.6g}",
+        f"Cumulative Liquidity from {analysis["levels"][0]} bid and {analysis["levels"][1]} ask levels (Imbalance = (Bid - Ask) / (Bid + Ask)):",
+    ]
+    for band in analysis["bands"]:
+        bound = "" if band["complete"] else " (book truncated, lower bound)"
+        lines.append(
+            f"±{band["pct"]:g}%: Bid Qty: {band["bid_qty"]:.6g} ({band["bid_notional"]:,.0f} USDT), "
+            f"Ask Qty: {band["ask_qty"]:.6g} ({band["ask_notional"]:,.0f} USDT), Imbalance: {band["imbalance"]:+.3f}{bound}"
+        )
+    for side, title in (("bids", "Bid Walls"), ("asks", "Ask Walls")):
+        walls = analysis["walls"][side]
+        lines.append(f"{title}: " + (", ".join(
+            f"{wall["price"]} x {wall["quantity"]:.6g} ({wall["distance_pct"]:.2f}% from mid)" for wall in walls
+        ) or "None"))
+    return f"## {symbol} Futures **Order Book Depth Summary**:\n" + "\n".join(lines) + "\n\n"
+
+def _format_binance_ticker_24hr(symbol: str, ticker_24hr) -> str:
+    if ticker_24hr is None or not isinstance(ticker_24hr, dict):
+        return ""
+    return f"## {symbol} Futures **24-Hour Price Change**:\nPrice Change: {ticker_24hr.get("priceChange", "N/A")}, Price Change Percent: {ticker_24hr.get("priceChangePercent", "N/A")}, Weighted Avg Price: {ticker_24hr.get("weightedAvgPrice", "N/A")}\n\n"
+
+def _format_binance_longshort_ratio(symbol: str, title: str, ratios, max_chars: int = None) -> str:
+    if ratios is None or not isinstance(ratios, list):
+        return ""
+    if get_config()["tool_output_format"] != "verbose":
+        return format_table(
+            f"{symbol} Futures **{title}**", [entry["timestamp"] for entry in ratios],
+            {"longShortRatio": [entry["longShortRatio"] for entry in ratios]},
+            max_chars=max_chars, aggregations={"longShortRatio": "mean"},
+        )
+    ratios = [
+        { "t": entry["timestamp"], "longShortRatio": entry["longShortRatio"] }
+        for entry in ratios
+    ]
+    return f"## {symbol} Futures **{title}**:\n" + "\n".join(
+        [f"{ts_to_time(int(entry["t"]) / 1000)}: Long/Short Ratio: {entry["longShortRatio"]}" for entry in ratios]
+    ) + "\n\n"
+
+def _format_binance_taker_ratio(symbol: str, taker_longshort_ratio, max_chars: int = None) -> str:
+    if taker_longshort_ratio is None or not isinstance(taker_longshort_ratio, list):
+        return ""
+    if get_config()["tool_output_format"] != "verbose":
+        return format_table(
+            f"{symbol} Futures **Taker Long/Short Ratio**", [entry["timestamp"] for entry in taker_longshort_ratio],
+            {
+                "buySellRatio": [entry["buySellRatio"] for entry in taker_longshort_ratio],
+                "buyVol": [entry["buyVol"] for entry in taker_longshort_ratio],
+                "sellVol": [entry["sellVol"] for entry in taker_longshort_ratio],
+            },
+            max_chars=max_chars, aggregations={"buySellRatio": "mean", "buyVol": "sum", "sellVol": "sum"},
+        )
+    taker_longshort_ratio = [
+        { "t": entry["timestamp"], "buySellRatio": entry["buySellRatio"], "buyVol": entry["buyVol"], "sellVol": entry["sellVol"] }
+        for entry in taker_longshort_ratio
+    ]
+    return f"## {symbol} Futures **Taker Long/Short Ratio**:\n" + "\n".join(
+        [f"{ts_to_time(int(entry["t"]) / 1000)}: Long/Short Ratio: {entry["buySellRatio"]}, Buy Volume: {entry["buyVol"]}, Sell Volume: {entry["sellVol"]}" for entry in taker_longshort_ratio]
+    ) + "\n\n"
+
+def _fetch_concurrently(calls: Dict[str, tuple], timeout: float) -> Dict[str, object]:
+    """
+    Issue every request at once and collect what finishes before the shared deadline.
+
+    Args:
+        calls (dict): Mapping of section name to a (callable, *args) tuple.
+        timeout (float): Shared deadline in seconds for all requests.
+    Returns:
+        dict: Mapping of section name to its result, or None if it failed or timed out.
+    """
+    executor = ThreadPoolExecutor(max_workers=len(calls))
+    futures = {name: executor.submit(*call) for name, call in calls.items()}
+    wait(futures.values(), timeout=timeout)
+    # Do not block on stragglers; their sections are simply left out
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    results = {}
+    for name, future in futures.items():
+        if not future.done() or future.cancelled():
+            print(f"Binance request '{name}' did not finish within {timeout}s, skipping.")
+            results[name] = None
+        elif future.exception() is not None:
+            print(f"Binance request '{name}' failed: {future.exception()}")
+            results[name] = None
+        else:
+            results[name] = future.result()
+    return results
+
 def get_binance_data(
     symbol: Annotated[str, "ticker symbol of the asset"],
     interval: Annotated[str, "time interval for the data, e.g., '1m', '5m', '1h'"],
     klines_limit: Annotated[int, "maximum number of klines to fetch, default is 75"] = 75,
-    depth_limit: Annotated[int, "maximum number of bids and asks to fetch, default is 50"] = 50,
+    depth_limit: Annotated[int, "number of bids and asks to analyze (5, 10, 20, 50, 100, 500 or 1000), default is 500"] = 500,
     longshort_limit: Annotated[int, "maximum number of long/short ratios to fetch, default is 50"] = 50,
 ) -> str:
     """
     Fetch historical futures data from Binance for a given symbol and interval.
+    When `binance_concurrent_fetch` is enabled in the config, all endpoints are requested
+    at once under the shared `binance_fetch_timeout` deadline and sections that miss it are omitted.
 
     Args:
         symbol (str): The trading pair symbol (e.g., 'BTCUSDT').
         interval (str): The time interval for the klines (e.g., '1m', '5m', '1h').
         klines_limit (int): The maximum number of klines to fetch (default is 75).
-        depth_limit (int): The maximum number of bids and asks to fetch (default is 50).
+        depth_limit (int): The number of bids and asks to analyze (default is 500). The whole book is summarized
+            into spread, microprice, cumulative liquidity bands, imbalance and walls.
         longshort_limit (int): The maximum number of long/short ratios to fetch (default is 50).
         
     Returns:
@@ -257,148 +440,98 @@ def get_binance_data(
     if not symbol.endswith("USDT"):
         symbol += "USDT"  # Ensure the symbol ends with USDT for futures
 
-    klines_str = ""
-    klines = fetch_klines_from_binance(symbol, interval, klines_limit)
-    if klines is not None and len(klines) != 0:
-        klines = list(map(lambda x: { "t": x[0], "o": x[1], "h": x[2], "l": x[3], "c": x[4], "v": x[5] }, klines))
-        klines_str = f"## {symbol} Futures **KLines Data** for {interval} interval:\n" + "\n".join(
-            [f"{ts_to_time(int(entry["t"]) / 1000)}: Open: {entry["o"]}, High: {entry["h"]}, Low: {entry["l"]}, Close: {entry["c"]}, Volume: {entry["v"]}" for entry in klines]
-        ) + "\n\n"
-    
-    depth_str = ""
-    depth = fetch_depth_from_binance(symbol, depth_limit)
-    if depth is not None and isinstance(depth, dict):
-        bids = depth.get("bids", [-1, -1])
-        asks = depth.get("asks", [-1, -1])
-        depth = { "bids": { "price": bids[0], "volume": bids[1] }, "asks": { "price": asks[0], "volume": asks[1] } }
-        depth_str = f"## {symbol} Futures **Current Depth Data**:\nBids: Price: {depth["bids"]["price"]}, Volume: {depth["bids"]["volume"]}\nAsks: Price: {depth["asks"]["price"]}, Volume: {depth["asks"]["volume"]}\n\n"
-
-    ticker_24hr_str = ""
-    ticker_24hr = fetch_24hr_pricechange_from_binance(symbol)
-    if ticker_24hr is not None and isinstance(ticker_24hr, dict):
-        ticker_24hr_str = f"## {symbol} Futures **24-Hour Price Change**:\nPrice Change: {ticker_24hr.get("priceChange", "N/A")}, Price Change Percent: {ticker_24hr.get("priceChangePercent", "N/A")}, Weighted Avg Price: {ticker_24hr.get("weightedAvgPrice", "N/A")}\n\n"
-
-    top_longshort_position_ratio_str = ""
-    top_longshort_position_ratio = fetch_toplongshort_position_ratio_from_binance(symbol, interval, longshort_limit)
-    if top_longshort_position_ratio is not None and isinstance(top_longshort_position_ratio, list):
-        top_longshort_position_ratio = [
-            { "t": entry["timestamp"], "longShortRatio": entry["longShortRatio"] }
-            for entry in top_longshort_position_ratio
-        ]
-        top_longshort_position_ratio_str = f"## {symbol} Futures **Top Long/Short Position Ratio**:\n" + "\n".join(
-            [f"{ts_to_time(int(entry["t"]) / 1000)}: Long/Short Ratio: {entry["longShortRatio"]}" for entry in top_longshort_position_ratio]
-        ) + "\n\n"
-
-    top_longshort_account_ratio_str = ""
-    top_longshort_account_ratio = fetch_toplongshort_account_ratio_from_binance(symbol, interval, longshort_limit)
-    if top_longshort_account_ratio is not None and isinstance(top_longshort_account_ratio, list):
-        top_longshort_account_ratio = [
-            { "t": entry["timestamp"], "longShortRatio": entry["longShortRatio"] }
-            for entry in top_longshort_account_ratio
-        ]
-        top_longshort_account_ratio_str = f"## {symbol} Futures **Top Long/Short Account Ratio**:\n" + "\n".join(
-            [f"{ts_to_time(int(entry["t"]) / 1000)}: Long/Short Ratio: {entry["longShortRatio"]}" for entry in top_longshort_account_ratio]
-        ) + "\n\n"
-
-    global_longshort_account_ratio_str = ""
-    global_longshort_account_ratio = fetch_global_longshort_account_ratio_from_binance(symbol, interval, longshort_limit)
-    if global_longshort_account_ratio is not None and isinstance(global_longshort_account_ratio, list):
-        global_longshort_account_ratio = [
-            { "t": entry["timestamp"], "longShortRatio": entry["longShortRatio"] }
-            for entry in global_longshort_account_ratio
-        ]
-        global_longshort_account_ratio_str = f"## {symbol} Futures **Global Long/Short Account Ratio**:\n" + "\n".join(
-            [f"{ts_to_time(int(entry["t"]) / 1000)}: Long/Short Ratio: {entry["longShortRatio"]}" for entry in global_longshort_account_ratio]
-        ) + "\n\n"
-
-    taker_longshort_ratio_str = ""
-    taker_longshort_ratio = fetch_taker_longshort_ratio_from_binance(symbol, interval, longshort_limit)
-    if taker_longshort_ratio is not None and isinstance(taker_longshort_ratio, list):
-        taker_longshort_ratio = [
-            { "t": entry["timestamp"], "buySellRatio": entry["buySellRatio"], "buyVol": entry["buyVol"], "sellVol": entry["sellVol"] }
-            for entry in taker_longshort_ratio
-        ]
-        taker_longshort_ratio_str = f"## {symbol} Futures **Taker Long/Short Ratio**:\n" + "\n".join(
-            [f"{ts_to_time(int(entry["t"]) / 1000)}: Long/Short Ratio: {entry["buySellRatio"]}, Buy Volume: {entry["buyVol"]}, Sell Volume: {entry["sellVol"]}" for entry in taker_longshort_ratio]
-        ) + "\n\n"
+    calls = {
+        "klines": (get_klines, symbol, interval, klines_limit),
+        "depth": (_fetch_depth, symbol, depth_limit),
+        "ticker_24hr": (fetch_24hr_pricechange_from_binance, symbol),
+        "top_longshort_position_ratio": (fetch_toplongshort_position_ratio_from_binance, symbol, interval, longshort_limit),
+        "top_longshort_account_ratio": (fetch_toplongshort_account_ratio_from_binance, symbol, interval, longshort_limit),
+        "global_longshort_account_ratio": (fetch_global_longshort_account_ratio_from_binance, symbol, interval, longshort_limit),
+        "taker_longshort_ratio": (fetch_taker_longshort_ratio_from_binance, symbol, interval, longshort_limit),
+    }
 
+    config = get_config()
+    if config["binance_concurrent_fetch"]:
+        data = _fetch_concurrently(calls, config["binance_fetch_timeout"])
+    else:
+        data = {name: call[0](*call[1:]) for name, call in calls.items()}
+
+    # Klines get half of the size budget, the four ratio series share the rest
+    budget = config["tool_output_budgets"].get("get_binance_data")
+    klines_budget, ratio_budget = (budget // 2, budget // 8) if budget else (None, None)
     return (
         f"## {symbol} Futures Data:\n\n"
-        + klines_str
-        + depth_str
-        + ticker_24hr_str
-        + top_longshort_position_ratio_str
-        + top_longshort_account_ratio_str
-        + global_longshort_account_ratio_str
-        + taker_longshort_ratio_str
+        + _format_binance_klines(symbol, interval, data["klines"], klines_budget)
+        + _format_binance_depth(symbol, data["depth"])
+        + _format_binance_ticker_24hr(symbol, data["ticker_24hr"])
+        + _format_binance_longshort_ratio(symbol, "Top Long/Short Position Ratio", data["top_longshort_position_ratio"], ratio_budget)
+        + _format_binance_longshort_ratio(symbol, "Top Long/Short Account Ratio", data["top_longshort_account_ratio"], ratio_budget)
+        + _format_binance_longshort_ratio(symbol, "Global Long/Short Account Ratio", data["global_longshort_account_ratio"], ratio_budget)
+        + _format_binance_taker_ratio(symbol, data["taker_longshort_ratio"], ratio_budget)
     )
 
-def get_asset_news_llm(ticker, curr_date):
+def _search_llm_client_args() -> dict:
     config = get_config()
-    client = OpenAI(
-        base_url=config.get("search_backend_url", config["backend_url"]),
-        api_key=os.getenv(config["api_key_env_name"])
-    )
-    
-    response = client.chat.completions.create(
-        model=config["search_llm"],
-        messages=[
+    return {
+        "base_url": config.get("search_backend_url", config["backend_url"]),
+        "api_key": os.getenv(config["api_key_env_name"]),
+    }
+
+def _search_llm_request(content: str) -> dict:
+    return {
+        "model": get_config()["search_llm"],
+        "messages": [
             {"role": "system", "content": "You are a helpful assistant."},
-            {
-                "role": "user",
-                "content": get_prompts("tools", "get_asset_news_llm") \
-                    .replace("{ticker}", ticker) \
-                    .replace("{curr_date}", curr_date)
-            }
+            {"role": "user", "content": content}
         ],
-        extra_body={"enable_search": True}
-    )
-    print(response)
+        "extra_body": {"enable_search": True},
+    }
+
+def _asset_news_llm_prompt(ticker, curr_date) -> str:
+    return get_prompts("tools", "get_asset_news_llm") \
+        .replace("{ticker}", ticker) \
+        .replace("{curr_date}", curr_date)
+
+def _global_news_llm_prompt(curr_date) -> str:
+    return get_prompts("tools", "get_global_news_llm") \
+        .replace("{curr_date}", curr_date)
+
+def _fundamentals_llm_prompt(ticker, curr_date) -> str:
+    return get_prompts("tools", "get_fundamentals_llm") \
+        .replace("{ticker}", ticker) \
+        .replace("{curr_date}", curr_date)
+
+def get_asset_news_llm(ticker, curr_date):
+    client = OpenAI(**_search_llm_client_args())
+    response = client.chat.completions.create(**_search_llm_request(_asset_news_llm_prompt(ticker, curr_date)))
     return response.choices[0].message.content
 
-def get_global_news_llm(curr_date):
-    config = get_config()
-    client = OpenAI(
-        base_url=config.get("search_backend_url", config["backend_url"]),
-        api_key=os.getenv(config["api_key_env_name"])
-    )
+async def aget_asset_news_llm(ticker, curr_date):
+    """Async version of `get_asset_news_llm`."""
+    async with AsyncOpenAI(**_search_llm_client_args()) as client:
+        response = await client.chat.completions.create(**_search_llm_request(_asset_news_llm_prompt(ticker, curr_date)))
+    return response.choices[0].message.content
 
-    response = client.chat.completions.create(
-        model=config["search_llm"],
-        messages=[
-            {"role": "system", "content": "You are a helpful assistant."},
-            {
-                "role": "user",
-                "content": get_prompts("tools", "get_global_news_llm") \
-                    .replace("{curr_date}", curr_date),
-            }
-        ],
-        extra_body={"enable_search": True}
-    )
+def get_global_news_llm(curr_date):
+    client = OpenAI(**_search_llm_client_args())
+    response = client.chat.completions.create(**_search_llm_request(_global_news_llm_prompt(curr_date)))
+    return response.choices[0].message.content
 
+async def aget_global_news_llm(curr_date):
+    """Async version of `get_global_news_llm`."""
+    async with AsyncOpenAI(**_search_llm_client_args()) as client:
+        response = await client.chat.completions.create(**_search_llm_request(_global_news_llm_prompt(curr_date)))
     return response.choices[0].message.content
 
 def get_fundamentals_llm(ticker, curr_date):
-    config = get_config()
-    client = OpenAI(
-        base_url=config.get("search_backend_url", config["backend_url"]),
-        api_key=os.getenv(config["api_key_env_name"])
-    )
-
-    response = client.chat.completions.create(
-        model=config["search_llm"],
-        messages=[
-            {"role": "system", "content": "You are a helpful assistant."},
-            {
-                "role": "user",
-                "content": get_prompts("tools", "get_fundamentals_llm") \
-                    .replace("{ticker}", ticker) \
-                    .replace("{curr_date}", curr_date),
-            }
-        ],
-        extra_body={"enable_search": True}
-    )
+    client = OpenAI(**_search_llm_client_args())
+    response = client.chat.completions.create(**_search_llm_request(_fundamentals_llm_prompt(ticker, curr_date)))
+    return response.choices[0].message.content
 
+async def aget_fundamentals_llm(ticker, curr_date):
+    """Async version of `get_fundamentals_llm`."""
+    async with AsyncOpenAI(**_search_llm_client_args()) as client:
+        response = await client.chat.completions.create(**_search_llm_request(_fundamentals_llm_prompt(ticker, curr_date)))
     return response.choices[0].message.content
 
 #region Deprecated Stock Utilities
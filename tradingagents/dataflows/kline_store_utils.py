@@ -0,0 +1,362 @@
+import os
+import time
+import threading
+import numpy as np
+from .binance_utils import fetch_klines_from_binance, fetch_klines_range_from_binance
+from .binance_stream_utils import get_market_stream
+from .config import get_config
+from .utils import interval_to_seconds
+
+KLINE_COLUMNS = ("open_time", "open", "high", "low", "close", "volume")
+MAX_KLINES_PER_REQUEST = 1500
+RESAMPLE_BASE_INTERVAL = "1m"
+WEEK_OFFSET_MS = 4 * 86400 * 1000  # Binance weekly candles open on Monday, the epoch was a Thursday
+
+
+def resample_klines(base: np.ndarray, interval: str) -> np.ndarray:
+    """
+    Aggregate klines into a coarser interval with exchange candle semantics:
+    first open, highest high, lowest low, last close and summed volume per bucket.
+    Buckets are aligned to the Unix epoch like Binance candles (weeks start on Monday).
+    A leading bucket that is only partially covered by `base` is dropped; the last bucket
+    is kept even if incomplete, like the exchange's in-progress candle.
+
+    :param base: Klines as an (n, 6) array of [open_time, open, high, low, close, volume], sorted by open time.
+    :param interval: The target interval (e.g., '15m', '4h', '1d').
+    :return: The resampled klines as an (m, 6) array.
+    """
+    if len(base) == 0:
+        return np.empty((0, len(KLINE_COLUMNS)))
+    step = interval_to_seconds(interval) * 1000
+    offset = WEEK_OFFSET_MS if interval.endswith("w") else 0
+    open_times = base[:, 0].astype(np.int64)
+    buckets = (open_times - offset) // step * step + offset
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:] - 1, len(base) - 1]
+    resampled = np.column_stack([
+        buckets[starts],
+        base[starts, 1],
+        np.maximum.reduceat(base[:, 2], starts),
+        np.minimum.reduceat(base[:, 3], starts),
+        base[ends, 4],
+        np.add.reduceat(base[:, 5], starts),
+    ])
+    if open_times[0] != buckets[0]:
+        resampled = resampled[1:]
+    return resampled
+
+
+class KlineStore:
+    """
+    Local kline history per (symbol, interval), stored as memory-mapped float64 matrices.\n
+    Each file holds rows of [open_time, open, high, low, close, volume] sorted by open time.
+    New candles are appended in place, so only the missing tail is fetched from the exchange,
+    and time-range queries return views of the mapped file without copying. Candles are fetched
+    without holding any lock; only merging them into a file is serialized, per (symbol, interval).
+    Gaps left by a bounded catch-up are backfilled in the background.
+    """
+
+    def __init__(self, root: str, fetch_range=fetch_klines_range_from_binance, max_age: float = 300):
+        """
+        :param root: Directory holding the kline files.
+        :param fetch_range: Fetcher with the signature of `fetch_klines_range_from_binance`.
+        :param max_age: Seconds a synced in-progress candle is served before the store syncs again.
+        """
+        os.makedirs(root, exist_ok=True)
+        self.root = root
+        self.fetch_range = fetch_range
+        self.max_age = max_age
+        self._maps: dict[tuple[str, str], np.ndarray] = {}
+        self._resampled: dict[tuple[str, str], tuple[tuple, np.ndarray]] = {}
+        self._file_locks: dict[tuple[str, str], threading.Lock] = {}
+        self._synced_at: dict[tuple[str, str], float] = {}
+        self._background: set[tuple] = set()
+        self._lock = threading.RLock()
+
+    def _file_lock(self, symbol: str, interval: str) -> threading.Lock:
+        with self._lock:
+            return self._file_locks.setdefault((symbol.upper(), interval), threading.Lock())
+
+    def _run_in_background(self, task, symbol: str, interval: str, *args):
+        """Run `task(symbol, interval, *args)` in a background thread, unless the same task is already running."""
+        key = (task.__name__, symbol.upper(), interval)
+        with self._lock:
+            if key in self._background:
+                return
+            self._background.add(key)
+
+        def run():
+            try:
+                task(symbol, interval, *args)
+            except Exception as e:
+                print(f"Error in kline store {task.__name__} for {symbol} {interval}: {e}")
+            finally:
+                with self._lock:
+                    self._background.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, f"{symbol.upper()}_{interval}.f64")
+
+    def load(self, symbol: str, interval: str) -> np.ndarray:
+        """Return the stored klines as a read-only (n, 6) memory-mapped array."""
+        key = (symbol.upper(), interval)
+        with self._lock:
+            if key not in self._maps:
+                path = self._path(symbol, interval)
+                if not os.path.exists(path) or os.path.getsize(path) == 0:
+                    return np.empty((0, len(KLINE_COLUMNS)))
+                self._maps[key] = np.memmap(path, dtype=np.float64, mode="r").reshape(-1, len(KLINE_COLUMNS))
+            return self._maps[key]
+
+    def _write(self, symbol: str, interval: str, rows: np.ndarray, offset: int = None):
+        """Write `rows` at row `offset` (default: the end of the file) and drop the stale mapping."""
+        path = self._path(symbol, interval)
+        with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+            if offset is None:
+                f.seek(0, os.SEEK_END)
+            else:
+                f.seek(offset * len(KLINE_COLUMNS) * 8)
+            f.write(np.ascontiguousarray(rows, dtype=np.float64).tobytes())
+        with self._lock:
+            self._maps.pop((symbol.upper(), interval), None)
+
+    def _rewrite(self, symbol: str, interval: str, rows: np.ndarray):
+        """Replace the whole file with `rows`, sorted and deduplicated by open time."""
+        _, unique = np.unique(rows[::-1, 0], return_index=True)
+        rows = rows[::-1][unique]  # keep the most recently fetched copy of each candle
+        path = self._path(symbol, interval)
+        with open(path + ".tmp", "wb") as f:
+            f.write(np.ascontiguousarray(rows, dtype=np.float64).tobytes())
+        os.replace(path + ".tmp", path)
+        with self._lock:
+            self._maps.pop((symbol.upper(), interval), None)
+
+    def _merge(self, symbol: str, interval: str, rows: np.ndarray, start_time: int = None):
+        """
+        Replace the stored candles from `start_time` (default: the first fetched candle) on with the
+        freshly fetched `rows`, keeping stored candles newer than them. Only the last stored candle
+        is overwritten in place, since views of the mapped file may still be in use; other merges
+        replace the file.
+        """
+        if len(rows) == 0:
+            return
+        start_time = rows[0, 0] if start_time is None else min(start_time, rows[0, 0])
+        with self._file_lock(symbol, interval):
+            stored = self.load(symbol, interval)
+            offset = int(np.searchsorted(stored[:, 0], start_time, side="left"))
+            newer = stored[offset:][stored[offset:, 0] > rows[-1, 0]]
+            merged = np.concatenate([rows, newer])
+            if len(stored) > 0 and offset >= len(stored) - 1:
+                self._write(symbol, interval, merged, offset)
+            else:
+                self._rewrite(symbol, interval, np.concatenate([stored[:offset], merged]))
+
+    def _fetch(self, symbol: str, interval: str, start_time: int = None, end_time: int = None, limit: int = MAX_KLINES_PER_REQUEST) -> np.ndarray:
+        klines = self.fetch_range(symbol, interval, start_time=start_time, end_time=end_time, limit=limit)
+        if not klines:
+            return np.empty((0, len(KLINE_COLUMNS)))
+        return np.asarray([kline[:6] for kline in klines], dtype=np.float64)
+
+    def _fetch_latest(self, symbol: str, interval: str, limit: int) -> np.ndarray:
+        """Fetch the last `limit` candles, walking backwards in requests of at most `MAX_KLINES_PER_REQUEST`."""
+        step = interval_to_seconds(interval) * 1000
+        chunks = [self._fetch(symbol, interval, limit=min(limit, MAX_KLINES_PER_REQUEST))]
+        fetched = len(chunks[0])
+        while 0 < fetched < limit and len(chunks[0]) > 0:
+            chunks.insert(0, self._fetch(
+                symbol, interval, end_time=int(chunks[0][0, 0]) - step,
+                limit=min(limit - fetched, MAX_KLINES_PER_REQUEST),
+            ))
+            fetched += len(chunks[0])
+        return np.concatenate(chunks)
+
+    def sync(self, symbol: str, interval: str, limit: int) -> np.ndarray:
+        """
+        Bring the store up to date and make sure it holds at least the last `limit` candles.
+        Only candles after the last stored one are fetched; the last stored candle is refetched
+        because it may still have been in progress, unless it is still the current candle and was
+        synced less than `max_age` seconds ago. When more than `limit` candles are missing at the
+        end, only the last `limit` are fetched and the skipped span is backfilled in the background.
+        Older history is fetched when `limit` asks for it.
+        :return: The stored klines.
+        """
+        step = interval_to_seconds(interval) * 1000
+        key = (symbol.upper(), interval)
+        stored = self.load(symbol, interval)
+        with self._lock:
+            synced_at = self._synced_at.get(key, 0)
+        if len(stored) >= limit and stored[-1, 0] + step > time.time() * 1000 \
+                and time.time() - synced_at < self.max_age:
+            return stored
+
+        synced_at = time.time()
+        if len(stored) == 0:
+            self._merge(symbol, interval, self._fetch_latest(symbol, interval, limit))
+        else:
+            last_time = int(stored[-1, 0])
+            if (time.time() * 1000 - last_time) // step + 1 > limit:
+                self._merge(symbol, interval, self._fetch_latest(symbol, interval, limit), last_time)
+                self._run_in_background(self.backfill, symbol, interval)
+            else:
+                # Incremental append of the missing tail
+                chunks, start_time = [], last_time
+                while True:
+                    rows = self._fetch(symbol, interval, start_time=start_time)
+                    if len(rows) == 0:
+                        break
+                    chunks.append(rows)
+                    if len(rows) < MAX_KLINES_PER_REQUEST:
+                        break
+                    start_time = int(rows[-1, 0]) + step
+                if chunks:
+                    self._merge(symbol, interval, np.concatenate(chunks), last_time)
+
+        # Extend the history backwards when more candles are requested than stored
+        stored = self.load(symbol, interval)
+        while 0 < len(stored) < limit:
+            older = self._fetch(
+                symbol, interval, end_time=int(stored[0, 0]) - step,
+                limit=min(limit - len(stored), MAX_KLINES_PER_REQUEST),
+            )
+            if len(older) == 0:
+                break
+            self._merge(symbol, interval, older)
+            stored = self.load(symbol, interval)
+        with self._lock:
+            self._synced_at[key] = synced_at
+        return stored
+
+    def find_gaps(self, symbol: str, interval: str) -> list[tuple[int, int]]:
+        """
+        Detect missing candles in the stored history.
+        :return: A list of (first missing open time, last missing open time) in milliseconds.
+        """
+        step = interval_to_seconds(interval) * 1000
+        open_times = self.load(symbol, interval)[:, 0]
+        gaps = np.nonzero(np.diff(open_times) > step)[0]
+        return [(int(open_times[i] + step), int(open_times[i + 1] - step)) for i in gaps]
+
+    def backfill(self, symbol: str, interval: str) -> int:
+        """
+        Fetch the candles missing inside the stored history.
+        :return: The number of candles added.
+        """
+        step = interval_to_seconds(interval) * 1000
+        fetched = []
+        for start, end in self.find_gaps(symbol, interval):
+            while start <= end:
+                rows = self._fetch(symbol, interval, start_time=start, end_time=end)
+                if len(rows) == 0:
+                    break
+                fetched.append(rows)
+                start = int(rows[-1, 0]) + step
+        if not fetched:
+            return 0
+        with self._file_lock(symbol, interval):
+            stored = self.load(symbol, interval)
+            before = len(stored)
+            self._rewrite(symbol, interval, np.concatenate([stored] + fetched))
+            return len(self.load(symbol, interval)) - before
+
+    def prefill(self, symbol: str, interval: str, start_time: int):
+        """Sync the history from `start_time` on in the background, so later requests find it stored."""
+        limit = int(time.time() * 1000 - start_time) // (interval_to_seconds(interval) * 1000) + 1
+        self._run_in_background(self.sync, symbol, interval, limit)
+
+    def covers(self, symbol: str, interval: str, start_time: int) -> bool:
+        """
+        Whether the stored history has every candle from `start_time` on, and is missing at most one
+        request worth of candles at the end, so a sync brings it up to date with a single request.
+        """
+        step = interval_to_seconds(interval) * 1000
+        stored = self.load(symbol, interval)
+        if len(stored) == 0 or stored[0, 0] > start_time:
+            return False
+        if (time.time() * 1000 - stored[-1, 0]) // step >= MAX_KLINES_PER_REQUEST:
+            return False
+        span = self.get_range(symbol, interval, start_time=start_time)
+        return len(span) > 0 and (span[-1, 0] - span[0, 0]) // step + 1 == len(span)
+
+    def get_range(self, symbol: str, interval: str, start_time: int = None, end_time: int = None) -> np.ndarray:
+        """
+        Return the stored klines with start_time <= open time <= end_time, as a view without copying.
+        :param start_time: Earliest open time in milliseconds (optional).
+        :param end_time: Latest open time in milliseconds (optional).
+        """
+        stored = self.load(symbol, interval)
+        open_times = stored[:, 0]
+        lo = 0 if start_time is None else np.searchsorted(open_times, start_time, side="left")
+        hi = len(stored) if end_time is None else np.searchsorted(open_times, end_time, side="right")
+        return stored[lo:hi]
+
+    def get_latest(self, symbol: str, interval: str, limit: int) -> np.ndarray:
+        """Sync the store and return a view of the last `limit` klines."""
+        return self.sync(symbol, interval, limit)[-limit:]
+
+    def get_resampled(self, symbol: str, interval: str, limit: int, base_interval: str = RESAMPLE_BASE_INTERVAL) -> np.ndarray:
+        """
+        Sync the base series and return the last `limit` klines of `interval` derived from it.
+        Meant for a base series that already `covers` the range, so every interval of a symbol is
+        served by a single exchange request. Results are cached per interval until the base series changes.
+        """
+        factor, remainder = divmod(interval_to_seconds(interval), interval_to_seconds(base_interval))
+        if factor < 1 or remainder:
+            raise ValueError(f"Cannot resample {base_interval} klines into {interval}")
+        base = self.sync(symbol, base_interval, (limit + 1) * factor)
+        key = (symbol.upper(), interval)
+        version = (len(base), tuple(base[-1])) if len(base) else (0,)
+        with self._lock:
+            cached = self._resampled.get(key)
+            if cached is None or cached[0] != version:
+                cached = (version, resample_klines(base, interval))
+                self._resampled[key] = cached
+        return cached[1][-limit:]
+
+
+_kline_store = None
+_kline_store_lock = threading.Lock()
+
+def get_kline_store() -> KlineStore:
+    """Get the shared kline store under `data_cache_dir`."""
+    global _kline_store
+    root = os.path.join(get_config()["data_cache_dir"], "klines")
+    with _kline_store_lock:
+        if _kline_store is None or _kline_store.root != root:
+            _kline_store = KlineStore(root, max_age=get_config()["data_cache_max_kline_ttl"])
+        return _kline_store
+
+def get_klines(symbol: str, interval: str, limit: int):
+    """
+    Get the last `limit` klines for a symbol, from the fastest available source:
+    the market stream when enabled, then the local kline store when enabled, then Binance REST.
+    :return: Klines as rows of [open_time, open, high, low, close, volume, ...], oldest first.
+    """
+    symbol = symbol.upper()
+    if not symbol.endswith("USDT") and not symbol.endswith("USDC"):
+        symbol += "USDT"
+
+    stream = get_market_stream(symbol, [interval])
+    klines = stream.get_klines(symbol, interval, limit) if stream is not None else None
+    if klines is not None:
+        return klines
+
+    config = get_config()
+    if config["kline_store_enabled"]:
+        try:
+            store = get_kline_store()
+            if config["kline_resample_enabled"] and interval != RESAMPLE_BASE_INTERVAL \
+                    and interval_to_seconds(interval) // 60 * (limit + 1) <= config["kline_resample_max_base"]:
+                # Only resample a stored base series; fetching one costs more requests than the interval
+                # itself, so a missing base series is filled in the background for the next requests
+                length = interval_to_seconds(interval) * 1000
+                start_time = (int(time.time() * 1000) // length - limit - 1) * length
+                if store.covers(symbol, RESAMPLE_BASE_INTERVAL, start_time):
+                    return store.get_resampled(symbol, interval, limit)
+                store.prefill(symbol, RESAMPLE_BASE_INTERVAL, start_time)
+            return store.get_latest(symbol, interval, limit)
+        except Exception as e:
+            print(f"Error reading {symbol} {interval} klines from the kline store: {e}")
+
+    return fetch_klines_from_binance(symbol, interval, limit)
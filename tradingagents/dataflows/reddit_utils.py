@@ -1,6 +1,7 @@
 
 import os
 import praw
+from .cache_utils import cached
 
 ticker_to_asset = {
     "BTC": "Bitcoin",
@@ -14,6 +15,7 @@ ticker_to_asset = {
     "AVAX": "Avalanche",
 }
 
+@cached("reddit", "search", ttl=900)
 def fetch_posts_from_reddit(
     symbol: str, subreddit_name: str, 
     sort: str = "hot", limit: int = 25
@@ -1,8 +1,12 @@
 
 import os
+import json
+import time
+import threading
+from concurrent.futures import Future
 from datetime import datetime, timedelta
 import requests
-from .utils import Singleton
+from .config import get_config
 
 def fetch_ta_from_taapi(symbol: str, indicator: str, interval: str = "15m", **params):
     """
@@ -28,22 +32,139 @@ def fetch_ta_from_taapi(symbol: str, indicator: str, interval: str = "15m", **pa
     response = requests.get(url, params=params)
     return response.text if response.status_code == 200 else None
 
-class TAAPIBulkUtils(metaclass=Singleton):
+class TokenBucket:
     """
-    Singleton class for fetching bulk technical analysis data from TAAPI.io.\n
+    Thread-safe token bucket.\n
+    Holds up to `capacity` tokens and refills them at `capacity` tokens per `period` seconds.
+    """
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.period = period
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.capacity / self.period)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_time = (1 - self._tokens) * self.period / self.capacity
+            time.sleep(wait_time)
+
+
+class TAAPIBulkScheduler:
+    """
+    Queues bulk constructs and posts them to TAAPI.io as fast as the plan's rate limit allows.\n
+    Constructs waiting in the queue are merged into one bulk request, up to `max_constructs` per request.
+    """
+
+    def __init__(self, requests_per_window: int, window: float, max_constructs: int):
+        self.bucket = TokenBucket(requests_per_window, window)
+        self.max_constructs = max_constructs
+        self._queue: list[tuple[dict, Future]] = []
+        self._condition = threading.Condition()
+        self._worker = None
+
+    def submit(self, construct: dict) -> Future:
+        """
+        Queue a bulk construct.
+        :return: A future resolving to { indicator: result } for the construct, or None on failure.
+        """
+        future = Future()
+        with self._condition:
+            self._queue.append((construct, future))
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="taapi-bulk-scheduler", daemon=True)
+                self._worker.start()
+            self._condition.notify()
+        return future
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._condition.wait_for(lambda: self._queue, timeout=60):
+                    self._worker = None
+                    return
+            self.bucket.acquire()
+            with self._condition:
+                batch = self._queue[:self.max_constructs]
+                del self._queue[:self.max_constructs]
+            try:
+                results = self._post(batch)
+            except Exception as e:
+                print(f"Error fetching bulk data: {e}")
+                results = [None] * len(batch)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def _post(self, batch: list[tuple[dict, Future]]) -> list:
+        api_key = os.getenv("TAAPI_API_KEY")
+        if not api_key:
+            return [None] * len(batch)
+
+        constructs = []
+        for index, (construct, _) in enumerate(batch):
+            constructs.append({
+                **construct,
+                # Tag every indicator with its construct so merged responses can be split again
+                "indicators": [{**params, "id": f"{index}_{params['indicator']}"} for params in construct["indicators"]],
+            })
+
+        response = requests.post("https://api.taapi.io/bulk", json={"secret": api_key, "construct": constructs})
+        if response.status_code != 200:
+            print(f"Error fetching bulk data: {response.status_code} - {response.text}")
+            return [None] * len(batch)
+
+        data = response.json()
+        if "data" not in data or not isinstance(data["data"], list):
+            return [None] * len(batch)
+
+        format_floats_in_dict = lambda d: {k: (round(v, 4) if isinstance(v, float) else v) for k, v in d.items()}
+        results = [{} for _ in batch]
+        for item in data["data"]:
+            index, _, _ = str(item.get("id", "")).partition("_")
+            index = int(index) if index.isdigit() and len(batch) > 1 else 0
+            results[index][item["indicator"]] = format_floats_in_dict(item["result"])
+        return results
+
+
+# The bulk indicator set, shared with the local engine in `indicator_utils`
+TREND_MOMENTUM_INDICATORS = [
+    "ema", "ichimoku", "supertrend", "donchianchannels",
+    "macd", "rsi", "stochrsi", "trix", "stc", "vwap"
+]
+VOLATILITY_STRUCTURE_INDICATORS = [
+    "atr", "bbands", "keltnerchannels", "chop", "engulfing",
+    "hammer", "morningstar", "eveningstar", "3whitesoldiers", "3blackcrows"
+]
+
+
+class TAAPIBulkUtils:
+    """
+    Fetches bulk technical analysis data from TAAPI.io.\n
+    Results are cached per (symbol, interval, indicator params) for `cache_ttl`, and all instances
+    share one rate-limited scheduler, so several symbols can be analyzed without mixing up their data.
+    Expired results are dropped, so long-running processes only keep the recent ones.
     :note: For free plan, the rate limit is 1 request per 15 seconds.
     """
 
-    trend_momentum_indicators = [
-        "ema", "ichimoku", "supertrend", "donchianchannels",
-        "macd", "rsi", "stochrsi", "trix", "stc", "vwap"
-    ]
-    volatility_structure_indicators = [
-        "atr", "bbands", "keltnerchannels", "chop", "engulfing",
-        "hammer", "morningstar", "eveningstar", "3whitesoldiers", "3blackcrows"
-    ]
+    trend_momentum_indicators = TREND_MOMENTUM_INDICATORS
+    volatility_structure_indicators = VOLATILITY_STRUCTURE_INDICATORS
     indicators = trend_momentum_indicators + volatility_structure_indicators
 
+    cache_ttl = timedelta(seconds=15)
+    _cache: dict[str, tuple[datetime, dict]] = {}
+    _pending: dict[str, Future] = {}
+    _lock = threading.RLock()
+    _scheduler: TAAPIBulkScheduler | None = None
+
     def __init__(self, symbol, bulk_interval: str = "15m", **kwargs):
         """
         Initialize the TAAPIUtils with a trading pair symbol and interval.
@@ -52,9 +173,7 @@ class TAAPIBulkUtils(metaclass=Singleton):
         :param bulk_interval: The time interval for the data (default is '15m'). Only for bulk data.
         :param kwargs: Additional parameters for the indicators.
         """
-        self.api_key = os.getenv("TAAPI_API_KEY")
         self.bulk_data = None
-        self.last_fetch_time = None
 
         symbol = symbol.upper()
         if not symbol.endswith("/USDT") and not symbol.endswith("/USDC"):
@@ -67,38 +186,58 @@ class TAAPIBulkUtils(metaclass=Singleton):
                 **({k.replace(f"{indicator}_", ""): v for k, v in kwargs.items() if k.startswith(f"{indicator}_")})
             } for indicator in self.indicators
         ]
-        
+        self.cache_key = json.dumps([self.symbol, self.bulk_interval, self.indicator_params], sort_keys=True)
+
+    @classmethod
+    def get_scheduler(cls) -> TAAPIBulkScheduler:
+        """Get the scheduler shared by every instance, created from the current config."""
+        with cls._lock:
+            if cls._scheduler is None:
+                config = get_config()
+                cls._scheduler = TAAPIBulkScheduler(
+                    config["taapi_requests_per_window"],
+                    config["taapi_rate_window"],
+                    config["taapi_max_constructs"],
+                )
+            return cls._scheduler
+
     def __fetch_bulk_ta_from_taapi(self):
-        if self.bulk_data is not None and self.last_fetch_time is not None and \
-            datetime.now() - self.last_fetch_time < timedelta(seconds=15):
-            return self.bulk_data
-        
-        if not self.api_key:
-            return None
+        if self.bulk_data is not None:
+            return
 
-        url = "https://api.taapi.io/bulk"
-        body = {
-            "secret": self.api_key,
-            "construct": {
-                "exchange": "binance",
-                "symbol": self.symbol,
-                "interval": self.bulk_interval,
-                "indicators": self.indicator_params
-            }
-        }
-        self.last_fetch_time = datetime.now()
-        response = requests.post(url, json=body)
-        if response.status_code == 200:
-            data = response.json()
-            if "data" in data and isinstance(data["data"], list):
-                format_floats_in_dict = lambda d: {k: (round(v, 4) if isinstance(v, float) else v) for k, v in d.items()}
-                self.bulk_data = {
-                    item["indicator"]: format_floats_in_dict(item["result"])
-                    for item in data["data"]
-                }
-        else:
-            print(f"Error fetching bulk data: {response.status_code} - {response.text}")
-            self.bulk_data = None
+        with self._lock:
+            cached = self._cache.get(self.cache_key)
+            if cached is not None:
+                if datetime.now() - cached[0] < self.cache_ttl:
+                    self.bulk_data = cached[1]
+                    return
+                del self._cache[self.cache_key]
+            # Identical requests already queued or in flight share one result
+            future = self._pending.get(self.cache_key)
+            if future is None:
+                future = self.get_scheduler().submit({
+                    "exchange": "binance",
+                    "symbol": self.symbol,
+                    "interval": self.bulk_interval,
+                    "indicators": self.indicator_params,
+                })
+                self._pending[self.cache_key] = future
+
+        data = future.result()
+        with self._lock:
+            if self._pending.get(self.cache_key) is future:
+                del self._pending[self.cache_key]
+                if data is not None:
+                    self._store(self.cache_key, data)
+        self.bulk_data = data
+
+    @classmethod
+    def _store(cls, cache_key: str, data: dict):
+        """Cache `data` and drop the results that expired meanwhile."""
+        now = datetime.now()
+        for key in [key for key, (fetched_at, _) in cls._cache.items() if now - fetched_at >= cls.cache_ttl]:
+            del cls._cache[key]
+        cls._cache[cache_key] = (now, data)
 
     def fetch_trend_momentum_indicators_from_taapi(self):
         """
@@ -118,4 +257,4 @@ class TAAPIBulkUtils(metaclass=Singleton):
         self.__fetch_bulk_ta_from_taapi()
         if self.bulk_data is None or not isinstance(self.bulk_data, dict):
             return None
-        return {indicator: self.bulk_data.get(indicator, {}) for indicator in self.volatility_structure_indicators}
\ No newline at end of file
+        return {indicator: self.bulk_data.get(indicator, {}) for indicator in self.volatility_structure_indicators}
@@ -52,3 +52,43 @@ def get_next_weekday(date):
         return next_weekday
     else:
         return date
+
+
+QUOTE_ASSETS = ("USDT", "USDC")
+
+def to_base_asset(symbol: str) -> str:
+    """
+    Normalize a symbol to its base asset, e.g. 'btc', 'BTCUSDT' and 'BTC/USDT' all give 'BTC'.
+    """
+    symbol = symbol.upper().strip().replace("/", "")
+    for quote in QUOTE_ASSETS:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return symbol[:-len(quote)]
+    return symbol
+
+
+def to_futures_symbol(symbol: str) -> str:
+    """
+    Normalize a symbol to a Binance futures pair, e.g. 'btc', 'BTCUSDT' and 'BTC/USDT' all give 'BTCUSDT'.
+    Pairs quoted in USDC are kept, anything else is quoted in USDT.
+    """
+    symbol = symbol.upper().strip().replace("/", "")
+    if any(symbol.endswith(quote) and len(symbol) > len(quote) for quote in QUOTE_ASSETS):
+        return symbol
+    return symbol + "USDT"
+
+
+INTERVAL_UNIT_SECONDS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+def interval_to_seconds(interval: str) -> int:
+    """
+    Convert a Binance-style interval string to its length in seconds.
+    Args:
+        interval (str): Interval such as '1m', '15m', '4h', '1d' or '1w'. Months ('1M') are not supported.
+    Returns:
+        int: Length of the interval in seconds.
+    """
+    unit = interval[-1]
+    if unit not in INTERVAL_UNIT_SECONDS or not interval[:-1].isdigit():
+        raise ValueError(f"Unsupported interval: {interval}")
+    return int(interval[:-1]) * INTERVAL_UNIT_SECONDS[unit]
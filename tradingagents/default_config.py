@@ -11,7 +11,8 @@ DEFAULT_CONFIG = {
         os.path.abspath(os.path.join(os.path.dirname(__file__), ".")), "reports"
     ),
     "send_report_to_email": False,
-    
+    "batch_concurrency": 4,  # analyses running at once in the batch runner (cli/batch.py)
+
     # LLM settings
     "llm_provider": "qwen",
     "deep_think_llm": "qwen-plus",
@@ -27,8 +28,76 @@ DEFAULT_CONFIG = {
     # Debate and discussion settings
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
+    "parallel_risk_debate": False,  # the risky, safe and neutral analysts answer the first risk round concurrently
+    "parallel_risk_later_rounds": False,  # also run the following risk rounds concurrently instead of in turn
+    "report_digest_enabled": True,  # condense the analyst reports once for the debaters, False gives them the full reports
+    "report_digest_max_chars": 1500,  # length of each condensed report, shorter reports are kept as they are
+    "debate_history_budget": 8000,  # characters of debate history in debater prompts before older turns are summarized, 0 disables
     "max_recur_limit": 200,
-    
+    "parallel_analysts": False,  # run the analysts concurrently in separate subgraphs instead of one after another
+
+    # Data fetching settings
+    "binance_concurrent_fetch": True,  # request all Binance endpoints at once in get_binance_data
+    "binance_fetch_timeout": 10,  # shared deadline (seconds) for the concurrent Binance requests
+    "indicator_source": "taapi",  # either 'taapi' or 'local' (computed from Binance klines)
+    "local_indicator_klines": 500,  # klines fetched for local indicator computation
+    "taapi_requests_per_window": 1,  # TAAPI plan limit, free plan allows 1 request per 15 seconds
+    "taapi_rate_window": 15,
+    "taapi_max_constructs": 1,  # constructs merged into one bulk request, depends on the TAAPI plan
+    "tool_single_flight": True,  # share identical in-flight tool calls and reuse their results within a propagate run
+    "prefetch_enabled": True,  # fetch the selected analysts' data feeds in parallel before the graph starts
+    "prefetch_intervals": ["15m", "1h"],  # guesses among the 5m-1d intervals the market analyst may pick, others are fetched on demand
+    "prefetch_workers": 8,
+
+    # Tool output settings
+    "tool_output_format": "csv",  # 'csv', 'delta' (changes from the previous row) or 'verbose' (one sentence per row)
+    "tool_output_precision": 7,  # significant digits of numbers in tables
+    "tool_output_budgets": {  # maximum characters per tool output, tables are downsampled to fit
+        "get_binance_data": 16000,
+    },
+
+    # Market data stream settings
+    "binance_stream_enabled": False,  # serve klines and order books from WebSocket streams instead of REST
+    "binance_stream_url": "wss://fstream.binance.com",
+    "binance_stream_kline_capacity": 500,  # klines kept in memory per symbol and interval
+    "binance_stream_max_staleness": 30,  # seconds without updates before falling back to REST
+    "kline_store_enabled": True,  # keep kline history on disk under data_cache_dir and fetch only new candles
+    "kline_resample_enabled": True,  # derive coarser intervals from the stored 1m series, which is filled in the background on first use
+    "kline_resample_max_base": 20000,  # 1m klines a resampled request may need, larger requests fetch the interval directly
+
+    # Response cache settings
+    "data_cache_backend": "sqlite",  # either 'sqlite' or 'none'
+    "data_cache_dir": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")), "dataflows/data_cache"
+    ),
+    "data_cache_max_bytes": 256 * 1024 * 1024,  # least recently used entries are evicted beyond this size
+    "data_cache_max_kline_ttl": 300,  # upper bound (seconds) for caching klines until their candle closes
+
+    # Memory settings
+    "memory_backend": "chromadb",  # either 'chromadb' or 'numpy' (built-in memory-mapped index, no chromadb needed)
+    "memory_ivf_threshold": 50000,  # entries before the numpy index scans only the nearest clusters, 0 always scans all
+    "memory_ivf_nprobe": 16,  # clusters scanned per query by the numpy index
+    "memory_persist": True,  # keep the agents' reflection memories on disk across restarts
+    "memory_dir": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")), "dataflows/data_cache/memory"
+    ),
+    "memory_prefetch_enabled": True,  # look up all memories concurrently once the analyst reports are final
+    "embedding_cache_size": 1024,  # memory embeddings kept in memory, shared by all memories
+    "embedding_cache_persist": True,  # also keep memory embeddings on disk under data_cache_dir
+    "embedding_batch_size": 10,  # texts per embeddings request, DashScope accepts at most 10
+
+    # LLM response cache settings
+    "llm_cache_mode": "off",  # 'off', 'read_through', 'record' (always call, save responses) or 'replay' (recorded responses only)
+    "llm_cache_path": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")), "dataflows/data_cache/llm_responses.sqlite3"
+    ),
+
+    # Checkpoint settings
+    "checkpoint_enabled": False,  # save the graph state after every node so a failed run can be resumed by its run id
+    "checkpoint_db": os.path.join(
+        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")), "dataflows/data_cache/checkpoints.sqlite"
+    ),  # requires langgraph-checkpoint-sqlite
+
     # Language settings
     "language": "zh",  # 支持 'zh' 或 'en'
 }
@@ -0,0 +1,48 @@
+# TradingAgents/graph/checkpoint.py
+
+import os
+import uuid
+import asyncio
+import sqlite3
+
+
+def new_run_id(asset_name, trade_date) -> str:
+    """Create a run id, used as the checkpoint thread id of one analysis."""
+    return f"{asset_name}-{trade_date}-{uuid.uuid4().hex[:8]}"
+
+
+def create_checkpointer(path: str):
+    """Create a SQLite checkpointer that saves the graph state after every step.
+
+    `SqliteSaver` only implements the sync interface, so the async methods run the
+    sync ones in a worker thread. The saver guards its connection with a lock.
+    """
+    try:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError as e:
+        raise ImportError(
+            "Checkpointing requires langgraph-checkpoint-sqlite, install it with `pip install langgraph-checkpoint-sqlite`"
+        ) from e
+
+    class ThreadedSqliteSaver(SqliteSaver):
+        async def aget_tuple(self, config):
+            return await asyncio.to_thread(self.get_tuple, config)
+
+        async def alist(self, config, *, filter=None, before=None, limit=None):
+            checkpoints = await asyncio.to_thread(
+                lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+            )
+            for checkpoint in checkpoints:
+                yield checkpoint
+
+        async def aput(self, config, checkpoint, metadata, new_versions):
+            return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+        async def aput_writes(self, config, writes, task_id, task_path=""):
+            return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+        async def adelete_thread(self, thread_id):
+            return await asyncio.to_thread(self.delete_thread, thread_id)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return ThreadedSqliteSaver(sqlite3.connect(path, check_same_thread=False))
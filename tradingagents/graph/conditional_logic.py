@@ -6,10 +6,11 @@ from tradingagents.agents.utils.agent_states import AgentState
 class ConditionalLogic:
     """Handles conditional logic for determining graph flow."""
 
-    def __init__(self, max_debate_rounds=1, max_risk_discuss_rounds=1):
+    def __init__(self, max_debate_rounds=1, max_risk_discuss_rounds=1, parallel_risk_later_rounds=False):
         """Initialize with configuration parameters."""
         self.max_debate_rounds = max_debate_rounds
         self.max_risk_discuss_rounds = max_risk_discuss_rounds
+        self.parallel_risk_later_rounds = parallel_risk_later_rounds
 
     def should_continue_market(self, state: AgentState):
         """Determine if market analysis should continue."""
@@ -65,3 +66,13 @@ class ConditionalLogic:
         if state["risk_debate_state"]["latest_speaker"].startswith("Safe"):
             return "Neutral Analyst"
         return "Risky Analyst"
+
+    def should_continue_risk_round(self, state: AgentState) -> str:
+        """Determine the next step after a parallel risk debate round."""
+        if (
+            state["risk_debate_state"]["count"] >= 3 * self.max_risk_discuss_rounds
+        ):
+            return "Risk Judge"
+        if self.parallel_risk_later_rounds:
+            return "Risk Round"
+        return "Risky Analyst"
@@ -0,0 +1,88 @@
+# TradingAgents/graph/prefetch.py
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Dict, List
+
+from tradingagents.agents.utils.agent_utils import Toolkit
+from tradingagents.dataflows.utils import to_base_asset, to_futures_symbol
+
+
+class Prefetcher:
+    """Warms the tool caches with the data each selected analyst is known to ask for."""
+
+    def __init__(self, toolkit: Toolkit, config: Dict):
+        """Initialize with the toolkit and the prefetch settings."""
+        self.toolkit = toolkit
+        self.intervals = config["prefetch_intervals"]
+        self.max_workers = config["prefetch_workers"]
+        # TAAPI requests are rate limited, and the market analyst makes its own indicator call,
+        # so indicators are only guessed ahead when that call cannot be delayed by the guesses
+        self.prefetch_indicators = (
+            config["indicator_source"] == "local" or config["taapi_requests_per_window"] > len(self.intervals)
+        )
+
+    def get_requests(self, asset_name: str, selected_analysts: List[str]) -> Dict[str, tuple]:
+        """
+        Tool calls to prefetch per analyst, with the arguments the analysts' prompts lead to.
+        Only plain data feeds are prefetched, LLM-backed search tools are left to the analysts,
+        and rate-limited TAAPI indicators only when the plan leaves room for the analyst's own call.
+        """
+        asset = to_base_asset(asset_name)
+        symbol = to_futures_symbol(asset_name)
+        toolkit = self.toolkit
+        requests = {
+            "market": [
+                *[(toolkit.get_binance_data, {"symbol": symbol, "interval": interval}) for interval in self.intervals],
+                *[
+                    (toolkit.get_taapi_bulk_indicators, {"symbol": asset, "interval": interval})
+                    for interval in (self.intervals if self.prefetch_indicators else [])
+                ],
+            ],
+            "social": [
+                (toolkit.get_binance_ohlcv, {"symbol": symbol}),
+                (toolkit.get_fear_and_greed_index, {}),
+                (toolkit.get_reddit_posts, {"symbol": asset}),
+            ],
+            "news": [
+                (toolkit.get_binance_ohlcv, {"symbol": symbol}),
+                (toolkit.get_blockbeats_news, {}),
+                (toolkit.get_coindesk_news, {"tickers": [asset]}),
+                (toolkit.get_coinstats_news, {}),
+            ],
+            "fundamentals": [
+                (toolkit.get_binance_ohlcv, {"symbol": symbol}),
+                (toolkit.get_coinstats_btc_dominance, {}),
+            ],
+        }
+        calls = {}
+        for analyst in selected_analysts:
+            for tool, args in requests.get(analyst, []):
+                calls[f"{tool.name}({', '.join(f'{k}={v}' for k, v in args.items())})"] = (tool, args)
+        return calls
+
+    def start(self, asset_name: str, selected_analysts: List[str]) -> Dict[str, Future]:
+        """
+        Fire the prefetch calls in the background and return immediately.
+        Results land in the response cache and, inside a tool run scope, in the tool memo,
+        so the analysts' identical calls are served from there or join the in-flight request.
+        """
+        calls = self.get_requests(asset_name, selected_analysts)
+        if not calls:
+            return {}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="prefetch")
+        # Run in the caller's context so results land in the memo of its tool run scope
+        futures = {
+            name: executor.submit(copy_context().run, self._invoke, name, tool, args)
+            for name, (tool, args) in calls.items()
+        }
+        executor.shutdown(wait=False)
+        return futures
+
+    @staticmethod
+    def _invoke(name: str, tool, args: Dict):
+        try:
+            return tool.invoke(args)
+        except Exception as e:
+            print(f"Error prefetching {name}: {e}")
+            return None
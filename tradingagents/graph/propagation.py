@@ -27,11 +27,13 @@ class Propagator:
             "trade_date": str(trade_date),
             "investment_preferences": str(investment_preferences),
             "investment_debate_state": InvestDebateState(
-                {"history": "", "current_response": "", "count": 0}
+                {"history": "", "digest": "", "digest_offset": 0, "current_response": "", "count": 0}
             ),
             "risk_debate_state": RiskDebateState(
                 {
                     "history": "",
+                    "digest": "",
+                    "digest_offset": 0,
                     "current_risky_response": "",
                     "current_safe_response": "",
                     "current_neutral_response": "",
@@ -45,9 +47,15 @@ class Propagator:
             "external_reports": external_reports,
         }
 
-    def get_graph_args(self) -> Dict[str, Any]:
-        """Get arguments for the graph invocation."""
+    def get_graph_args(self, run_id: str = None) -> Dict[str, Any]:
+        """Get arguments for the graph invocation.
+
+        `run_id` selects the checkpoint thread when the graph has a checkpointer.
+        """
+        config = {"recursion_limit": self.max_recur_limit}
+        if run_id:
+            config["configurable"] = {"thread_id": run_id}
         return {
             "stream_mode": "values",
-            "config": {"recursion_limit": self.max_recur_limit},
+            "config": config,
         }
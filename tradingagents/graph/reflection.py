@@ -1,9 +1,20 @@
 # TradingAgents/graph/reflection.py
 
 from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
 from langchain_openai import ChatOpenAI
 from tradingagents.i18n import get_prompts
 
+# Report each component produced, by the name of its memory
+REFLECTION_COMPONENTS = {
+    "bull": lambda state: state["investment_debate_state"]["bull_history"],
+    "bear": lambda state: state["investment_debate_state"]["bear_history"],
+    "trader": lambda state: state["trader_investment_plan"],
+    "invest_judge": lambda state: state["investment_debate_state"]["judge_decision"],
+    "risk_manager": lambda state: state["risk_debate_state"]["judge_decision"],
+}
+
+
 class Reflector:
     """Handles reflection on decisions and updating memory."""
 
@@ -29,7 +40,11 @@ class Reflector:
         self, component_type: str, report: str, situation: str, returns_losses
     ) -> str:
         """Generate reflection for a component."""
-        messages = [
+        result = self.quick_thinking_llm.invoke(self._get_messages(report, situation, returns_losses)).content
+        return result
+
+    def _get_messages(self, report: str, situation: str, returns_losses) -> list:
+        return [
             ("system", self.reflection_system_prompt),
             (
                 "human",
@@ -40,8 +55,28 @@ class Reflector:
             ),
         ]
 
-        result = self.quick_thinking_llm.invoke(messages).content
-        return result
+    def reflect_all(self, current_state, returns_losses, memories: Dict[str, Any]):
+        """Reflect on every component at once and update their memories.
+
+        The reflections are requested as one concurrent batch, while the situation, which is
+        the same for all memories, is embedded once alongside them.
+
+        Args:
+            memories: Memory of each component, keyed like `REFLECTION_COMPONENTS`
+        """
+        situation = self._extract_current_situation(current_state)
+        names = list(memories)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            embedding = executor.submit(memories[names[0]].get_embedding, situation)
+            results = self.quick_thinking_llm.batch([
+                self._get_messages(REFLECTION_COMPONENTS[name](current_state), situation, returns_losses)
+                for name in names
+            ])
+            embedding = embedding.result()
+
+        for name, result in zip(names, results):
+            memories[name].add_situations([(situation, result.content)], embeddings=[embedding])
 
     def reflect_bull_researcher(self, current_state, returns_losses, bull_memory):
         """Reflect on bull researcher's analysis and update memory."""
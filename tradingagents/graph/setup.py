@@ -1,6 +1,7 @@
 # TradingAgents/graph/setup.py
 
 from typing import Dict, Any
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
@@ -8,10 +9,19 @@ from langgraph.prebuilt import ToolNode
 from tradingagents.agents import *
 from tradingagents.agents.utils.agent_states import AgentState
 from tradingagents.agents.utils.agent_utils import Toolkit
+from tradingagents.agents.utils.debate_digest import with_history_digest
 
 from .conditional_logic import ConditionalLogic
 
 
+ANALYST_REPORT_KEYS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+}
+
+
 class GraphSetup:
     """Handles the setup and configuration of the agent graph."""
 
@@ -40,8 +50,41 @@ class GraphSetup:
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
 
+    def _create_analyst_subgraph(self, analyst_type, analyst_node, tool_node):
+        """Compile one analyst and its tools into a subgraph with a private message channel.
+
+        The returned node runs the analyst's tool loop on its own copy of the messages
+        and only writes the analyst's report back, so analysts can run concurrently.
+        """
+        analyst_name = f"{analyst_type.capitalize()} Analyst"
+        tools_name = f"tools_{analyst_type}"
+        report_key = ANALYST_REPORT_KEYS[analyst_type]
+
+        subgraph = StateGraph(AgentState)
+        subgraph.add_node(analyst_name, analyst_node)
+        subgraph.add_node(tools_name, tool_node)
+        subgraph.add_edge(START, analyst_name)
+        subgraph.add_conditional_edges(
+            analyst_name,
+            getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+            {tools_name: tools_name, f"Msg Clear {analyst_type.capitalize()}": END},
+        )
+        subgraph.add_edge(tools_name, analyst_name)
+        subgraph = subgraph.compile()
+
+        def run_analyst(state, config: RunnableConfig):
+            result = subgraph.invoke(state, config)
+            return {report_key: result[report_key]}
+
+        async def arun_analyst(state, config: RunnableConfig):
+            result = await subgraph.ainvoke(state, config)
+            return {report_key: result[report_key]}
+
+        return RunnableLambda(run_analyst, afunc=arun_analyst)
+
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"]
+        self, selected_analysts=["market", "social", "news", "fundamentals"], parallel_analysts=False,
+        parallel_risk_debate=False, checkpointer=None, report_digest=False, memory_prefetch=False,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -51,6 +94,20 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            parallel_analysts (bool): Run the analysts concurrently, each in its own subgraph,
+                and join them before the Bull Researcher. Their tool messages stay inside the
+                subgraphs. Otherwise the analysts run in sequence on the shared messages.
+            parallel_risk_debate (bool): Start the risk debate with a round where the risky, safe
+                and neutral analysts answer concurrently. Whether later rounds are parallel too
+                is decided by the conditional logic.
+            checkpointer: Saves the state after every step so an interrupted run can be
+                resumed by its thread id. None disables checkpointing.
+            report_digest (bool): Condense the analyst reports once in a Report Digest node
+                before the Bull Researcher, and give the debaters the digest instead of the
+                full reports.
+            memory_prefetch (bool): Look up the memories of the research and risk teams
+                concurrently in a Memory Prefetch node, alongside the Report Digest, instead
+                of in each agent before it prompts its LLM.
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
@@ -95,6 +152,16 @@ class GraphSetup:
         bear_researcher_node = create_bear_researcher(
             self.quick_thinking_llm, self.bear_memory
         )
+        # Debate turns are compacted into a digest once the history outgrows its budget,
+        # except after the last turn since the judges read the full history
+        max_invest_turns = 2 * self.conditional_logic.max_debate_rounds
+        max_risk_turns = 3 * self.conditional_logic.max_risk_discuss_rounds
+        bull_researcher_node = with_history_digest(
+            bull_researcher_node, self.quick_thinking_llm, "investment_debate_state", max_invest_turns
+        )
+        bear_researcher_node = with_history_digest(
+            bear_researcher_node, self.quick_thinking_llm, "investment_debate_state", max_invest_turns
+        )
         research_manager_node = create_research_manager(
             self.deep_thinking_llm, self.invest_judge_memory
         )
@@ -113,6 +180,12 @@ class GraphSetup:
 
         # Add analyst nodes to the graph
         for analyst_type, node in analyst_nodes.items():
+            if parallel_analysts:
+                workflow.add_node(
+                    f"{analyst_type.capitalize()} Analyst",
+                    self._create_analyst_subgraph(analyst_type, node, tool_nodes[analyst_type]),
+                )
+                continue
             workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
             workflow.add_node(
                 f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
@@ -120,42 +193,77 @@ class GraphSetup:
             workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
 
         # Add other nodes
+        if report_digest:
+            workflow.add_node("Report Digest", create_report_digest(self.quick_thinking_llm))
+        if memory_prefetch:
+            workflow.add_node("Memory Prefetch", create_memory_prefetch({
+                "bull": self.bull_memory,
+                "bear": self.bear_memory,
+                "trader": self.trader_memory,
+                "invest_judge": self.invest_judge_memory,
+                "risk_manager": self.risk_manager_memory,
+            }))
         workflow.add_node("Bull Researcher", bull_researcher_node)
         workflow.add_node("Bear Researcher", bear_researcher_node)
         workflow.add_node("Research Manager", research_manager_node)
         workflow.add_node("Trader", trader_node)
-        workflow.add_node("Risky Analyst", risky_analyst)
-        workflow.add_node("Neutral Analyst", neutral_analyst)
-        workflow.add_node("Safe Analyst", safe_analyst)
+        for name, node in [
+            ("Risky Analyst", risky_analyst), ("Neutral Analyst", neutral_analyst), ("Safe Analyst", safe_analyst)
+        ]:
+            workflow.add_node(
+                name, with_history_digest(node, self.quick_thinking_llm, "risk_debate_state", max_risk_turns)
+            )
         workflow.add_node("Risk Judge", risk_manager_node)
+        if parallel_risk_debate:
+            workflow.add_node(
+                "Risk Round",
+                create_parallel_risk_round(
+                    risky_analyst, safe_analyst, neutral_analyst, self.quick_thinking_llm, max_risk_turns
+                ),
+            )
 
         # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
+        # Nodes preparing the research team, which run concurrently before the Bull Researcher
+        research_entries = [
+            name for name, enabled in [("Report Digest", report_digest), ("Memory Prefetch", memory_prefetch)] if enabled
+        ] or ["Bull Researcher"]
+        if parallel_analysts:
+            # Fan out to every analyst and join before the research team
+            analyst_names = [f"{analyst_type.capitalize()} Analyst" for analyst_type in selected_analysts]
+            for analyst_name in analyst_names:
+                workflow.add_edge(START, analyst_name)
+            for research_entry in research_entries:
+                workflow.add_edge(analyst_names, research_entry)
+        else:
+            # Start with the first analyst
+            first_analyst = selected_analysts[0]
+            workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
 
-        # Connect analysts in sequence
-        for i, analyst_type in enumerate(selected_analysts):
-            current_analyst = f"{analyst_type.capitalize()} Analyst"
-            current_tools = f"tools_{analyst_type}"
-            current_clear = f"Msg Clear {analyst_type.capitalize()}"
+            # Connect analysts in sequence
+            for i, analyst_type in enumerate(selected_analysts):
+                current_analyst = f"{analyst_type.capitalize()} Analyst"
+                current_tools = f"tools_{analyst_type}"
+                current_clear = f"Msg Clear {analyst_type.capitalize()}"
 
-            # Add conditional edges for current analyst
-            workflow.add_conditional_edges(
-                current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
-                [current_tools, current_clear],
-            )
-            workflow.add_edge(current_tools, current_analyst)
+                # Add conditional edges for current analyst
+                workflow.add_conditional_edges(
+                    current_analyst,
+                    getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+                    [current_tools, current_clear],
+                )
+                workflow.add_edge(current_tools, current_analyst)
 
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, "Bull Researcher")
+                # Connect to next analyst or to the research team if this is the last analyst
+                if i < len(selected_analysts) - 1:
+                    next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
+                    workflow.add_edge(current_clear, next_analyst)
+                else:
+                    for research_entry in research_entries:
+                        workflow.add_edge(current_clear, research_entry)
 
         # Add remaining edges
+        if research_entries != ["Bull Researcher"]:
+            workflow.add_edge(research_entries, "Bull Researcher")
         workflow.add_conditional_edges(
             "Bull Researcher",
             self.conditional_logic.should_continue_debate,
@@ -173,7 +281,19 @@ class GraphSetup:
             },
         )
         workflow.add_edge("Research Manager", "Trader")
-        workflow.add_edge("Trader", "Risky Analyst")
+        if parallel_risk_debate:
+            workflow.add_edge("Trader", "Risk Round")
+            workflow.add_conditional_edges(
+                "Risk Round",
+                self.conditional_logic.should_continue_risk_round,
+                {
+                    "Risk Round": "Risk Round",
+                    "Risky Analyst": "Risky Analyst",
+                    "Risk Judge": "Risk Judge",
+                },
+            )
+        else:
+            workflow.add_edge("Trader", "Risky Analyst")
         workflow.add_conditional_edges(
             "Risky Analyst",
             self.conditional_logic.should_continue_risk_analysis,
@@ -202,4 +322,4 @@ class GraphSetup:
         workflow.add_edge("Risk Judge", END)
 
         # Compile and return
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
@@ -1,8 +1,36 @@
 # TradingAgents/graph/signal_processing.py
 
+import re
+from typing import Optional
 from langchain_openai import ChatOpenAI
 from tradingagents.i18n import get_prompts
 
+DECISIONS = {
+    "BUY": "BUY", "HOLD": "HOLD", "SELL": "SELL",
+    "买入": "BUY", "持有": "HOLD", "卖出": "SELL",
+}
+# Decision markers the prompts ask for, in English and Chinese, allowing markdown emphasis
+DECISION_PATTERN = re.compile(
+    r"(?:FINAL\s+TRANSACTION\s+PROPOSAL|最终投资建议)\s*[:：]?\s*[*_`\s]*(BUY|HOLD|SELL|买入|持有|卖出)(?![A-Za-z])",
+    re.IGNORECASE,
+)
+
+
+def extract_decision(full_signal: str) -> Optional[str]:
+    """
+    Extract the decision from the last decision marker in the signal.
+
+    Returns BUY, SELL or HOLD, or None when the signal has no marker or a template
+    placeholder like "BUY/HOLD/SELL".
+    """
+    matches = list(DECISION_PATTERN.finditer(full_signal))
+    if not matches:
+        return None
+    last = matches[-1]
+    if full_signal[last.end():last.end() + 1] == "/":
+        return None
+    return DECISIONS[last.group(1).upper()]
+
 class SignalProcessor:
     """Processes trading signals to extract actionable decisions."""
 
@@ -20,12 +48,24 @@ class SignalProcessor:
         Returns:
             Extracted decision (BUY, SELL, or HOLD)
         """
-        messages = [
+        # The decision marker is parsed directly, the LLM is only asked when it is missing
+        decision = extract_decision(full_signal)
+        if decision is not None:
+            return decision
+        return self.quick_thinking_llm.invoke(self._get_messages(full_signal)).content
+
+    async def aprocess_signal(self, full_signal: str) -> str:
+        """Async version of `process_signal`."""
+        decision = extract_decision(full_signal)
+        if decision is not None:
+            return decision
+        return (await self.quick_thinking_llm.ainvoke(self._get_messages(full_signal))).content
+
+    def _get_messages(self, full_signal: str) -> list:
+        return [
             (
                 "system",
                 get_prompts("signal_processor", "system_message"),
             ),
             ("human", full_signal),
         ]
-
-        return self.quick_thinking_llm.invoke(messages).content
@@ -1,6 +1,8 @@
 # TradingAgents/graph/trading_graph.py
 
 import os
+import asyncio
+import threading
 from pathlib import Path
 import json
 from datetime import date
@@ -15,6 +17,8 @@ from langgraph.prebuilt import ToolNode
 from tradingagents.agents import *
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.agents.utils.single_flight import tool_run_scope
+from tradingagents.agents.utils.llm_cache import create_llm_cache
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
@@ -27,6 +31,8 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .prefetch import Prefetcher
+from .checkpoint import create_checkpointer, new_run_id
 
 
 class TradingAgentsGraph:
@@ -52,24 +58,22 @@ class TradingAgentsGraph:
         set_config(self.config)
 
         # Create necessary directories
-        os.makedirs(
-            os.path.join(self.config["project_dir"], "dataflows/data_cache"),
-            exist_ok=True,
-        )
+        os.makedirs(self.config["data_cache_dir"], exist_ok=True)
 
-        # Initialize LLMs
+        # Initialize LLMs, sharing one response cache
+        llm_cache = create_llm_cache(self.config)
         if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
-            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], max_completion_tokens=self.config["max_tokens"])
-            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], max_completion_tokens=self.config["max_tokens"])
+            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], cache=llm_cache, base_url=self.config["backend_url"], max_completion_tokens=self.config["max_tokens"])
+            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], cache=llm_cache, base_url=self.config["backend_url"], max_completion_tokens=self.config["max_tokens"])
         elif self.config["llm_provider"].lower() == "qwen":
-            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], api_key=os.getenv("DASHSCOPE_API_KEY"), max_completion_tokens=self.config["max_tokens"])
-            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], api_key=os.getenv("DASHSCOPE_API_KEY"), max_completion_tokens=self.config["max_tokens"])
+            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], cache=llm_cache, base_url=self.config["backend_url"], api_key=os.getenv("DASHSCOPE_API_KEY"), max_completion_tokens=self.config["max_tokens"])
+            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], cache=llm_cache, base_url=self.config["backend_url"], api_key=os.getenv("DASHSCOPE_API_KEY"), max_completion_tokens=self.config["max_tokens"])
         elif self.config["llm_provider"].lower() == "anthropic":
-            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], max_tokens_to_sample=self.config["max_tokens"])
-            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], max_tokens_to_sample=self.config["max_tokens"])
+            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], cache=llm_cache, base_url=self.config["backend_url"], max_tokens_to_sample=self.config["max_tokens"])
+            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], cache=llm_cache, base_url=self.config["backend_url"], max_tokens_to_sample=self.config["max_tokens"])
         elif self.config["llm_provider"].lower() == "google":
-            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"])
-            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
+            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"], cache=llm_cache)
+            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"], cache=llm_cache)
         elif self.config["llm_provider"].lower() == "gitee":
             class GiteeChatOpenAI(ChatOpenAI):
                 def _get_request_payload(self, input_, *, stop=None, **kwargs):
@@ -80,8 +84,8 @@ class TradingAgentsGraph:
                             if (msg.get("role") == "assistant" and "tool_calls" in msg and ("content" not in msg or msg["content"] is None)):
                                 msg["content"] = ""
                     return payload
-            self.deep_thinking_llm = GiteeChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], api_key=os.getenv("GITEE_API_KEY"), max_completion_tokens=self.config["max_tokens"])
-            self.quick_thinking_llm = GiteeChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], api_key=os.getenv("GITEE_API_KEY"), max_completion_tokens=self.config["max_tokens"])      
+            self.deep_thinking_llm = GiteeChatOpenAI(model=self.config["deep_think_llm"], cache=llm_cache, base_url=self.config["backend_url"], api_key=os.getenv("GITEE_API_KEY"), max_completion_tokens=self.config["max_tokens"])
+            self.quick_thinking_llm = GiteeChatOpenAI(model=self.config["quick_think_llm"], cache=llm_cache, base_url=self.config["backend_url"], api_key=os.getenv("GITEE_API_KEY"), max_completion_tokens=self.config["max_tokens"])      
         else:
             raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
         
@@ -98,7 +102,11 @@ class TradingAgentsGraph:
         self.tool_nodes = self._create_tool_nodes()
 
         # Initialize components
-        self.conditional_logic = ConditionalLogic()
+        self.conditional_logic = ConditionalLogic(
+            self.config["max_debate_rounds"],
+            self.config["max_risk_discuss_rounds"],
+            self.config["parallel_risk_later_rounds"],
+        )
         self.graph_setup = GraphSetup(
             self.quick_thinking_llm,
             self.deep_thinking_llm,
@@ -113,16 +121,25 @@ class TradingAgentsGraph:
         )
 
         self.propagator = Propagator()
+        self.prefetcher = Prefetcher(self.toolkit, self.config)
         self.reflector = Reflector(self.quick_thinking_llm)
         self.signal_processor = SignalProcessor(self.quick_thinking_llm)
 
         # State tracking
         self.curr_state = None
         self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
+        self.log_states_dict = {}  # ticker to date to full state dict
+        self._log_lock = threading.Lock()
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.selected_analysts = selected_analysts
+        self.checkpointer = (
+            create_checkpointer(self.config["checkpoint_db"]) if self.config["checkpoint_enabled"] else None
+        )
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts, self.config["parallel_analysts"], self.config["parallel_risk_debate"],
+            self.checkpointer, self.config["report_digest_enabled"], self.config["memory_prefetch_enabled"],
+        )
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources."""
@@ -159,44 +176,163 @@ class TradingAgentsGraph:
             ),
         }
 
-    def propagate(self, asset_name, trade_date):
-        """Run the trading agents graph for a asset on a specific date."""
+    def graph_args(self, asset_name=None, trade_date=None, run_id=None):
+        """Get the graph invocation arguments for a run.
 
-        self.ticker = asset_name
+        With checkpointing enabled, every run needs a run id to save its state under.
+        A new one is created unless `run_id` is given.
+
+        Returns:
+            The run id (None without checkpointing) and the arguments.
+        """
+        if self.checkpointer is not None:
+            run_id = run_id or new_run_id(asset_name, trade_date)
+        else:
+            run_id = None
+        return run_id, self.propagator.get_graph_args(run_id)
+
+    def propagate(self, asset_name, trade_date, run_id=None):
+        """Run the trading agents graph for a asset on a specific date."""
 
         # Initialize state
         init_agent_state = self.propagator.create_initial_state(
             asset_name, trade_date
         )
-        args = self.propagator.get_graph_args()
+        _, args = self.graph_args(asset_name, trade_date, run_id)
+
+        # Identical tool calls from different analysts share one fetch during the run
+        with tool_run_scope():
+            self.prefetch(asset_name)
+            final_state = self._run_graph(init_agent_state, args)
 
+        return self._finish_run(final_state)
+
+    def resume(self, run_id):
+        """Continue a checkpointed run from the last completed node.
+
+        Returns the same result as `propagate`. A run that already finished is not
+        executed again.
+        """
+        args = self._resume_args(run_id)
+        with tool_run_scope():
+            final_state = self._run_graph(None, args)
+        return self._finish_run(final_state)
+
+    def _resume_args(self, run_id):
+        """Get the graph arguments of a checkpointed run, checking that it exists."""
+        if self.checkpointer is None:
+            raise ValueError("Resuming a run requires `checkpoint_enabled` in the config")
+        _, args = self.graph_args(run_id=run_id)
+        if not self.checkpointer.get_tuple(args["config"]):
+            raise ValueError(f"No checkpoint found for run {run_id}")
+        return args
+
+    def _run_graph(self, graph_input, args):
+        """Run the graph to the end, from a new state or from the last checkpoint if `graph_input` is None."""
         if self.debug:
             # Debug mode with tracing
             trace = []
-            for chunk in self.graph.stream(init_agent_state, **args):
+            for chunk in self.graph.stream(graph_input, **args):
                 if len(chunk["messages"]) == 0:
                     pass
                 else:
                     chunk["messages"][-1].pretty_print()
                     trace.append(chunk)
 
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
+            return trace[-1]
+        # Standard mode without tracing
+        return self.graph.invoke(graph_input, **args)
+
+    def _finish_run(self, final_state):
+        """Store and log the final state and return it with the processed signal."""
+        self.ticker = final_state["asset_of_interest"]
 
         # Store current state for reflection
         self.curr_state = final_state
 
         # Log state
-        self._log_state(trade_date, final_state)
+        self._log_state(final_state)
 
         # Return decision and processed signal
         return final_state, self.process_signal(final_state["final_trade_decision"])
 
-    def _log_state(self, trade_date, final_state):
-        """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+    def stream(self, asset_name, trade_date, investment_preferences="", external_reports=[], run_id=None):
+        """Stream the state after each step of the graph for a asset on a specific date.
+
+        Identical tool calls from different analysts share one fetch while the stream is consumed,
+        including the prefetched ones. Pass the `run_id` from `graph_args` to know it before the run starts.
+        """
+        init_agent_state = self.propagator.create_initial_state(
+            asset_name, trade_date, investment_preferences, external_reports
+        )
+        _, args = self.graph_args(asset_name, trade_date, run_id)
+
+        with tool_run_scope():
+            self.prefetch(asset_name)
+            yield from self.graph.stream(init_agent_state, **args)
+
+    async def astream(self, asset_name, trade_date, investment_preferences="", external_reports=[], run_id=None):
+        """Stream the state after each step of the graph for a asset on a specific date.
+
+        Agent nodes call their LLMs with `ainvoke`, and the news, Fear and Greed, dominance
+        and search LLM tools use async HTTP, so a single event loop can drive many analyses
+        at once. The Binance, TAAPI, Reddit and Google News tools have no async variant and
+        still occupy an executor thread while they fetch. Concurrent runs need their own
+        `run_id` when checkpointing is enabled.
+        """
+        init_agent_state = self.propagator.create_initial_state(
+            asset_name, trade_date, investment_preferences, external_reports
+        )
+        _, args = self.graph_args(asset_name, trade_date, run_id)
+
+        with tool_run_scope():
+            self.prefetch(asset_name)
+            async for chunk in self.graph.astream(init_agent_state, **args):
+                yield chunk
+
+    async def aresume_stream(self, run_id):
+        """Stream the state after each remaining step of a checkpointed run."""
+        args = await asyncio.to_thread(self._resume_args, run_id)
+        with tool_run_scope():
+            async for chunk in self.graph.astream(None, **args):
+                yield chunk
+
+    async def apropagate(self, asset_name, trade_date, run_id=None):
+        """Async version of `propagate`.
+
+        Concurrent runs on the same graph share in-flight tool calls but each keeps its own
+        tool memo, while `curr_state`, used by `reflect_and_remember`, holds the run that
+        finished last.
+        """
+        return await self._afinish_run(self.astream(asset_name, trade_date, run_id=run_id))
+
+    async def aresume(self, run_id):
+        """Async version of `resume`."""
+        return await self._afinish_run(self.aresume_stream(run_id))
+
+    async def _afinish_run(self, stream):
+        final_state = None
+        async for chunk in stream:
+            if self.debug and len(chunk["messages"]) > 0:
+                chunk["messages"][-1].pretty_print()
+            final_state = chunk
+
+        self.ticker = final_state["asset_of_interest"]
+        self.curr_state = final_state
+        await asyncio.to_thread(self._log_state, final_state)
+
+        return final_state, await self.aprocess_signal(final_state["final_trade_decision"])
+
+    def prefetch(self, asset_name):
+        """Start fetching the data the selected analysts need in the background, if enabled."""
+        if self.config["prefetch_enabled"]:
+            return self.prefetcher.start(asset_name, self.selected_analysts)
+        return {}
+
+    def _log_state(self, final_state):
+        """Log the final state to the JSON file of its asset."""
+        ticker = final_state["asset_of_interest"]
+        entry = {
             "asset_of_interest": final_state["asset_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
@@ -226,34 +362,38 @@ class TradingAgentsGraph:
             "final_trade_decision": final_state["final_trade_decision"],
         }
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
-        directory.mkdir(parents=True, exist_ok=True)
+        # Save to file, concurrent runs may finish at the same time
+        with self._log_lock:
+            states = self.log_states_dict.setdefault(ticker, {})
+            states[str(final_state["trade_date"])] = entry
 
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log.json",
-            "w",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+            directory = Path(f"eval_results/{ticker}/TradingAgentsStrategy_logs/")
+            directory.mkdir(parents=True, exist_ok=True)
+
+            with open(
+                f"eval_results/{ticker}/TradingAgentsStrategy_logs/full_states_log.json",
+                "w",
+            ) as f:
+                json.dump(states, f, indent=4)
 
     def reflect_and_remember(self, returns_losses):
         """Reflect on decisions and update memory based on returns."""
-        self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
-        )
-        self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
-        )
-        self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
-        )
-        self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
-        )
-        self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
+        self.reflector.reflect_all(
+            self.curr_state,
+            returns_losses,
+            {
+                "bull": self.bull_memory,
+                "bear": self.bear_memory,
+                "trader": self.trader_memory,
+                "invest_judge": self.invest_judge_memory,
+                "risk_manager": self.risk_manager_memory,
+            },
         )
 
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal)
+
+    async def aprocess_signal(self, full_signal):
+        """Async version of `process_signal`."""
+        return await self.signal_processor.aprocess_signal(full_signal)
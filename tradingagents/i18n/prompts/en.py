@@ -118,6 +118,7 @@ Deliverables:
 - A clear and actionable recommendation: Buy, Sell, or Hold.
 - Detailed reasoning anchored in the debate and past reflections.
 - Provide **suggested entry price, support level, resistance level, take-profit price, and stop-loss price** based on the user's investment preferences and the analysts' reports.
+- Conclude your response with 'FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL**' to confirm your recommendation.
 
 **Analysis from External Experts:**
 {external_reports}
@@ -270,6 +271,13 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
 """
         #endregion
     },
+    "report_digest": {
+        "system_message": "Condense the analyst report below for the research and risk teams. Keep its conclusion and stance (bullish, bearish or neutral), the key signals and evidence, every price level, indicator value and date it relies on, and the risks it flags; drop methodology, repetition and formatting. Use short bullet points and reply with the digest only, in at most {max_chars} characters.\n\nReport:\n{report}"
+    },
+    "debate_digest": {
+        "system_message": "You keep a running summary of a debate between analysts. Update the current summary with the new turns below. Keep every distinct argument, figure and price level, which side made it, and any rebuttals or concessions; drop repetition and rhetoric. Reply with the updated summary only, in at most {max_chars} characters.\n\nCurrent summary:\n{digest}\n\nNew turns:{turns}",
+        "context": "Summary of the earlier turns:\n{digest}\n\nRecent turns:{recent}"
+    },
     "signal_processor": {
         "system_message": "You are an efficient assistant designed to analyze paragraphs or financial reports provided by a group of analysts. Your task is to extract the investment decision: SELL, BUY, or HOLD. Provide only the extracted decision (SELL, BUY, or HOLD) as your output, without adding any additional text or information."
     },
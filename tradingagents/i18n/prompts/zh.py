@@ -113,6 +113,7 @@ PROMPTS = {
 - 明确的投资建议：Buy / Sell / Hold
 - 基于辩论与反思的详细理由
 - 根据用户的投资偏好和分析师的报告，给出**建议开仓价格、支撑位、阻力位、止盈价和止损价**
+- 以 “最终投资建议：BUY/HOLD/SELL” 结尾，明确表达立场
 - 务必不超过{max_tokens}tokens
 - 最大标题应从H3开始，避免使用H1和H2标题；也不要输出Emoji表情符号
 
@@ -242,6 +243,13 @@ Here is the current conversation history: {history} Here is the last response fr
 你还将获得市场情况的客观描述，包括价格走势、指标变化、新闻与情绪等背景信息。"""
         #endregion
     },
+    "report_digest": {
+        "system_message": "请为研究团队和风控团队压缩下面的分析师报告。保留结论与立场（看涨、看跌或中性）、关键信号与依据、报告用到的所有价位、指标数值和日期，以及报告提示的风险；去掉方法说明、重复内容和格式。使用简短的要点列表，只输出摘要，不超过{max_chars}个字符。\n\n报告：\n{report}"
+    },
+    "debate_digest": {
+        "system_message": "你负责维护一场分析师辩论的滚动摘要。请将下面的新发言合并进当前摘要：保留每个不同的论点、数据和价位，注明由哪一方提出，以及反驳与让步；去掉重复和修辞。只输出更新后的摘要，不超过{max_chars}个字符。\n\n当前摘要：\n{digest}\n\n新发言：{turns}",
+        "context": "早先发言的摘要：\n{digest}\n\n最近的发言：{recent}"
+    },
     "signal_processor": {
         "system_message": "你是一个高效的助手，旨在分析一组分析师提供的段落或财务报告。你的任务是提取投资决策：SELL、BUY或HOLD。仅提供提取的决策（SELL/BUI/HOLD）作为输出，不添加任何其他文本或信息。"
     },